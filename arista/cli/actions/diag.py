@@ -4,6 +4,7 @@ from __future__ import absolute_import, division, print_function
 import json
 
 from ...core.diag import DiagContext
+from ...core.driver.kernel.sysfscache import hwmonSnapshot
 from ...libs.pyshell import pyshell
 
 def doCommonDiagCli(components, args):
@@ -14,12 +15,13 @@ def doCommonDiagCli(components, args):
    )
    diagInfo = []
 
-   for component in components:
-      if args.recursive:
-         diagInfo.append(component.genDiag(diagCtx))
-      else:
-         for c in component.iterComponents():
-            diagInfo.append(c.genDiag(diagCtx))
+   with hwmonSnapshot():
+      for component in components:
+         if args.recursive:
+            diagInfo.append(component.genDiag(diagCtx))
+         else:
+            for c in component.iterComponents():
+               diagInfo.append(c.genDiag(diagCtx))
 
    if args.pyshell:
       pyshell()
@@ -3,7 +3,7 @@ from __future__ import absolute_import, division, print_function
 
 from .. import registerAction
 from ...exception import ActionError
-from ...fork import processIterParentWait
+from ...fork import parallelArgs, processIterParentWait
 from ...args.fabric import fabricParser
 from ....core.supervisor import Supervisor
 
@@ -24,7 +24,7 @@ def doFabric(ctx, args):
          fabrics.append(fabric)
 
    if args.parallel:
-      for fabric in processIterParentWait(fabrics):
+      for fabric in processIterParentWait(fabrics, **parallelArgs(args)):
          setattr(ctx, 'fabrics', [fabric])
    else:
       setattr(ctx, 'fabrics', fabrics)
@@ -3,7 +3,7 @@ from __future__ import absolute_import, division, print_function
 
 from .. import registerAction
 from ...exception import ActionError
-from ...fork import processIterParentWait
+from ...fork import parallelArgs, processIterParentWait
 from ...args.linecard import linecardParser
 from ....core.supervisor import Supervisor
 
@@ -24,7 +24,7 @@ def doLinecard(ctx, args):
          linecards.append(linecard)
 
    if args.parallel:
-      for linecard in processIterParentWait(linecards):
+      for linecard in processIterParentWait(linecards, **parallelArgs(args)):
          setattr(ctx, 'linecards', [linecard])
    else:
       setattr(ctx, 'linecards', linecards)
@@ -6,16 +6,22 @@ from ....core.utils import MmapResource
 
 logging = getLogger(__name__)
 
-def readPciAddress(device: str, resource: str, address: int, size: int) -> bool:
+def readPciAddress(device: str, resource: str, address: int, size: int,
+                   count: int=1) -> bool:
    path = getResourcePath(device, resource)
    if not path:
       return False
 
    try:
       with MmapResource(path) as mmapData:
-         read = getattr(mmapData, f'read{size}')
-         val = read(address)
-         print(f'{val:#x}')
+         if count == 1:
+            read = getattr(mmapData, f'read{size}')
+            val = read(address)
+            print(f'{val:#x}')
+            return True
+         readBlock = getattr(mmapData, f'readBlock{size}')
+         for i, val in enumerate(readBlock(address, count)):
+            print(f'{address + i * size // 8:#x}: {val:#x}')
          return True
    except Exception as e: # pylint: disable=broad-except
       logging.error('Cannot read %s device resource: %s', device, str(e))
@@ -23,4 +29,5 @@ def readPciAddress(device: str, resource: str, address: int, size: int) -> bool:
 
 @registerAction(readParser)
 def doRead(ctx, args): # pylint: disable=unused-argument
-   return readPciAddress(args.device, args.resource, args.address, args.size)
+   return readPciAddress(args.device, args.resource, args.address, args.size,
+                         count=args.count)
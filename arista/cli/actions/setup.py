@@ -8,6 +8,7 @@ from ...core.config import Config
 from ...core.component import Priority
 from ...core.log import getLogger
 from ...core.platform import loadPrerequisites
+from ...libs.trace import tracer, traceSpan
 
 logging = getLogger(__name__)
 
@@ -29,32 +30,61 @@ def setupXcvrs(platform):
          except NotImplementedError:
             pass
 
-@registerAction(setupParser)
-def doSetup(ctx, args):
-   platform = ctx.platform
-
-   if args.debug:
-      utils.debug = True
-
-   reportPlatformInfo(platform)
+def reportTrace(path):
+   tracer.stop()
+   try:
+      tracer.write(path)
+      logging.info('setup trace written to %s', path)
+   except OSError as e:
+      logging.error('failed to write setup trace to %s: %s', path, e)
+   logging.info('slowest setup operations:')
+   for line in tracer.summary(int(Config().setup_trace_summary)):
+      logging.info(line)
 
+def runSetup(platform, args):
    with utils.FileLock(Config().lock_file):
       if args.early or not args.late:
          logging.debug('setting up critical drivers')
-         loadPrerequisites()
-         platform.setup(Priority.defaultFilter)
+         with traceSpan('prerequisites', 'phase'):
+            loadPrerequisites()
+         with traceSpan('setup default', 'phase'):
+            platform.setup(Priority.defaultFilter)
 
       # NOTE: This assumes that none of the resetable devices are
       #       initialized in background.
       #       This should stay true in the future.
       if args.reset:
          logging.debug('taking devices out of reset')
-         platform.resetOut()
+         with traceSpan('reset', 'phase'):
+            platform.resetOut()
          logging.debug('initializing xcvrs')
-         setupXcvrs(platform)
+         with traceSpan('xcvrs', 'phase'):
+            setupXcvrs(platform)
 
       if args.late or not args.early:
-         platform.setup(Priority.lateFilter)
+         with traceSpan('setup late', 'phase'):
+            platform.setup(Priority.lateFilter)
 
       if args.early or not args.late:
-         platform.waitForIt()
+         with traceSpan('wait', 'phase'):
+            platform.waitForIt()
+
+@registerAction(setupParser)
+def doSetup(ctx, args):
+   platform = ctx.platform
+
+   if args.debug:
+      utils.debug = True
+
+   reportPlatformInfo(platform)
+
+   tracePath = args.trace or Config().setup_trace_file
+   if not tracePath:
+      runSetup(platform, args)
+      return
+
+   tracer.start()
+   try:
+      runSetup(platform, args)
+   finally:
+      reportTrace(tracePath)
@@ -11,3 +11,7 @@ def fabricParser(parser):
       help='id of the card to operate on')
    parser.add_argument('--parallel', action='store_true',
       help='run card operations in parallel')
+   parser.add_argument('--parallel-workers', type=int, default=None,
+      help='maximum number of cards to operate on in parallel')
+   parser.add_argument('--parallel-timeout', type=float, default=None,
+      help='time in seconds after which a card operation is killed')
@@ -11,6 +11,8 @@ def readParser(parser: ArgumentParser) -> None:
                        help='Size of memory value to read')
    parser.add_argument('--resource', '-r', type=int, default=0,
                        help='BAR resource to read')
+   parser.add_argument('--count', '-c', type=int, default=1,
+                       help='Number of consecutive values to read')
    parser.add_argument('device', type=str,
                        help='PCIe device to read')
    parser.add_argument('address', type=partial(int, base=0),
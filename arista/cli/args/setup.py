@@ -12,4 +12,6 @@ def setupParser(parser):
       help='put devices out of reset after init')
    parser.add_argument('-d', '--debug', action='store_true',
       help='enable debug features for the drivers')
+   parser.add_argument('--trace', metavar='PATH',
+      help='write a timeline of the setup as chrome trace-event json')
    addPriorityArgs(parser)
@@ -1,35 +1,172 @@
 import os
+import signal
+import time
 
+from ..core.config import Config
 from ..core.log import getLogger, getLoggerManager
 
-from .exception import ActionComplete
+from .exception import ActionComplete, ActionError
 
 logging = getLogger(__name__)
 
-def processIterParentWait(collection):
-   """The collection needs to be an iterable"""
+class ChildResult(object):
+   def __init__(self, item, pid):
+      self.item = item
+      self.pid = pid
+      self.start = time.monotonic()
+      self.end = None
+      self.code = None
+      self.signal = None
+      self.timedOut = False
+      self.killTime = None
+
+   def done(self):
+      return self.end is not None
+
+   def elapsed(self):
+      end = self.end if self.end is not None else time.monotonic()
+      return end - self.start
+
+   def success(self):
+      return self.code == 0
+
+   def error(self):
+      if self.timedOut:
+         return 'timed out after %.1fs' % self.elapsed()
+      if self.signal is not None:
+         return 'killed by signal %d' % self.signal
+      if self.code:
+         return 'exited with code %d' % self.code
+      return None
+
+   def update(self, status):
+      self.end = time.monotonic()
+      if os.WIFSIGNALED(status):
+         self.signal = os.WTERMSIG(status)
+         self.code = 128 + self.signal
+      else:
+         self.code = os.WEXITSTATUS(status)
+
+   def __str__(self):
+      return '%s: %s (%.2fs)' % (self.item, self.error() or 'ok', self.elapsed())
+
+class ProcessPool(object):
+   '''Run an action in a child process per item of a collection
+
+   At most maxWorkers children run at the same time, the next one is forked
+   once one completes. Children still running after timeout seconds are
+   terminated, then killed if they do not exit within KILL_GRACE seconds.
+   The parent collects the status, duration and error of each child.
+   '''
+
+   KILL_GRACE = 5
+   POLL_INTERVAL = 0.05
+
+   def __init__(self, maxWorkers=None, timeout=None):
+      self.maxWorkers = maxWorkers
+      self.timeout = timeout
+      self.results = []
+      self.child = False
 
-   pids = []
-
-   for item in collection:
-      pid = os.fork()
-      if pid == 0:
-         logging.debug('[child %s] starting for %s...', os.getpid(), item)
-         getLoggerManager().setPrefix('%s: ' % item)
-         # NOTE: once in the fork, yield the item and stop the iteration
-         #       it means that each item in the for loop will be executed in a
-         #       different process.
-         yield item
+   def running(self):
+      return [r for r in self.results if not r.done()]
+
+   def _reap(self):
+      for result in self.running():
+         pid, status = os.waitpid(result.pid, os.WNOHANG)
+         if pid == 0:
+            continue
+         result.update(status)
+         logging.debug('[parent] child %d for %s completed: %s', result.pid,
+                       result.item, result.error() or 'ok')
+
+   def _killStragglers(self):
+      if self.timeout is None:
          return
+      now = time.monotonic()
+      for result in self.running():
+         sig = None
+         if not result.timedOut and now - result.start > self.timeout:
+            result.timedOut = True
+            result.killTime = now
+            sig = signal.SIGTERM
+         elif result.timedOut and now - result.killTime > self.KILL_GRACE:
+            sig = signal.SIGKILL
+         if sig is not None:
+            logging.warning('[parent] child %d for %s timed out, sending %s',
+                            result.pid, result.item, sig.name)
+            try:
+               os.kill(result.pid, sig)
+            except ProcessLookupError:
+               pass
+
+   def _waitFor(self, count):
+      '''Wait until at most count children are running'''
+      while True:
+         self._reap()
+         if len(self.running()) <= count:
+            return
+         self._killStragglers()
+         time.sleep(self.POLL_INTERVAL)
+
+   def iterChildren(self, collection):
+      '''Yield each item of collection in its own child process'''
+      for item in collection:
+         if self.maxWorkers:
+            self._waitFor(self.maxWorkers - 1)
+
+         pid = os.fork()
+         if pid == 0:
+            self.child = True
+            logging.debug('[child %s] starting for %s...', os.getpid(), item)
+            getLoggerManager().setPrefix('%s: ' % item)
+            # NOTE: once in the fork, yield the item and stop the iteration
+            #       it means that each item in the for loop will be executed
+            #       in a different process.
+            yield item
+            return
 
-      pids.append(pid)
+         self.results.append(ChildResult(item, pid))
 
-   # wait for processes to finish
-   for pid in pids:
-      logging.debug('[parent] waiting for child %d', pid)
-      os.waitpid(pid, 0)
+      logging.debug('[parent] waiting for %d children', len(self.running()))
+      self._waitFor(0)
+      logging.debug('[parent] all children completed')
+
+   def failures(self):
+      return [r for r in self.results if not r.success()]
+
+   def report(self):
+      for result in self.results:
+         if result.success():
+            logging.info('%s', result)
+         else:
+            logging.error('%s', result)
+
+def parallelArgs(args):
+   maxWorkers = args.parallel_workers
+   if maxWorkers is None and Config().card_parallel_max_workers is not None:
+      maxWorkers = int(Config().card_parallel_max_workers)
+   timeout = args.parallel_timeout
+   if timeout is None and Config().card_parallel_timeout is not None:
+      timeout = float(Config().card_parallel_timeout)
+   return {
+      'maxWorkers': maxWorkers,
+      'timeout': timeout,
+   }
+
+def processIterParentWait(collection, maxWorkers=None, timeout=None):
+   """The collection needs to be an iterable"""
+   pool = ProcessPool(maxWorkers=maxWorkers, timeout=timeout)
+   for item in pool.iterChildren(collection):
+      yield item
+   if pool.child:
+      return
 
-   logging.debug('[parent] all children completed')
+   pool.report()
+   failures = pool.failures()
+   if failures:
+      raise ActionError('%d out of %d children failed' % (
+         len(failures), len(pool.results)))
 
    # the main process doesn't do anything
    raise ActionComplete
@@ -2,6 +2,7 @@
 from __future__ import print_function
 
 from ...core.diag import DiagContext
+from ...core.driver.kernel.sysfscache import hwmonSnapshot
 
 from . import Renderer, Table, Col
 
@@ -16,13 +17,14 @@ class ShowEnvironment(Renderer):
          'temps': [],
          'psuSlots': [],
       }
-      for inventory, _ in show.inventories:
-         for temp in inventory.getTemps():
-            data['temps'].append(temp.__diag__(ctx))
-         for fan in inventory.getFans():
-            data['fans'].append(fan.__diag__(ctx))
-         for slot in inventory.getPsuSlots():
-            data['psuSlots'].append(slot.__diag__(ctx))
+      with hwmonSnapshot():
+         for inventory, _ in show.inventories:
+            for temp in inventory.getTemps():
+               data['temps'].append(temp.__diag__(ctx))
+            for fan in inventory.getFans():
+               data['fans'].append(fan.__diag__(ctx))
+            for slot in inventory.getPsuSlots():
+               data['psuSlots'].append(slot.__diag__(ctx))
       return data
 
    def renderText(self, show):
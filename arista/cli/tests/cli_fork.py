@@ -0,0 +1,114 @@
+from __future__ import absolute_import
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from ...tests.testing import unittest, patch
+
+from ..exception import ActionComplete, ActionError
+from ...core.config import Config
+
+from ..fork import ProcessPool, parallelArgs, processIterParentWait
+
+class ProcessPoolTest(unittest.TestCase):
+   def setUp(self):
+      self.root = tempfile.mkdtemp()
+
+   def tearDown(self):
+      shutil.rmtree(self.root)
+
+   def _runChildren(self, collection, action, **kwargs):
+      '''Run action in a child per item, children exit with its return value'''
+      for item in processIterParentWait(collection, **kwargs):
+         code = 1
+         try:
+            code = action(item)
+         finally:
+            os._exit(code)
+
+   def _recordRun(self, item):
+      path = os.path.join(self.root, str(item))
+      with open(path, 'w', encoding='utf-8') as f:
+         f.write('%f\n' % time.monotonic())
+         time.sleep(0.1)
+         f.write('%f\n' % time.monotonic())
+      return 0
+
+   def _readRuns(self):
+      runs = []
+      for name in sorted(os.listdir(self.root)):
+         with open(os.path.join(self.root, name), encoding='utf-8') as f:
+            runs.append(tuple(float(line) for line in f))
+      return runs
+
+   def testComplete(self):
+      with self.assertRaises(ActionComplete):
+         self._runChildren(range(3), self._recordRun)
+      self.assertEqual(len(self._readRuns()), 3)
+
+   def testBounded(self):
+      with self.assertRaises(ActionComplete):
+         self._runChildren(range(3), self._recordRun, maxWorkers=1)
+      runs = sorted(self._readRuns())
+      self.assertEqual(len(runs), 3)
+      for (_, end), (begin, _) in zip(runs, runs[1:]):
+         self.assertLessEqual(end, begin)
+
+   def testFailures(self):
+      with patch.object(ProcessPool, 'report') as report:
+         with self.assertRaises(ActionError) as error:
+            self._runChildren([0, 3, 0], lambda item: item, maxWorkers=2)
+      report.assert_called_once_with()
+      self.assertIn('1 out of 3', error.exception.msg)
+
+   def testResults(self):
+      pool = ProcessPool(maxWorkers=2)
+      for item in pool.iterChildren([0, 2]):
+         os._exit(item)
+      self.assertEqual([r.item for r in pool.results], [0, 2])
+      self.assertEqual([r.code for r in pool.results], [0, 2])
+      self.assertEqual([r.item for r in pool.failures()], [2])
+      self.assertIsNone(pool.results[0].error())
+      self.assertEqual(pool.results[1].error(), 'exited with code 2')
+      for result in pool.results:
+         self.assertGreaterEqual(result.elapsed(), 0)
+
+   def testTimeout(self):
+      pool = ProcessPool(timeout=0.2)
+      begin = time.monotonic()
+      for item in pool.iterChildren([0, 60]):
+         try:
+            time.sleep(item)
+         finally:
+            os._exit(0)
+      self.assertLess(time.monotonic() - begin, 30)
+      fast = pool.results[0]
+      slow = pool.results[1]
+      self.assertTrue(fast.success())
+      self.assertFalse(slow.success())
+      self.assertTrue(slow.timedOut)
+      self.assertIsNotNone(slow.signal)
+      self.assertIn('timed out', slow.error())
+
+class ParallelArgsTest(unittest.TestCase):
+   def _args(self, workers=None, timeout=None):
+      return argparse.Namespace(parallel_workers=workers,
+                                parallel_timeout=timeout)
+
+   def testUnboundedDefault(self):
+      self.assertEqual(parallelArgs(self._args()),
+                       {'maxWorkers': None, 'timeout': None})
+
+   def testConfig(self):
+      with patch.object(Config(), 'card_parallel_max_workers', '4'), \
+           patch.object(Config(), 'card_parallel_timeout', '30'):
+         self.assertEqual(parallelArgs(self._args()),
+                          {'maxWorkers': 4, 'timeout': 30.})
+         self.assertEqual(parallelArgs(self._args(2, 10.)),
+                          {'maxWorkers': 2, 'timeout': 10.})
+
+if __name__ == '__main__':
+   unittest.main()
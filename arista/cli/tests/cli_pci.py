@@ -56,6 +56,10 @@ class CliPciTest(unittest.TestCase):
       self._runMain(['pci', 'read', self.FAKE_DEVICE, '0x1000'])
       self._checkOutputValue('0x4030201')
 
+   def testPciReadBlock(self) -> None:
+      self._runMain(['pci', 'read', '--count', '4', self.FAKE_DEVICE, '0x1000'])
+      self._checkOutputValue('0x1000: 0x4030201')
+
    def testSimplePciWrite(self) -> None:
       self._runMain(['pci', 'write', '--verify',
                      self.FAKE_DEVICE, '1024', '0x42424242'])
@@ -1,5 +1,9 @@
 from __future__ import absolute_import
 
+import json
+import os
+import tempfile
+
 from ...tests.testing import unittest, patch
 from ...core import utils
 from ...core.fabric import Fabric
@@ -7,6 +11,7 @@ from ...core.linecard import Linecard
 from ...core.modular import Modular
 from ...core.platform import loadPlatforms, getPlatforms
 from ...core.supervisor import Supervisor
+from ...libs.trace import tracer
 
 from .. import cleanupSimulation, main, setupSimulation
 
@@ -61,6 +66,20 @@ class CliLegacyTest(unittest.TestCase):
    def testSetup(self):
       self._foreachPlatform('setup')
 
+   def testSetupTrace(self):
+      fd, path = tempfile.mkstemp(prefix='arista-', suffix='.json')
+      os.close(fd)
+      try:
+         self._runMain(['-p', 'DCS-7050CX3-32S', 'setup', '--trace', path])
+         with open(path, encoding='utf-8') as f:
+            events = json.load(f)['traceEvents']
+      finally:
+         os.remove(path)
+      categories = set(e['cat'] for e in events)
+      self.assertIn('phase', categories)
+      self.assertIn('component', categories)
+      self.assertFalse(tracer.enabled)
+
    def testResetToggle(self):
       self._foreachPlatform('reset', '--toggle')
 
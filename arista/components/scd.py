@@ -16,7 +16,6 @@ from ..core.utils import (
    FileWaiter,
    incrange,
    inSimulation,
-   MmapResource,
    simulateWith,
    writeConfig
 )
@@ -70,6 +69,10 @@ class ScdI2cAddr(I2cAddr):
    def bus(self):
       return self.scd_.i2cOffset + self.bus_
 
+   @property
+   def master(self):
+      return self.scd_.getSmbusMasterForBus(self.bus_)
+
 class ScdPowerCycle(PowerCycle):
    def __init__(self, scd, reg=0x7000, wr=0xDEAD):
       self.scd = scd
@@ -258,16 +261,17 @@ class Scd(PciComponent):
       return interrupt
 
    def getMmap(self):
-      path = os.path.join(self.addr.getSysfsPath(), "resource0")
       if not self.mmapReady:
          # check that the scd driver is loaded the first time
          drv = self.drivers['scd']
          if not drv.loaded():
             # This codepath is unlikely to be used
             drv.setup()
+            path = os.path.join(self.addr.getSysfsPath(), "resource0")
             FileWaiter(path, 5).waitFileReady()
          self.mmapReady = True
-      return MmapResource(path)
+      # shared with the scd-hwmon driver, mapped once and kept until clean
+      return self.driver.getMmapResource()
 
    def getVersion(self):
       if inSimulation():
@@ -283,6 +287,12 @@ class Scd(PciComponent):
    def getSmbus(self, bus):
       return ScdSmbus(self, bus)
 
+   def getSmbusMasterForBus(self, bus):
+      if not self.smbusMasters:
+         return (str(self.addr), bus)
+      bpm = next(iter(self.smbusMasters.values()))['bus']
+      return (str(self.addr), bus // bpm)
+
    def getInterrupts(self):
       return self.interrupts
 
@@ -372,7 +382,8 @@ class Scd(PciComponent):
                                                      t=1, datr=0, datw=3, ed=0)
          presentDesc = GpioDesc("%s_present" % name, addr=addr, bit=2, ro=True,
                                 activeLow=True)
-         presentGpio = self.addXcvrGpio(presentDesc)
+         presentGpio = self.addXcvrGpio(
+            presentDesc, bulkReader=self.driver.getXcvrPresenceReader())
       leds = []
       if len(port.ledDescs) > 0:
          if port.defaultLed is not None:
@@ -10,6 +10,7 @@ from .component.pci import PciComponent
 from .driver.kernel.pci import PciKernelDriver
 from .log import getLogger
 from .quirk import Quirk
+from .register import registerTransaction
 from .utils import klog, inSimulation
 
 logging = getLogger(__name__)
@@ -58,8 +59,9 @@ class SwitchChip(PciComponent):
          return
 
       logging.debug('%s: turning power on', self)
-      for gpio in self.powerGpios:
-         gpio.setActive(True)
+      with registerTransaction(self.powerGpios):
+         for gpio in self.powerGpios:
+            gpio.setActive(True)
 
       if wait and self.powerGoodGpios:
          logging.debug('%s: waiting for power good', self)
@@ -73,8 +75,9 @@ class SwitchChip(PciComponent):
          return
 
       logging.debug('%s: turning power off', self)
-      for gpio in self.powerGpios:
-         gpio.setActive(False)
+      with registerTransaction(self.powerGpios):
+         for gpio in self.powerGpios:
+            gpio.setActive(False)
 
       if wait and self.powerGoodGpios:
          logging.debug('%s: waiting for power down', self)
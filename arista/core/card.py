@@ -1,6 +1,8 @@
 
 import gc
 
+from ..libs.i2c import invalidateKernelI2cBuses
+
 from .component import Priority
 from .component.slot import SlotComponent
 from .exception import UnknownPlatformError
@@ -74,18 +76,22 @@ class Card(Sku):
       return self.CPU_CLS is not None
 
    def setup(self, filters=Priority.defaultFilter):
+      self.loadModules(filters)
       super(Card, self).setup()
       super(Card, self).finish(filters=filters)
 
    def setupStandby(self, filters=Priority.defaultFilter):
+      self.standby.loadModules(filters)
       self.standby.setup()
       self.standby.finish(filters)
 
    def setupControlPlane(self, filters=Priority.defaultFilter):
+      self.control.loadModules(filters)
       self.control.setup()
       self.control.finish(filters)
 
    def setupMain(self, filters=Priority.defaultFilter):
+      self.main.loadModules(filters)
       self.main.setup()
       self.main.finish(filters)
 
@@ -123,6 +129,8 @@ class CardSlot(SlotComponent):
    def unloadCard(self):
       self.card.detach()
       self.card = None
+      # NOTE: the i2c adapters of the card go away with it
+      invalidateKernelI2cBuses()
       gc.collect()
 
    def loadCard(self, card=None, **kwargs):
@@ -153,6 +161,8 @@ class CardSlot(SlotComponent):
          self.unloadCard()
 
       self.card = card
+      # NOTE: the card adapters may have been recreated with new bus ids
+      invalidateKernelI2cBuses()
       self.card.refresh()
 
    def genDiag(self, ctx):
@@ -1,11 +1,16 @@
 from collections import OrderedDict
 from typing import List
 
-from ..config import Config
+from ...libs.trace import traceSpan
+
+from ..driver.kernel import loadKernelModules
+from ..driver.kernel.i2c import I2cKernelDriver, setupI2cKernelDrivers
 from ..inventory import Inventory
 from ..log import getLogger
 from ..quirk import Quirk
 
+from .executor import getSetupDomain, getSetupExecutor
+
 logging = getLogger(__name__)
 
 DEFAULT_WAIT_TIMEOUT = 15
@@ -25,6 +30,15 @@ class Priority(object):
    defaultFilter = priorityFilter(DEFAULT)
    lateFilter = priorityFilter(LATE)
 
+def _hasOnlyI2cDevices(component):
+   '''Whether the setup of the component only creates i2c devices'''
+   if type(component).setup is not Component.setup:
+      return False
+   if any(q.when == Quirk.When.BEFORE for q in component.quirks):
+      return False
+   return all(isinstance(d, I2cKernelDriver) and d.CONCURRENT_SETUP
+              for d in component.drivers.values())
+
 class Component(object):
 
    QUIRKS: List[Quirk] = []
@@ -104,21 +118,62 @@ class Component(object):
    def getInventory(self):
       return self.inventory
 
+   def iterDrivers(self, filters=Priority.defaultFilter):
+      for driver in self.drivers.values():
+         yield driver
+      for component in self.iterComponents(filters):
+         for driver in component.drivers.values():
+            yield driver
+
+   def loadModules(self, filters=Priority.defaultFilter):
+      '''Load ahead the kernel modules needed to setup the component tree'''
+      loadKernelModules(self.iterDrivers(filters))
+
    def setup(self):
       self.applyQuirks(Quirk.When.BEFORE)
       for driver in self.drivers.values():
-         driver.setup()
+         with traceSpan(str(driver), 'driver', component=str(self)):
+            driver.setup()
       for driver in self.drivers.values():
          driver.finish()
       self.applyQuirks(Quirk.When.AFTER)
 
+   @staticmethod
+   def prepareSetup(components, maxWorkers=1):
+      '''Create the kernel i2c devices of components ahead of their setup
+
+      Siblings of a setup domain are set up in order. Devices are only
+      created early for the components of a domain preceding the first one
+      with other setup work, which still runs before its later siblings.
+      '''
+      drivers = []
+      blocked = set()
+      for component in components:
+         domain = getSetupDomain(component)
+         if domain in blocked:
+            continue
+         onlyI2c = _hasOnlyI2cDevices(component)
+         if onlyI2c:
+            drivers.extend(component.drivers.values())
+         if not onlyI2c or component.quirks:
+            blocked.add(domain)
+      with traceSpan('prepare %d drivers' % len(drivers), 'driver'):
+         setupI2cKernelDrivers(drivers, maxWorkers=maxWorkers)
+
+   @staticmethod
+   def tracedSetup(component):
+      with traceSpan(str(component), 'component'):
+         component.setup()
+
    def finish(self, filters=Priority.defaultFilter):
       # underlying component are initialized recursively but require the parent to
-      # be fully initialized
-      for component in self.iterComponents(filters, recursive=False):
-         component.setup()
-      for component in self.iterComponents(recursive=False):
-         component.finish(filters)
+      # be fully initialized, independent siblings are initialized concurrently
+      executor = getSetupExecutor()
+      executor.run(list(self.iterComponents(filters, recursive=False)),
+                   self.tracedSetup,
+                   prepare=self.prepareSetup)
+      executor.run(list(self.iterComponents(recursive=False)),
+                   lambda component: component.finish(filters))
 
    def refresh(self):
       for component in self.components:
@@ -154,7 +209,8 @@ class Component(object):
          if quirk.when == when:
             logging.info('%s: quirk: %s', self, quirk)
             try:
-               quirk.run(self)
+               with traceSpan(str(quirk), 'quirk', component=str(self)):
+                  quirk.run(self)
             except Exception: # pylint: disable=broad-except
                logging.exception('%s: quirk: %s failed', self, quirk)
 
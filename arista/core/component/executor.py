@@ -0,0 +1,97 @@
+import threading
+
+from ...libs.parallel import runPerGroup
+
+from ..config import Config
+from ..log import getLogger
+from ..types import I2cAddr, I2cBusAddr, PciAddr
+
+logging = getLogger(__name__)
+
+def getSetupDomain(component):
+   '''Return the hardware resource a component setup depends on, if known'''
+   addr = component.addr
+   if isinstance(addr, PciAddr):
+      return ('pci', str(addr))
+   # NOTE: buses looked up by name may only exist once a sibling is set up
+   if isinstance(addr, I2cAddr) and not isinstance(addr, I2cBusAddr):
+      return ('i2c', addr.master)
+   return None
+
+class SetupExecutor(object):
+   '''Run a setup step on sibling components, concurrently when possible
+
+   Siblings sharing a setup domain run in sequence and in order, siblings
+   from distinct domains run in parallel. A component without a known
+   domain is a barrier, every sibling before it completes first and those
+   after it only start once it is done. Worker threads are bounded across
+   nested calls, the work runs inline when none is available. A failure
+   stops its domain, the other domains complete before it is raised.
+   '''
+
+   def __init__(self, maxWorkers=None):
+      self.maxWorkers = maxWorkers
+      self.available_ = None
+      self.lock = threading.Lock()
+
+   def acquire(self, count):
+      with self.lock:
+         if self.available_ is None:
+            maxWorkers = self.maxWorkers
+            if maxWorkers is None:
+               maxWorkers = int(Config().setup_max_workers)
+            self.available_ = maxWorkers
+         count = min(count, self.available_)
+         self.available_ -= count
+         return count
+
+   def release(self, count):
+      if not count:
+         return
+      with self.lock:
+         self.available_ += count
+
+   def _runSegment(self, components, func, prepare):
+      if not components:
+         return
+
+      domains = set(getSetupDomain(c) for c in components)
+      workers = self.acquire(len(domains)) if len(domains) > 1 else 0
+      try:
+         if prepare is not None:
+            prepare(components, max(workers, 1))
+
+         if workers <= 1:
+            for component in components:
+               func(component)
+            return
+
+         logging.debug('running %d components on %d workers',
+                       len(components), workers)
+         results = runPerGroup(components, getSetupDomain, func,
+                               maxWorkers=workers, stopOnError=True)
+      finally:
+         self.release(workers)
+
+      for result in results:
+         if result.error is not None:
+            raise result.error
+
+   def run(self, components, func, prepare=None):
+      '''Run func on every component, prepare is called beforehand on each
+         group of components that can run concurrently along with the number
+         of workers it may use'''
+      segment = []
+      for component in components:
+         if getSetupDomain(component) is None:
+            self._runSegment(segment, func, prepare)
+            segment = []
+            func(component)
+         else:
+            segment.append(component)
+      self._runSegment(segment, func, prepare)
+
+_setupExecutor = SetupExecutor()
+
+def getSetupExecutor():
+   return _setupExecutor
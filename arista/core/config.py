@@ -25,9 +25,14 @@ class Config():
          cls.instance_.reboot_cause_file = 'last_reboot_cause'
          cls.instance_.persistent_presence_check = True
          cls.instance_.lock_file = '/var/lock/arista.lock'
+         cls.instance_.setup_max_workers = 4
+         cls.instance_.setup_trace_file = None
+         cls.instance_.setup_trace_summary = 10
          cls.instance_.linecard_lock_file_pattern = \
             '/var/lock/arista.linecard{:d}.lock'
          cls.instance_.linecard_standby_only = True
+         cls.instance_.card_parallel_max_workers = None
+         cls.instance_.card_parallel_timeout = None
          cls.instance_.linecard_cpu_enable = False
          cls.instance_.power_off_linecard_on_reboot = True
          cls.instance_.power_off_fabric_on_reboot = False
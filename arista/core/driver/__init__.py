@@ -1,6 +1,9 @@
 
 import os
 import subprocess
+import threading
+
+from ...libs.trace import traceSpan
 
 from .. import utils
 from ..utils import FileWaiter, inDebug, inSimulation
@@ -8,6 +11,48 @@ from ..log import getLogger
 
 logging = getLogger(__name__)
 
+class LoadedModules(object):
+   '''Set of the loaded kernel modules
+
+   /proc/modules is parsed again after this process loaded or unloaded a
+   module and at the beginning of a setup pass. A module missing from the
+   last parse is reported missing, at worst it is loaded again which is a
+   noop. Callers for which a module unloaded by another process matters,
+   like the cleanup, ask for a refresh.
+   '''
+
+   def __init__(self, path='/proc/modules'):
+      self.path = path
+      self.modules_ = None
+      self.lock = threading.Lock()
+
+   def _read(self):
+      with open(self.path, encoding='utf-8') as f:
+         return set(line.split(' ', 1)[0] for line in f)
+
+   def invalidate(self):
+      with self.lock:
+         self.modules_ = None
+
+   def contains(self, name, refresh=False):
+      name = name.replace('-', '_')
+      with self.lock:
+         if self.modules_ is None or refresh:
+            self.modules_ = self._read()
+         return name in self.modules_
+
+loadedModules = LoadedModules()
+
+def _execModprobe(args):
+   if inSimulation():
+      logging.debug('exec: %s', ' '.join(args))
+      return
+   try:
+      with traceSpan(' '.join(args), 'module'):
+         subprocess.check_call(args)
+   finally:
+      loadedModules.invalidate()
+
 def modprobe(name, args=None):
    logging.debug('loading module %s', name)
    if args is None:
@@ -15,10 +60,19 @@ def modprobe(name, args=None):
    args = ['modprobe', name.replace('-', '_')] + args
    if inDebug():
       args += ['dyndbg=+pf']
-   if inSimulation():
-      logging.debug('exec: %s', ' '.join(args))
-   else:
-      subprocess.check_call(args)
+   _execModprobe(args)
+
+def modprobeAll(names):
+   '''Load several modules without arguments with a single modprobe'''
+   if not names:
+      return
+   if inDebug():
+      # NOTE: the dyndbg argument can only be given to a single module
+      for name in names:
+         modprobe(name)
+      return
+   logging.debug('loading modules %s', ' '.join(names))
+   _execModprobe(['modprobe', '-a'] + [name.replace('-', '_') for name in names])
 
 def deviceListForModule(name):
    devices = []
@@ -44,22 +98,15 @@ def deviceListForModule(name):
 
 def rmmod(name):
    logging.debug('unloading module %s', name)
-   args = ['modprobe', '-r', name.replace('-', '_')]
-   if inSimulation():
-      logging.debug('exec: %s', ' '.join(args))
-   else:
-      subprocess.check_call(args)
+   _execModprobe(['modprobe', '-r', name.replace('-', '_')])
 
-def isModuleLoaded(name):
+def isModuleLoaded(name, refresh=False):
    if inSimulation():
       return False
+   return loadedModules.contains(name, refresh=refresh)
 
-   with open('/proc/modules') as f:
-      start = '%s ' % name.replace('-', '_')
-      for line in f.readlines():
-         if line.startswith(start):
-            return True
-   return False
+def invalidateLoadedModules():
+   loadedModules.invalidate()
 
 class Driver(object):
    def __init__(self, **kwargs):
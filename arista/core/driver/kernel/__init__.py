@@ -1,11 +1,14 @@
 
 import os
+import subprocess
 
 from .. import (
    Driver,
    deviceListForModule,
+   invalidateLoadedModules,
    isModuleLoaded,
    modprobe,
+   modprobeAll,
    rmmod,
 )
 from ...log import getLogger
@@ -22,6 +25,7 @@ from .sysfs import (
    ResetSysfsImpl,
    TempSysfsImpl,
 )
+from .sysfscache import hwmonLabelIndexes, sysfsFdPool
 
 logging = getLogger(__name__)
 
@@ -48,10 +52,13 @@ class KernelDriver(Driver):
          modprobe(self.module, self.margs)
 
    def clean(self):
+      self.invalidateSysfs()
+
       if self.PASSIVE:
          return
 
-      if not self.loaded():
+      # NOTE: the module may have been unloaded by another process
+      if not self.loaded(refresh=True):
          logging.debug('Module %s is not loaded', self.module)
          return
 
@@ -66,8 +73,16 @@ class KernelDriver(Driver):
       except Exception as e: # pylint: disable=broad-except
          logging.error('Failed to unload %s: %s', self.module, e)
 
-   def loaded(self):
-      return isModuleLoaded(self.module)
+   def loaded(self, refresh=False):
+      return isModuleLoaded(self.module, refresh=refresh)
+
+   def invalidateSysfs(self):
+      '''Drop cached sysfs state, to be called when the device goes away'''
+      sysfsPath = tryGet(self.getSysfsPath, default=None)
+      if sysfsPath is not None:
+         sysfsFdPool.invalidate(sysfsPath)
+         hwmonLabelIndexes.invalidate(sysfsPath)
+      self.hwmonPath = None
 
    def getSysfsPath(self):
       if self.PATH is not None:
@@ -111,3 +126,23 @@ class KernelDriver(Driver):
 
    def getRail(self, desc, **kwargs):
       return RailSysfsImpl(self, desc, **kwargs)
+
+def loadKernelModules(drivers):
+   '''Load the modules required by drivers with a single modprobe
+
+   Modules taking arguments are left to the setup of their driver, like any
+   module that failed to load here.
+   '''
+   invalidateLoadedModules()
+   modules = []
+   for driver in drivers:
+      if not isinstance(driver, KernelDriver) or driver.PASSIVE or \
+         not driver.module or driver.margs:
+         continue
+      if driver.module not in modules and not driver.loaded():
+         modules.append(driver.module)
+
+   try:
+      modprobeAll(modules)
+   except subprocess.CalledProcessError as e:
+      logging.warning('Failed to load modules %s: %s', ' '.join(modules), e)
@@ -6,11 +6,17 @@ from ...utils import inSimulation
 
 from . import KernelDriver
 
+from ....libs.i2c import invalidateKernelI2cBuses
+from ....libs.parallel import runPerGroup
+from ....libs.wait import waitForPath, waitForPaths
+
 logging = getLogger(__name__)
 
 class I2cKernelDriver(KernelDriver):
 
    NAME = None
+   # NOTE: drivers doing some work before creating their device must opt out
+   CONCURRENT_SETUP = True
 
    def __init__(self, addr=None, name=None, **kwargs):
       super(I2cKernelDriver, self).__init__(**kwargs)
@@ -18,6 +24,10 @@ class I2cKernelDriver(KernelDriver):
       self.name = name or self.NAME
 
    def setup(self):
+      self.instantiate()
+      self.waitReady()
+
+   def instantiate(self):
       # Load module
       super(I2cKernelDriver, self).setup()
 
@@ -33,6 +43,16 @@ class I2cKernelDriver(KernelDriver):
          with open(path, 'w') as f:
             f.write('%s 0x%02x' % (self.name, self.addr.address))
 
+   def getReadyPaths(self):
+      '''Paths only present once the driver is bound to the device'''
+      return []
+
+   def waitReady(self):
+      if inSimulation():
+         return
+      for path in self.getReadyPaths():
+         waitForPath(path, description='%s sysfs entry' % self.name)
+
    def clean(self):
       if inSimulation():
          return
@@ -43,6 +63,8 @@ class I2cKernelDriver(KernelDriver):
                        self.name, self.addr.bus, self.addr.address)
          with open(path, 'w') as f:
             f.write('0x%02x' % self.addr.address)
+         # the device may have been providing i2c adapters (e.g muxes)
+         invalidateKernelI2cBuses()
       else:
          logging.debug('i2c device %s not loaded on bus %d at 0x%02x',
                        self.name, self.addr.bus, self.addr.address)
@@ -68,3 +90,25 @@ class I2cKernelDriver(KernelDriver):
          'name': self.name,
       })
       return data
+
+def setupI2cKernelDrivers(drivers, maxWorkers=None):
+   '''Create the i2c devices of drivers concurrently across adapters
+
+   Devices on the same adapter are created in order and a single wait then
+   covers every driver binding to its device. Drivers are expected to run
+   their setup afterwards which finds their device ready.
+   '''
+   drivers = [d for d in drivers
+              if isinstance(d, I2cKernelDriver) and d.CONCURRENT_SETUP]
+   if not drivers:
+      return
+
+   results = runPerGroup(drivers, lambda d: d.addr.bus,
+                         lambda d: d.instantiate(), maxWorkers=maxWorkers)
+   # NOTE: failures are left to the setup of the driver to be reported
+   paths = []
+   for result in results:
+      if result.error is None:
+         paths.extend(result.item.getReadyPaths())
+   if paths and not inSimulation():
+      waitForPaths(paths, description='i2c devices to be ready')
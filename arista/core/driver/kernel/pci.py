@@ -1,7 +1,7 @@
 
 import os
 
-from ...utils import FileWaiter, MmapResource
+from ...utils import FileWaiter, SharedMmapResource
 
 from . import KernelDriver
 
@@ -12,16 +12,33 @@ class PciKernelDriver(KernelDriver):
       self.regs = registerCls(self) if registerCls is not None else None
       self.mmap_ = None
 
-   @property
-   def mmap(self):
+   def getMmapResource(self):
+      '''Return the mapping of resource0 shared with the other users of the
+         device, it stays mapped until the driver is cleaned'''
       if self.mmap_ is None:
          path = os.path.join(self.addr.getSysfsPath(), "resource0")
+         self.mmap_ = SharedMmapResource.acquire(path)
+      return self.mmap_
+
+   def releaseMmapResource(self):
+      if self.mmap_ is not None:
+         self.mmap_.release()
+         self.mmap_ = None
+
+   @property
+   def mmap(self):
+      resource = self.getMmapResource()
+      if not resource.mapped():
+         path = resource.path_
          if not FileWaiter(path, 5).waitFileReady():
             raise IOError('Mmap failed because file %s doesn\'t exist' % path)
-         self.mmap_ = MmapResource(path)
-         if not self.mmap_.map():
+         if not resource.openResource():
             raise IOError('Failed to mmap file %s' % path)
-      return self.mmap_
+      return resource
+
+   def clean(self):
+      self.releaseMmapResource()
+      super(PciKernelDriver, self).clean()
 
    def write(self, addr, value):
       self.mmap.write32(addr, value)
@@ -29,5 +46,11 @@ class PciKernelDriver(KernelDriver):
    def read(self, addr):
       return self.mmap.read32(addr)
 
+   def readBlock(self, addr, count):
+      return self.mmap.readBlock32(addr, count)
+
+   def writeBlock(self, addr, values):
+      self.mmap.writeBlock32(addr, values)
+
    def getSysfsPath(self):
       return self.addr.getSysfsPath()
@@ -22,6 +22,8 @@ from ....inventory.rail import Rail
 from ....inventory.reset import Reset
 from ....inventory.temp import Temp
 
+from .sysfscache import hwmonLabelIndexes, hwmonSnapshots, sysfsFdPool
+
 logging = getLogger(__name__)
 
 class SysfsEntry(object):
@@ -59,6 +61,10 @@ class SysfsEntry(object):
 
    def exists(self):
       try:
+         if hwmonSnapshots.active():
+            snapshot, name = hwmonSnapshots.lookup(self.entryPath)
+            if snapshot is not None and name in snapshot:
+               return True
          return os.path.exists(self.entryPath)
       except FileNotFoundError:
          return False
@@ -73,8 +79,11 @@ class SysfsEntry(object):
       if utils.inSimulation():
          return '1'
       try:
-         with open(self.entryPath, 'r') as f:
-            return f.read()
+         if hwmonSnapshots.active():
+            snapshot, name = hwmonSnapshots.lookup(self.entryPath)
+            if snapshot is not None and name in snapshot:
+               return snapshot.raw[name]
+         return sysfsFdPool.read(self.entryPath)
       except IOError:
          logging.error("read sysfs failed on %s", self.entryPath)
          return None
@@ -682,7 +691,8 @@ class ResetSysfsImpl(Reset):
       return self.reset.write(False)
 
 class GpioSysfsImpl(Gpio):
-   def __init__(self, driver, desc, hwActiveLow=False, **kwargs):
+   def __init__(self, driver, desc, hwActiveLow=False, bulkReader=None,
+                **kwargs):
       self.driver = driver
       self.desc = desc
       self.addr = desc.addr
@@ -691,6 +701,7 @@ class GpioSysfsImpl(Gpio):
       self.ro = desc.ro
       self.activeLow = desc.activeLow
       self.hwActiveLow = hwActiveLow
+      self.bulkReader = bulkReader
       def getGpioPath(name):
          return os.path.join(self.driver.getSysfsPath(), name)
       self.gpio = SysfsEntryBool(self, self.name, pathCallback=getGpioPath)
@@ -723,14 +734,20 @@ class GpioSysfsImpl(Gpio):
    def _activeValue(self):
       return 0 if self.isActiveLow() else 1
 
+   def isActiveValue(self, value):
+      return value == self._activeValue()
+
    def isActive(self):
       if utils.inSimulation():
          return True
-      return self.getRawValue() == self._activeValue()
+      return self.isActiveValue(self.getRawValue())
 
    def setActive(self, value):
       self.setRawValue(not value if self.isActiveLow() else value)
 
+   def getBulkReader(self):
+      return self.bulkReader
+
 class LabelSysfsImpl(GenericSysfsImpl):
    def getExpectedLabel(self):
       if self.desc.direction == RailDirection.INPUT:
@@ -739,11 +756,11 @@ class LabelSysfsImpl(GenericSysfsImpl):
 
    def getPrefixFromLabel(self):
       label = self.getExpectedLabel()
-      for entry in os.listdir(self.driver.getHwmonPath()):
-         if entry.startswith(self.SYSFS_PREFIX) and entry.endswith('_label'):
-            if SysfsEntry(self, entry).read() == label:
-               return entry[:entry.find('_') + 1]
-      raise FileNotFoundError('Could not find label for %s' % label)
+      prefix = hwmonLabelIndexes.getPrefix(self.driver.getHwmonPath(),
+                                           self.SYSFS_PREFIX, label)
+      if prefix is None:
+         raise FileNotFoundError('Could not find label for %s' % label)
+      return prefix
 
    def __init__(self, driver, desc, prefix=None, **kwargs):
       super().__init__(driver, desc, prefix=self.getPrefixFromLabel, **kwargs)
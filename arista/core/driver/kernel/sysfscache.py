@@ -0,0 +1,293 @@
+import contextlib
+import os
+import re
+import threading
+
+from collections import OrderedDict
+
+from ...log import getLogger
+
+logging = getLogger(__name__)
+
+class SysfsFd(object):
+   def __init__(self, fd):
+      self.fd = fd
+      self.users = 0
+      self.dropped = False
+
+class SysfsFdPool(object):
+   '''Keeps sysfs attribute files open and re-reads them with pread
+
+   Re-reading a sysfs attribute at offset 0 makes the kernel call the show
+   callback again, which saves the open/close syscalls of every access.
+   When a device goes away its attributes start failing with ENODEV, in which
+   case the fd is dropped and the path is opened again.
+
+   The lock only guards the table of fds, reads happen outside of it so that
+   slow attributes do not serialize the others. An fd dropped while being
+   read is closed by its last user.
+   '''
+
+   MAX_SIZE = 512
+   READ_SIZE = 4096
+
+   def __init__(self, maxSize=MAX_SIZE):
+      self.maxSize = maxSize
+      self.fds = OrderedDict()
+      self.lock = threading.Lock()
+
+   def __len__(self):
+      return len(self.fds)
+
+   @staticmethod
+   def _close(entry):
+      try:
+         os.close(entry.fd)
+      except OSError:
+         pass
+
+   def _drop(self, path, entry=None):
+      '''Remove path from the pool, must be called with the lock held'''
+      if entry is not None and self.fds.get(path) is not entry:
+         return
+      entry = self.fds.pop(path, None)
+      if entry is None:
+         return
+      entry.dropped = True
+      if not entry.users:
+         self._close(entry)
+
+   def _acquire(self, path):
+      with self.lock:
+         entry = self.fds.get(path)
+         if entry is not None:
+            self.fds.move_to_end(path)
+            entry.users += 1
+         return entry
+
+   def _insert(self, path, entry):
+      with self.lock:
+         self._drop(path)
+         self.fds[path] = entry
+         while len(self.fds) > self.maxSize:
+            self._drop(next(iter(self.fds)))
+
+   def _release(self, entry):
+      with self.lock:
+         entry.users -= 1
+         if entry.dropped and not entry.users:
+            self._close(entry)
+
+   def _pread(self, path, entry):
+      try:
+         return os.pread(entry.fd, self.READ_SIZE, 0)
+      except OSError:
+         with self.lock:
+            self._drop(path, entry)
+         raise
+      finally:
+         self._release(entry)
+
+   def read(self, path):
+      entry = self._acquire(path)
+      if entry is not None:
+         try:
+            return self._pread(path, entry).decode()
+         except OSError:
+            logging.debug('stale fd for %s, reopening', path)
+
+      entry = SysfsFd(os.open(path, os.O_RDONLY | os.O_CLOEXEC))
+      entry.users += 1
+      self._insert(path, entry)
+      return self._pread(path, entry).decode()
+
+   def invalidate(self, prefix=None):
+      with self.lock:
+         for path in list(self.fds):
+            if prefix is None or path.startswith(prefix):
+               self._drop(path)
+
+sysfsFdPool = SysfsFdPool()
+
+class HwmonSnapshot(object):
+   '''All the sensor attributes of a hwmon folder read in a single pass
+
+   Values are kept as read from sysfs and converted on access: numeric
+   attributes are returned as int and the others (e.g. labels) as str.
+   '''
+
+   ATTR_RE = re.compile(r'^[a-z]+\d*_[a-z0-9_]+$')
+   IGNORED_SUFFIXES = ('_reset_history',)
+
+   def __init__(self, path):
+      self.path = path
+      self.raw = {}
+
+   def __str__(self):
+      return '%s(path=%s)' % (self.__class__.__name__, self.path)
+
+   def __contains__(self, name):
+      return name in self.raw
+
+   def __iter__(self):
+      return iter(self.raw)
+
+   def __len__(self):
+      return len(self.raw)
+
+   def __getitem__(self, name):
+      value = self.raw[name]
+      try:
+         return int(value)
+      except ValueError:
+         return value
+
+   def get(self, name, default=None):
+      if name not in self.raw:
+         return default
+      return self[name]
+
+   def items(self):
+      return [(name, self[name]) for name in self.raw]
+
+   def isAttribute(self, name):
+      return self.ATTR_RE.match(name) is not None and \
+             not name.endswith(self.IGNORED_SUFFIXES)
+
+   def load(self):
+      self.raw = {}
+      try:
+         names = sorted(os.listdir(self.path))
+      except OSError:
+         logging.debug('%s: hwmon folder not available', self)
+         return self
+
+      for name in names:
+         if not self.isAttribute(name):
+            continue
+         try:
+            self.raw[name] = sysfsFdPool.read(os.path.join(self.path, name)).rstrip()
+         except OSError:
+            # write only attributes and sensors in error are skipped
+            continue
+      return self
+
+def readHwmonSnapshot(path):
+   return HwmonSnapshot(path).load()
+
+class HwmonSnapshotCache(threading.local):
+   '''Per thread cache of hwmon snapshots, active within hwmonSnapshot()'''
+
+   def __init__(self):
+      super().__init__()
+      self.depth = 0
+      self.snapshots = {}
+
+   def active(self):
+      return self.depth > 0
+
+   def lookup(self, path):
+      folder, name = os.path.split(path)
+      if not os.path.basename(folder).startswith('hwmon'):
+         return None, name
+      snapshot = self.snapshots.get(folder)
+      if snapshot is None:
+         snapshot = readHwmonSnapshot(folder)
+         self.snapshots[folder] = snapshot
+      return snapshot, name
+
+hwmonSnapshots = HwmonSnapshotCache()
+
+@contextlib.contextmanager
+def hwmonSnapshot():
+   '''Serve all hwmon reads from one snapshot per folder for a sensor sweep'''
+   hwmonSnapshots.depth += 1
+   try:
+      yield hwmonSnapshots
+   finally:
+      hwmonSnapshots.depth -= 1
+      if not hwmonSnapshots.depth:
+         hwmonSnapshots.snapshots = {}
+
+class HwmonLabelIndex(object):
+   '''Maps the labels of a hwmon folder to their sysfs attribute prefix'''
+
+   LABEL_RE = re.compile(r'^([a-z]+)\d+_label$')
+
+   def __init__(self, path):
+      self.path = path
+      self.identity = None
+      self.prefixes = {}
+
+   def __str__(self):
+      return '%s(path=%s)' % (self.__class__.__name__, self.path)
+
+   def _identity(self):
+      # NOTE: a hwmon folder created again for a new device gets a new inode
+      try:
+         st = os.stat(self.path)
+      except OSError:
+         return None
+      return (st.st_dev, st.st_ino)
+
+   def isCurrent(self):
+      return self.identity is not None and self.identity == self._identity()
+
+   def load(self):
+      self.prefixes = {}
+      self.identity = self._identity()
+      for entry in os.listdir(self.path):
+         match = self.LABEL_RE.match(entry)
+         if match is None:
+            continue
+         try:
+            with open(os.path.join(self.path, entry), 'r', encoding='utf-8') as f:
+               label = f.read().rstrip()
+         except IOError:
+            logging.error('read sysfs failed on %s', os.path.join(self.path, entry))
+            continue
+         prefix = entry[:entry.find('_') + 1]
+         self.prefixes.setdefault((match.group(1), label), prefix)
+      logging.debug('%s: indexed %d labels', self, len(self.prefixes))
+      return self
+
+   def getPrefix(self, sysfsPrefix, label):
+      return self.prefixes.get((sysfsPrefix, label))
+
+class HwmonLabelIndexCache(object):
+   '''Label indexes shared by every sensor of a hwmon folder
+
+   An index is rebuilt when its folder is replaced by a new one and when a
+   label is missing from it, the device behind the folder may have changed.
+   '''
+
+   def __init__(self):
+      self.indexes = {}
+      self.lock = threading.Lock()
+
+   def _load(self, path):
+      index = HwmonLabelIndex(path).load()
+      self.indexes[path] = index
+      return index
+
+   def get(self, path):
+      with self.lock:
+         index = self.indexes.get(path)
+         if index is None or not index.isCurrent():
+            index = self._load(path)
+         return index
+
+   def getPrefix(self, path, sysfsPrefix, label):
+      prefix = self.get(path).getPrefix(sysfsPrefix, label)
+      if prefix is None:
+         with self.lock:
+            prefix = self._load(path).getPrefix(sysfsPrefix, label)
+      return prefix
+
+   def invalidate(self, prefix=None):
+      with self.lock:
+         for path in list(self.indexes):
+            if prefix is None or path.startswith(prefix):
+               del self.indexes[path]
+
+hwmonLabelIndexes = HwmonLabelIndexCache()
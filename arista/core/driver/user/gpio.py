@@ -19,6 +19,11 @@ class GpioFuncImpl(Gpio):
    def getName(self):
       return self.name
 
+   def getRegisterMap(self):
+      handle = getattr(self.func, '__self__', None)
+      getter = getattr(handle, 'getRegisterMap', None)
+      return getter() if getter is not None else None
+
    def getAddr(self):
       return self.addr
 
@@ -43,10 +48,13 @@ class GpioFuncImpl(Gpio):
    def _activeValue(self):
       return 0 if self.isActiveLow() else 1
 
+   def isActiveValue(self, value):
+      return value == self._activeValue()
+
    def isActive(self):
       if inSimulation():
          return True
-      return self.getRawValue() == self._activeValue()
+      return self.isActiveValue(self.getRawValue())
 
    def setActive(self, value):
       self.setRawValue(not value if self.isActiveLow() else value)
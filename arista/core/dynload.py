@@ -1,56 +1,101 @@
 
 import importlib
+import json
+import os
 import pkgutil
-import sys
 
-if sys.version_info < (3, 12):
-   get_module_loader = lambda finder, name: finder.find_module(name)
-else:
-   get_module_loader = lambda finder, name: finder.find_spec(name).loader
+from .config import tmpfsPath
+from .log import getLogger
 
-def walk_packages(path=None, prefix='', onerror=None):
-   """Implementation from https://github.com/python/cpython/pull/11956"""
-   def seen(p, m={}): # pylint: disable=dangerous-default-value
-      if p in m:
-         return True
-      m[p] = True
-      return False
+logging = getLogger(__name__)
 
-   for info in pkgutil.iter_modules(path, prefix):
-      yield info
+SUBMODULE_CACHE_NAME = 'dynload.json'
+
+class SubmoduleCache(object):
+   '''On disk cache of the submodules found under a package
+
+   An entry is only valid as long as the mtime of every directory of the
+   package is unchanged, adding or removing a module updates the mtime of
+   its directory.
+   '''
+
+   def __init__(self, path=None):
+      self.path = path
+      self.entries_ = None
 
-      if info.ispkg:
-         loader = get_module_loader(info.module_finder, info.name)
+   def getPath(self):
+      return self.path or tmpfsPath(SUBMODULE_CACHE_NAME)
+
+   def _entries(self):
+      if self.entries_ is None:
          try:
-            module = loader.load_module(info.name)
-         except ImportError:
-            if onerror is not None:
-               onerror(info.name)
-         except Exception: # pylint: disable=broad-except
-            if onerror is not None:
-               onerror(info.name)
-            else:
-               raise
-         else:
-            path = module.__path__
-
-            # don't traverse path items we've seen before
-            path = [p for p in path if not seen(p)]
-
-            yield from walk_packages(path, info.name + '.', onerror)
-
-def importSubmodules(package, prefix=None, recursive=True):
-   if isinstance(package, str):
-      prefix = package + '.'
-      package = importlib.import_module(package)
-   else:
-      prefix = package.__module__
+            with open(self.getPath(), encoding='utf-8') as f:
+               self.entries_ = json.load(f)
+         except (OSError, ValueError):
+            self.entries_ = {}
+      return self.entries_
+
+   def get(self, package):
+      entry = self._entries().get(package)
+      if entry is None:
+         return None
+      for path, mtime in entry['mtimes'].items():
+         try:
+            if os.stat(path).st_mtime != mtime:
+               return None
+         except OSError:
+            return None
+      return entry['modules']
+
+   def set(self, package, modules, mtimes):
+      entries = self._entries()
+      entries[package] = {
+         'modules': modules,
+         'mtimes': mtimes,
+      }
+      path = self.getPath()
+      if not os.path.isdir(os.path.dirname(path)):
+         return
+      tmpPath = '%s.%d' % (path, os.getpid())
+      try:
+         with open(tmpPath, 'w', encoding='utf-8') as f:
+            json.dump(entries, f)
+         os.rename(tmpPath, path)
+      except OSError as e:
+         logging.debug('could not write submodule cache %s: %s', path, e)
 
-   modules = {}
-   for info in walk_packages(package.__path__, prefix=prefix):
-      fullName = info.name
-      modules[fullName] = importlib.import_module(fullName)
+_submoduleCache = SubmoduleCache()
+
+def _findSubmodules(path, prefix, recursive, modules, mtimes):
+   for dirPath in path:
+      mtimes[dirPath] = os.stat(dirPath).st_mtime
+   for info in pkgutil.iter_modules(path, prefix):
+      modules.append(info.name)
       if recursive and info.ispkg:
-         modules.update(importSubmodules(fullName, fullName + '.'))
+         # NOTE: the package is needed to know its path, it is imported once
+         #       here and reused from sys.modules afterwards
+         package = importlib.import_module(info.name)
+         _findSubmodules(package.__path__, info.name + '.', recursive, modules,
+                         mtimes)
 
+def findSubmodules(package, recursive=True, cache=None):
+   '''Return the name of the submodules of package without importing them'''
+   cache = cache or _submoduleCache
+   key = '%s:%s' % (package.__name__, 'recursive' if recursive else 'flat')
+   modules = cache.get(key)
+   if modules is None:
+      modules = []
+      mtimes = {}
+      _findSubmodules(package.__path__, package.__name__ + '.', recursive,
+                      modules, mtimes)
+      cache.set(key, modules, mtimes)
    return modules
+
+def importSubmodules(package, recursive=True, cache=None):
+   if isinstance(package, str):
+      package = importlib.import_module(package)
+
+   return {
+      name: importlib.import_module(name)
+      for name in findSubmodules(package, recursive=recursive, cache=cache)
+   }
@@ -7,6 +7,7 @@ from ctypes import \
    sizeof, \
    cast, \
    pointer
+from errno import EINVAL, EOPNOTSUPP
 from fcntl import ioctl
 from .log import getLogger
 
@@ -16,6 +17,7 @@ I2C_M_RD = 0x0001
 I2C_M_RECV_LEN = 0x0400
 
 I2C_RDWR = 0x0707
+I2C_RDWR_IOCTL_MAX_MSGS = 42
 
 I2C_SMBUS_BLOCK_MAX = 32
 
@@ -86,10 +88,85 @@ class i2c_rdwr_ioctl_data(Structure):
    def __repr__(self):
       return str(self)
 
+class I2cReadBatch(object):
+   '''Preallocated I2C_RDWR transfers for several independent reads
+
+   Each read writes a command and reads back a fixed number of bytes. The
+   ctypes buffers and message arrays are allocated once for a given shape of
+   reads and reused by every transfer.
+
+   The SCD SMBus master queues a whole transfer in its request fifo, one
+   entry per byte of each message plus one for its address, and fails the
+   transfer when it overflows. A transfer is therefore limited to the fifo
+   size reported by the adapter, or to DEFAULT_FIFO_ENTRIES, the smallest
+   fifo of the SCD, when the adapter does not report any. A read larger than
+   the fifo gets a transfer of its own.
+
+   With a 127 entries fifo, an ADM1266 blackbox record read (3 bytes of
+   command, 65 bytes of data, 70 entries) still needs one transfer per
+   record, a 255 entries fifo carries 3 of them and a 1023 one 14.
+   '''
+
+   MAX_READS = I2C_RDWR_IOCTL_MAX_MSGS // 2
+   DEFAULT_FIFO_ENTRIES = 127
+
+   def __init__(self, addr, shape, fifoEntries=DEFAULT_FIFO_ENTRIES):
+      self.addr = addr
+      self.shape = shape
+      self.wrbufs = [(c_uint8 * cmdlen)() for cmdlen, _ in shape]
+      self.rdbufs = [(c_uint8 * datalen)() for _, datalen in shape]
+      self.msgs = []
+      self.transfers = []
+      for start, count in self.splitTransfers(shape, fifoEntries):
+         msgs = (i2c_msg * (2 * count))()
+         for i in range(count):
+            wrbuf = self.wrbufs[start + i]
+            rdbuf = self.rdbufs[start + i]
+            msgs[2 * i] = i2c_msg(addr, 0, sizeof(wrbuf),
+                                  cast(wrbuf, POINTER(c_uint8)))
+            msgs[2 * i + 1] = i2c_msg(addr, I2C_M_RD, sizeof(rdbuf),
+                                      cast(rdbuf, POINTER(c_uint8)))
+         self.msgs.append(msgs)
+         self.transfers.append(i2c_rdwr_ioctl_data(msgs, 2 * count))
+
+   @classmethod
+   def splitTransfers(cls, shape, fifoEntries=DEFAULT_FIFO_ENTRIES):
+      '''Return the (start, count) of the reads of each transfer'''
+      transfers = []
+      start = 0
+      size = 0
+      for i, (cmdlen, datalen) in enumerate(shape):
+         # NOTE: both messages of a read take an entry for their address
+         length = 2 + cmdlen + datalen
+         count = i - start
+         if count and (count == cls.MAX_READS or
+                       size + length > fifoEntries):
+            transfers.append((start, count))
+            start = i
+            size = 0
+         size += length
+      if start < len(shape):
+         transfers.append((start, len(shape) - start))
+      return transfers
+
+   @staticmethod
+   def shapeOf(reads):
+      return tuple((len(cmd), datalen) for cmd, datalen in reads)
+
+   def setCommands(self, cmds):
+      for wrbuf, cmd in zip(self.wrbufs, cmds):
+         wrbuf[:] = cmd
+
+   def results(self):
+      return [list(rdbuf) for rdbuf in self.rdbufs]
+
 class I2cMsg(object):
    def __init__(self, addr):
       self.addr = addr
       self.device = None
+      self.batches = {}
+      self.batchSupported = True
+      self.fifoEntries = None
 
    def __str__(self):
       return '%s(%s, fd=%d)' % (
@@ -150,3 +227,45 @@ class I2cMsg(object):
                                                   pointer(rdbuf))
       self.i2c_rdwr(ioctl_data)
       return [rdbuf[i] for i in range(ioctl_data.msgs[1].len)]
+
+   def getFifoEntries(self):
+      '''Size of the request fifo of the adapter, as reported by the SCD'''
+      if self.fifoEntries is None:
+         path = '/sys/bus/i2c/devices/i2c-%d/smbus_fifo_size' % self.addr.bus
+         try:
+            with open(path, encoding='utf-8') as f:
+               entries = int(f.read())
+         except (OSError, ValueError):
+            entries = 0
+         if entries <= 0:
+            entries = I2cReadBatch.DEFAULT_FIFO_ENTRIES
+         self.fifoEntries = entries
+      return self.fifoEntries
+
+   def read_batch(self, addr, reads):
+      '''Perform several independent (cmd, datalen) reads in as few transfers
+         as possible, falling back to one transfer per read when the adapter
+         does not support them'''
+      if not reads:
+         return []
+      if self.batchSupported:
+         try:
+            return self._read_batch(addr, reads)
+         except OSError as e:
+            if e.errno not in (EOPNOTSUPP, EINVAL):
+               raise
+            self.batchSupported = False
+            logging.debug('%s: batched read unsupported, reading one by one: %s',
+                          self, e)
+      return [self.read_bytes(addr, cmd, datalen) for cmd, datalen in reads]
+
+   def _read_batch(self, addr, reads):
+      shape = I2cReadBatch.shapeOf(reads)
+      batch = self.batches.get((addr, shape))
+      if batch is None:
+         batch = I2cReadBatch(addr, shape, self.getFifoEntries())
+         self.batches[(addr, shape)] = batch
+      batch.setCommands(cmd for cmd, _ in reads)
+      for transfer in batch.transfers:
+         self.i2c_rdwr(transfer)
+      return batch.results()
@@ -1,12 +1,99 @@
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
+from functools import wraps
+from types import MappingProxyType
 
 # NOTE: these import are for inventory objects critical to the .core package
 # pylint: disable=unused-import
 from ..inventory.reloadcause import ReloadCause, ReloadCauseProvider
 from ..inventory.slot import Slot
-
+from ..libs.integer import setBitOffsets
+
+from .log import getLogger
+from .utils import inSimulation
+
+logging = getLogger(__name__)
+
+class XcvrPresenceReader(object):
+   '''Read the presence of many transceiver slots as a bitmap
+
+   Bit N of the bitmap is set when slot N is present. Presence gpios that
+   the kernel driver can report in bulk are grouped per reader so that a
+   scan reads a single attribute per device, other slots use getPresence.
+   '''
+
+   def __init__(self, slots):
+      self.slots = list(slots)
+      self.mask = 0
+      self.readers = OrderedDict()
+      self.others = []
+      for slot in self.slots:
+         self.mask |= 1 << slot.getId()
+         gpio = slot.getPresenceGpio()
+         reader = gpio.getBulkReader() if gpio is not None else None
+         if reader is None:
+            self.others.append(slot)
+            continue
+         self.readers.setdefault(reader, []).append((slot, gpio))
+
+   def __str__(self):
+      return '%s(slots=%d, readers=%d)' % (self.__class__.__name__,
+                                           len(self.slots), len(self.readers))
+
+   @staticmethod
+   def _slotsBitmap(slots):
+      bitmap = 0
+      for slot in slots:
+         if slot.getPresence():
+            bitmap |= 1 << slot.getId()
+      return bitmap
+
+   def read(self):
+      if inSimulation():
+         return self._slotsBitmap(self.slots)
+
+      bitmap = self._slotsBitmap(self.others)
+      for reader, entries in self.readers.items():
+         try:
+            values = reader.read()
+         except (IOError, OSError) as e:
+            logging.debug('%s: failed to read %s: %s', self, reader, e)
+            values = {}
+         for slot, gpio in entries:
+            value = values.get(gpio.getName())
+            if value is None:
+               bitmap |= self._slotsBitmap([slot])
+            elif gpio.isActiveValue(value):
+               bitmap |= 1 << slot.getId()
+      return bitmap
+
+def diffPresenceBitmaps(old, new):
+   '''Return the lists of inserted and removed slot ids between two bitmaps'''
+   changed = old ^ new
+   return setBitOffsets(changed & new), setBitOffsets(changed & old)
+
+def _bumpGeneration(func):
+   @wraps(func)
+   def wrapper(self, *args, **kwargs):
+      self.generation_ += 1
+      return func(self, *args, **kwargs)
+   return wrapper
+
+def _trackChanges(cls):
+   '''Count the modifications of an inventory in its generation_ attribute
+
+   Every add* method bumps the generation which lets aggregated views know
+   when their content is stale.
+   '''
+   for name, value in list(vars(cls).items()):
+      if name.startswith('add') and callable(value):
+         setattr(cls, name, _bumpGeneration(value))
+   return cls
+
+@_trackChanges
 class Inventory():
    def __init__(self):
+      self.generation_ = 0
+
       self.leds = {}
       self.ledGroups = {}
 
@@ -14,11 +101,14 @@ class Inventory():
       self.sfps = {}
       self.qsfps = {}
       self.osfps = {}
+      self.xcvrs = {}
 
       self.ethernetSlots = {}
       self.sfpSlots = {}
       self.qsfpSlots = {}
       self.osfpSlots = {}
+      self.xcvrSlots = {}
+      self.xcvrPresenceReader_ = None
 
       self.psus = []
 
@@ -53,15 +143,11 @@ class Inventory():
       self.seuReporters = []
 
    def getXcvrs(self):
-      xcvrs = {}
-      xcvrs.update(self.getEthernets())
-      xcvrs.update(self.getSfps())
-      xcvrs.update(self.getQsfps())
-      xcvrs.update(self.getOsfps())
-      return xcvrs
+      return MappingProxyType(self.xcvrs)
 
    def addEthernet(self, eth):
       self.ethernets[eth.getId()] = eth
+      self.xcvrs[eth.getId()] = eth
       return eth
 
    def getEthernets(self):
@@ -72,6 +158,7 @@ class Inventory():
 
    def addSfp(self, sfp):
       self.sfps[sfp.getId()] = sfp
+      self.xcvrs[sfp.getId()] = sfp
       return sfp
 
    def getSfps(self):
@@ -82,6 +169,7 @@ class Inventory():
 
    def addQsfp(self, qsfp):
       self.qsfps[qsfp.getId()] = qsfp
+      self.xcvrs[qsfp.getId()] = qsfp
       return qsfp
 
    def getQsfps(self):
@@ -92,6 +180,7 @@ class Inventory():
 
    def addOsfp(self, osfp):
       self.osfps[osfp.getId()] = osfp
+      self.xcvrs[osfp.getId()] = osfp
       return osfp
 
    def getOsfps(self):
@@ -101,33 +190,42 @@ class Inventory():
       return self.osfps[xcvrId]
 
    def getXcvrSlot(self, slotId):
-      return self.ethernetSlots.get(slotId) or \
-             self.sfpSlots.get(slotId) or \
-             self.qsfpSlots.get(slotId) or \
-             self.osfpSlots.get(slotId)
+      return self.xcvrSlots.get(slotId)
 
    def getXcvrSlots(self):
-      xcvrSlots = {}
-      xcvrSlots.update(self.getEthernetSlots())
-      xcvrSlots.update(self.getSfpSlots())
-      xcvrSlots.update(self.getQsfpSlots())
-      xcvrSlots.update(self.getOsfpSlots())
-      return xcvrSlots
+      return MappingProxyType(self.xcvrSlots)
+
+   def getXcvrPresenceReader(self):
+      if self.xcvrPresenceReader_ is None:
+         self.xcvrPresenceReader_ = XcvrPresenceReader(
+            self.getXcvrSlots().values())
+      return self.xcvrPresenceReader_
+
+   def getXcvrPresenceBitmap(self):
+      return self.getXcvrPresenceReader().read()
 
    def addEthernetSlot(self, slot):
       self.ethernetSlots[slot.getId()] = slot
+      self.xcvrSlots[slot.getId()] = slot
+      self.xcvrPresenceReader_ = None
       return slot
 
    def addSfpSlot(self, slot):
       self.sfpSlots[slot.getId()] = slot
+      self.xcvrSlots[slot.getId()] = slot
+      self.xcvrPresenceReader_ = None
       return slot
 
    def addQsfpSlot(self, slot):
       self.qsfpSlots[slot.getId()] = slot
+      self.xcvrSlots[slot.getId()] = slot
+      self.xcvrPresenceReader_ = None
       return slot
 
    def addOsfpSlot(self, slot):
       self.osfpSlots[slot.getId()] = slot
+      self.xcvrSlots[slot.getId()] = slot
+      self.xcvrPresenceReader_ = None
       return slot
 
    def getEthernetSlots(self):
@@ -1,5 +1,8 @@
 import copy
 
+from collections.abc import Mapping
+from types import MappingProxyType
+
 from .inventory import Inventory
 
 _TEMPLATE_INVENTORY = Inventory()
@@ -16,24 +19,101 @@ class LazyInventory(Inventory):
       setattr(self, key, value)
       return value
 
+def _copyView(view):
+   if isinstance(view, list):
+      return list(view)
+   if isinstance(view, dict):
+      return dict(view)
+   return view
+
 class MetaInventory(object):
+   '''Aggregated view of several inventories
+
+   Aggregated collections listed in MEMOIZED are only recomputed when an
+   inventory is attached or detached, which requires a call to invalidate,
+   or when one of the inventories gets new items. Callers get a copy or a
+   read-only view of them. Other getters like getXcvrPresenceBitmap read
+   the hardware and are aggregated on every call.
+   '''
+
+   MEMOIZED = frozenset([
+      'getEthernets',
+      'getEthernetSlots',
+      'getFanSlots',
+      'getFans',
+      'getGpios',
+      'getInterrupts',
+      'getLedGroups',
+      'getLeds',
+      'getNumFans',
+      'getNumPsuSlots',
+      'getNumPsus',
+      'getOsfpSlots',
+      'getOsfps',
+      'getPhys',
+      'getPortToEepromMapping',
+      'getPortToI2cAdapterMapping',
+      'getPowerCycles',
+      'getProgrammables',
+      'getPsuSlots',
+      'getPsus',
+      'getQsfpSlots',
+      'getQsfps',
+      'getRails',
+      'getReloadCauseProviders',
+      'getResets',
+      'getSeuReporters',
+      'getSfpSlots',
+      'getSfps',
+      'getSlots',
+      'getTemps',
+      'getWatchdogs',
+      'getXcvrSlots',
+      'getXcvrs',
+   ])
+
    def __init__(self, invs=None):
-      # NOTE: invs could have been an iterator but it can only be used one
-      #       for dynamic inventory list, use a function that returns
-      #       inventories.
-      self.invs = list(invs) if invs is not None else []
+      self.invsSource_ = []
+      self.invs_ = None
+      self.views_ = {}
+      self.invs = invs if invs is not None else []
+
+   @property
+   def invs(self):
+      if self.invs_ is None:
+         source = self.invsSource_
+         self.invs_ = list(source() if callable(source) else source)
+      return self.invs_
+
+   @invs.setter
+   def invs(self, invs):
+      # NOTE: an iterator can only be used once, for a dynamic inventory list
+      #       use a function that returns the inventories, it is called
+      #       again after each invalidation.
+      self.invsSource_ = invs if callable(invs) else list(invs)
+      self.invalidate()
+
+   def invalidate(self):
+      self.invs_ = None
+      self.views_ = {}
+
+   def _generations(self):
+      return tuple(inv.generation_ for inv in self.invs)
+
+   def getXcvrSlot(self, slotId):
+      return self.getXcvrSlots().get(slotId)
 
    def __getattr__(self, key):
       func = getattr(Inventory, key)
 
-      def callbackCol():
+      def aggregate():
          data = None
          count = 0
          for inv in self.invs:
             res = func(inv)
             if data is None:
-               data = type(res)()
-            if isinstance(res, dict):
+               data = {} if isinstance(res, Mapping) else type(res)()
+            if isinstance(res, Mapping):
                data.update(res)
             elif isinstance(res, list):
                data.extend(res)
@@ -43,9 +123,24 @@ class MetaInventory(object):
                raise ValueError('Unknown type to process')
             count += 1
          if count == 0:
-            return copy.deepcopy(getattr(_TEMPLATE_INVENTORY, key)())
+            res = getattr(_TEMPLATE_INVENTORY, key)()
+            if isinstance(res, MappingProxyType):
+               return MappingProxyType({})
+            return copy.deepcopy(res)
+         if isinstance(res, MappingProxyType):
+            return MappingProxyType(data)
          return data
 
+      def callbackCol():
+         if key not in self.MEMOIZED:
+            return aggregate()
+         generations = self._generations()
+         view = self.views_.get(key)
+         if view is None or view[0] != generations:
+            view = (generations, aggregate())
+            self.views_[key] = view
+         return _copyView(view[1])
+
       def callbackItem(*args):
          for inv in self.invs:
             try:
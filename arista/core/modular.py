@@ -18,7 +18,7 @@ class Modular(Sku):
    def __init__(self, inventory=None, **kwargs):
       inventory = inventory or MetaInventory()
       super(Modular, self).__init__(inventory=inventory, **kwargs)
-      self.inventory.invs = iter(self.iterAllInventories())
+      self.inventory.invs = self.iterAllInventories
 
       self.supervisors = [None] * self.NUM_SUPERVISORS
       self.active = None
@@ -74,6 +74,7 @@ class Modular(Sku):
          logging.debug('Loading linecard slot %d', slot.slotId)
          standbyOnly = Config().linecard_standby_only
          slot.loadCard(standbyOnly=standbyOnly)
+      self.inventory.invalidate()
 
    def loadFabrics(self, slotIds=None):
       for slot in self.active.fabricSlots[:self.NUM_FABRICS]:
@@ -81,6 +82,7 @@ class Modular(Sku):
             continue
          logging.debug('Loading fabric slot %d', slot.slotId)
          slot.loadCard()
+      self.inventory.invalidate()
 
    def loadPsus(self, slotIds=None):
       for slot in self.active.psuSlots[:self.NUM_PSUS]:
@@ -88,6 +90,7 @@ class Modular(Sku):
             continue
          logging.debug('Loading psu slot %d', slot.slotId)
          slot.load()
+      self.inventory.invalidate()
 
    def loadAll(self):
       self.loadPsus()
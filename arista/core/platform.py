@@ -1,5 +1,6 @@
 from __future__ import print_function
 
+import importlib
 import os
 import re
 
@@ -30,11 +31,25 @@ IDENT_BUS_NAMES = [
    'SMBus PIIX4 adapter port 1 at 0b20',
 ]
 
+PLATFORMS_PACKAGE = 'arista.platforms'
+PLATFORMS_MANIFEST = 'manifest'
+
 class PlatformManager:
-   def __init__(self):
+   '''Registry of the platform definitions
+
+   Platform modules are imported on demand. A manifest generated at build
+   time maps every SID and SKU to the module defining it so that only the
+   module of the requested platform is imported. A missing or stale
+   manifest falls back on importing every platform module.
+   '''
+
+   def __init__(self, package=PLATFORMS_PACKAGE):
       self.platforms = []
       self.platformSidIndex = {}
       self.platformSkuIndex = {}
+      self.package = package
+      self.manifest_ = None
+      self.loaded = False
 
    def registerPlatform(self, cls):
       self.platforms.append(cls)
@@ -51,6 +66,53 @@ class PlatformManager:
 
       return cls
 
+   def getManifest(self):
+      if self.manifest_ is None:
+         name = '%s.%s' % (self.package, PLATFORMS_MANIFEST)
+         try:
+            self.manifest_ = importlib.import_module(name).PLATFORM_MANIFEST
+         except (ImportError, AttributeError):
+            logging.debug('No platform manifest found, loading all platforms')
+            self.manifest_ = {}
+      return self.manifest_
+
+   def getIndex(self, kind):
+      return self.platformSkuIndex if kind == 'sku' else self.platformSidIndex
+
+   def loadPlatformFromManifest(self, kind, name):
+      module = self.getManifest().get(kind, {}).get(name)
+      if module is None:
+         return None
+      try:
+         importlib.import_module('%s.%s' % (self.package, module))
+      except ImportError:
+         logging.debug('Platform manifest entry %s for %s is stale', module, name)
+         return None
+      return self.getIndex(kind).get(name)
+
+   def findPlatformCls(self, candidates):
+      '''Return the class of the first (kind, name) candidate found
+
+      Candidates are only evaluated when needed, when none of them is found
+      from the manifest every platform is loaded and they are looked up again.
+      '''
+      evaluated = []
+      for kind, name in candidates:
+         if not name:
+            continue
+         evaluated.append((kind, name))
+         platformCls = self.getIndex(kind).get(name)
+         if platformCls is None and not self.loaded:
+            platformCls = self.loadPlatformFromManifest(kind, name)
+         if platformCls is not None:
+            return platformCls
+
+      if not self.loaded:
+         self.loadPlatforms()
+         return self.findPlatformCls(evaluated)
+
+      return None
+
    def detectPlatform(self):
       # TODO: refactor by obtaining a Cpu object based on the platform= from
       #       cmdline implement getEeprom on all Cpu to get the prefdl from hw
@@ -58,43 +120,46 @@ class PlatformManager:
       #       today
       getSysEeprom()
 
-      sid = readSid()
-      platformCls = self.platformSidIndex.get(sid)
-      if platformCls is not None:
-         return platformCls
-
-      sku = readSku()
-      platformCls = self.platformSkuIndex.get(sku)
-      if platformCls is not None:
-         return platformCls
+      def candidates():
+         yield 'sid', readSid()
+         yield 'sku', readSku()
+         yield 'sid', readPlatformName()
 
-      name = readPlatformName()
-      platformCls = self.platformSidIndex.get(name)
+      platformCls = self.findPlatformCls(candidates())
       if platformCls is not None:
          return platformCls
 
-      raise UnknownPlatformError(sku, sid, name, self.platforms)
+      raise UnknownPlatformError(readSku(), readSid(), readPlatformName(),
+                                 self.platforms)
 
    def getPlatformCls(self, *names):
       if not names or not [name for name in names if name]:
          return self.detectPlatform()
 
+      candidates = []
       for name in names:
-         if name is None:
-            continue
-
-         platformCls = self.platformSkuIndex.get(name)
-         if platformCls is not None:
-            return platformCls
-
-         platformCls = self.platformSidIndex.get(name)
-         if platformCls is not None:
-            return platformCls
+         candidates.extend([('sku', name), ('sid', name)])
+      platformCls = self.findPlatformCls(candidates)
+      if platformCls is not None:
+         return platformCls
 
       raise UnknownPlatformError(names, self.platforms)
 
-   def loadPlatforms(self, package):
-      return importSubmodules(package).keys()
+   def loadPlatforms(self):
+      if not self.loaded:
+         importSubmodules(self.package)
+         self.loaded = True
+
+   def generateManifest(self):
+      self.loadPlatforms()
+      prefix = self.package + '.'
+      return {
+         kind: {
+            name: cls.__module__[len(prefix):]
+            for name, cls in self.getIndex(kind).items()
+            if cls.__module__.startswith(prefix)
+         } for kind in ['sid', 'sku']
+      }
 
 manager = PlatformManager()
 
@@ -211,19 +276,41 @@ def getPlatform(name=None):
    return platform
 
 def getPlatformSkus():
+   loadPlatforms()
    return manager.platformSkuIndex
 
 def getPlatformSids():
+   loadPlatforms()
    return manager.platformSidIndex
 
 def getPlatforms():
+   loadPlatforms()
    return manager.platforms
 
 def loadPlatforms():
+   if manager.loaded:
+      return
    with timeit('Loading platform definitions'):
-      from .. import platforms as _
+      manager.loadPlatforms()
    logging.debug('Loaded %d platforms', len(manager.platforms))
 
+def writePlatformManifest(path=None):
+   if path is None:
+      package = importlib.import_module(manager.package)
+      path = os.path.join(os.path.dirname(package.__file__),
+                          '%s.py' % PLATFORMS_MANIFEST)
+   manifest = manager.generateManifest()
+   with open(path, 'w', encoding='utf-8') as f:
+      f.write('# autogenerated by the build system\n')
+      f.write('PLATFORM_MANIFEST = {\n')
+      for kind, modules in sorted(manifest.items()):
+         f.write('   %r: {\n' % kind)
+         for name, module in sorted(modules.items()):
+            f.write('      %r: %r,\n' % (name, module))
+         f.write('   },\n')
+      f.write('}\n')
+   return path
+
 def registerPlatform():
    def wrapper(cls):
       return manager.registerPlatform(cls)
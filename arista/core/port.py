@@ -1,30 +1,51 @@
 from ..descs.xcvr import Osfp, Qsfp, QsfpDD, Rj45, Sfp
 
 class PortLayout():
+   '''Ordered set of front panel ports
+
+   The layout is immutable once built, ports are indexed by id and name and
+   the per type views are computed upfront. The returned lists are shared
+   and must not be modified by callers.
+   '''
+
    def __init__(self, *args):
       self.ports = [p for pgen in args for p in pgen]
+      self.portsById = {}
+      self.portsByName = {}
+      for p in self.ports:
+         self.portsById.setdefault(p.index, p)
+         self.portsByName.setdefault(p.getName(), p)
+      self.ethernets = [p for p in self.ports if isinstance(p, Rj45)]
+      self.sfps = [p for p in self.ports if isinstance(p, Sfp)]
+      self.qsfps = [p for p in self.ports if
+                    isinstance(p, Qsfp) and not isinstance(p, QsfpDD)]
+      self.osfps = [p for p in self.ports if isinstance(p, (Osfp, QsfpDD))]
+      self.portsByType = {}
 
    def getEthernets(self):
-      return [p for p in self.ports if isinstance(p, Rj45)]
+      return self.ethernets
 
    def getSfps(self):
-      return [p for p in self.ports if isinstance(p, Sfp)]
+      return self.sfps
 
    def getQsfps(self):
-      return [p for p in self.ports if
-               isinstance(p, Qsfp) and not isinstance(p, QsfpDD)]
+      return self.qsfps
 
    def getOsfps(self):
-      return [p for p in self.ports if isinstance(p, (Osfp, QsfpDD))]
+      return self.osfps
 
    def getAllPorts(self):
       return self.ports
 
    def getPorts(self, *args):
-      return [p for p in self.ports if isinstance(p, args)]
+      ports = self.portsByType.get(args)
+      if ports is None:
+         ports = [p for p in self.ports if isinstance(p, args)]
+         self.portsByType[args] = ports
+      return ports
 
    def getPort(self, index):
-      filtered = [p for p in self.ports if p.index == index]
-      if not filtered:
-         return None
-      return filtered[0]
+      return self.portsById.get(index)
+
+   def getPortByName(self, name):
+      return self.portsByName.get(name)
@@ -1,5 +1,6 @@
 
 import copy
+import importlib
 
 from .component import Priority
 from .component.slot import SlotComponent
@@ -128,38 +129,62 @@ class PsuModel:
       return False
 
 class PsuManager:
+   '''Registry of the PSU models
+
+   Modules defining PSU models are only imported when needed. A model known
+   by name and module, like the one stored in a slot cache, only requires
+   its own module. Every module is loaded when the full list is requested.
+   '''
+
    def __init__(self):
       self.psus_ = []
+      self.psusByName_ = {}
       self.modules = None
       self.package = 'arista.components.psu'
 
    def _loadModule(self, module):
       for value in module.__dict__.values():
          if isinstance(value, type) and issubclass(value, PsuModel) and \
-            value != PsuModel:
+            value != PsuModel and value not in self.psus_:
             self.psus_.append(value)
+            self.psusByName_.setdefault(value.__name__, value)
       self.psus_ = list(sorted(self.psus_, key=lambda p: not p.SUPPORT_SMBUS_PING))
 
+   def loadPsuModule(self, name):
+      if not name.startswith(self.package + '.') or '.tests' in name:
+         return
+      try:
+         self._loadModule(importlib.import_module(name))
+      except ImportError as e:
+         logging.debug('could not load psu module %s: %s', name, e)
+
    def loadPsuModels(self):
       if self.modules is not None:
          return
       self.modules = importSubmodules(self.package)
       for name, module in self.modules.items():
-         if '/tests/' in name:
+         if '.tests' in name:
             continue
          self._loadModule(module)
 
    @property
    def psuModels(self):
-      if not self.psus_:
-         self.loadPsuModels()
+      self.loadPsuModels()
       return self.psus_
 
-   def psuForIdentifier(self, clsname, identifier):
-      for model in self.psuModels:
+   def psuForIdentifier(self, clsname, identifier, module=None, models=None):
+      for model in models or []:
          if model.__name__ == clsname:
             return model(identifier)
-      return None
+
+      model = self.psusByName_.get(clsname)
+      if model is None and module is not None:
+         self.loadPsuModule(module)
+         model = self.psusByName_.get(clsname)
+      if model is None:
+         self.loadPsuModels()
+         model = self.psusByName_.get(clsname)
+      return model(identifier) if model is not None else None
 
    def identifyPsuModel(self, model, detector):
       if not model.isManufacturer(detector.id().lower()):
@@ -173,14 +198,8 @@ class PsuManager:
 
       return None
 
-   def autodetectPmbusPsu(self, slot, tryAll=True):
+   def detectPmbusPsus(self, slot, models, detectors):
       psus = []
-      detectors = {}
-      # try expected PSU models first
-      models = slot.psus
-      if tryAll:
-         models = slot.psus + [p for p in self.psuModels \
-               if p not in slot.psus and p.AUTODETECT_PMBUS]
       for model in models:
          if not model.PMBUS_ADDR:
             continue
@@ -213,6 +232,18 @@ class PsuManager:
 
       return psus
 
+   def autodetectPmbusPsu(self, slot, tryAll=True):
+      detectors = {}
+      # try expected PSU models first, other models are only loaded when none
+      # of them matched
+      psus = self.detectPmbusPsus(slot, slot.psus, detectors)
+      if psus or not tryAll:
+         return psus
+
+      models = [p for p in self.psuModels
+                if p not in slot.psus and p.AUTODETECT_PMBUS]
+      return self.detectPmbusPsus(slot, models, detectors)
+
 _manager = PsuManager()
 def getPsuManager():
    return _manager
@@ -284,6 +315,7 @@ class PsuSlot(SlotComponent):
       cache = self.getCacheStore()
       cache.write({
          'cls': self.model.__class__.__name__,
+         'module': self.model.__class__.__module__,
          'identifier': self.model.identifier.__dict__,
       }, mode='w+')
 
@@ -297,7 +329,9 @@ class PsuSlot(SlotComponent):
 
       clsname = data['cls']
       identifier = PsuIdent(**data['identifier'])
-      return getPsuManager().psuForIdentifier(clsname, identifier)
+      return getPsuManager().psuForIdentifier(clsname, identifier,
+                                              module=data.get('module'),
+                                              models=self.psus)
 
    def logPsuInformation(self):
       logging.debug("PSU %d name: %s", self.slotId, self.model.identifier.aristaName)
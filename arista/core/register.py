@@ -1,5 +1,7 @@
 
+import contextlib
 import copy
+import threading
 
 from .driver.user.gpio import GpioFuncImpl
 from .log import getLogger
@@ -26,6 +28,9 @@ class HardwareHandle(object):
    def log(self, fmt, *args):
       logging.io('%s ' + fmt, self.fullName(), *args)
 
+   def getRegisterMap(self):
+      return self.parent.getRegisterMap()
+
 class RegBitField(HardwareHandle):
    def __init__(self, bitpos, name, ro=True, flip=False, parent=None):
       '''Parent of this class is Register'''
@@ -121,6 +126,7 @@ class Register(HardwareHandle):
       self.name = kwargs.get('name')
       self.ro = kwargs.get('ro')
       self.default = kwargs.get('default')
+      self.regmap = None
 
    def __str__(self):
       return self.shortName()
@@ -134,32 +140,70 @@ class Register(HardwareHandle):
    def split(self):
       pass
 
-   def read(self):
+   def copy(self):
+      '''Lightweight copy of a register template to be bound to a RegisterMap'''
+      reg = copy.copy(self)
+      reg.fields = tuple(copy.copy(field) for field in self.fields)
+      return reg
+
+   def readHardware(self):
       value = self.parent.read(self.addr)
       if self.name:
           self.log('read(): %#x', value)
       return value
 
-   def write(self, value):
+   def writeHardware(self, value):
       if self.name:
           self.log('write(%#x)', value)
       return self.parent.write(self.addr, value)
 
+   def _pendingWrites(self):
+      if self.regmap is None:
+         return None
+      return self.regmap.pendingWrites_
+
+   def read(self):
+      '''Read the register, seeing the writes pending in a transaction'''
+      pending = self._pendingWrites()
+      if pending is not None and self.addr in pending:
+         return pending[self.addr][1]
+      return self.readHardware()
+
+   def write(self, value):
+      '''Write the register, or defer the write until the end of the
+         transaction when one is in progress'''
+      pending = self._pendingWrites()
+      if pending is None:
+         return self.writeHardware(value)
+      pending[self.addr] = (self, value)
+      return None
+
    def readWrite(self, value=None):
       if value is None:
          return self.read()
       return self.write(value)
 
+   def getRegisterMap(self):
+      return self.regmap
+
+   def locked(self):
+      '''Serialize read-modify-write sequences on the register map, its
+         registers may be shared by components set up from other threads'''
+      if self.regmap is None:
+         return contextlib.nullcontext()
+      return self.regmap.lock_
+
    def readBit(self, bitpos):
       return (self.read() >> bitpos) & 1
 
    def writeBit(self, bitpos, value):
-      regval = self.read()
-      if value:
-         regval |= (1 << bitpos)
-      else:
-         regval &= ~(1 << bitpos)
-      return self.write(regval)
+      with self.locked():
+         regval = self.read()
+         if value:
+            regval |= (1 << bitpos)
+         else:
+            regval &= ~(1 << bitpos)
+         return self.write(regval)
 
    def readBits(self, bitstart, bitend):
       mask = (1 << (bitend - bitstart + 1)) - 1
@@ -167,8 +211,9 @@ class Register(HardwareHandle):
 
    def writeBits(self, bitstart, bitend, value):
       mask = (1 << (bitend - bitstart + 1)) - 1
-      regval = (self.read() & ~(mask << bitstart)) | (value << bitstart)
-      return self.write(regval)
+      with self.locked():
+         regval = (self.read() & ~(mask << bitstart)) | (value << bitstart)
+         return self.write(regval)
 
    def generateFieldAttributes(self, attrs, field):
       attrs[field.name] = field.getAttribute(self)
@@ -192,14 +237,16 @@ class ClearOnReadRegister(Register):
       self.cache = 0
 
    def readBit(self, bitpos):
-      bit = super(ClearOnReadRegister, self).readBit(bitpos)
-      self.cache &= ~(1 << bitpos)
-      return bit
+      with self.locked():
+         bit = super(ClearOnReadRegister, self).readBit(bitpos)
+         self.cache &= ~(1 << bitpos)
+         return bit
 
    def read(self):
-      self.cache |= super(ClearOnReadRegister, self).read()
-      # NOTE: clear on read behavior for users only happens via a readBit
-      return self.cache
+      with self.locked():
+         self.cache |= super(ClearOnReadRegister, self).read()
+         # NOTE: clear on read behavior for users only happens via a readBit
+         return self.cache
 
 class SetClearRegister(Register):
    def __init__(self, addrSet, addrClear, *fields, **kwargs):
@@ -247,20 +294,39 @@ class RegisterArray(Register):
       raise NotImplementedError
 
 class RegisterMap(object):
+
+   layout_ = []
+
+   def __init_subclass__(cls, **kwargs):
+      super().__init_subclass__(**kwargs)
+      cls.compileLayout()
+
+   @classmethod
+   def compileLayout(cls):
+      # list registers from parent to child definition to allow for proper
+      # overriding from child classes, an overridden register takes the
+      # position of its last definition
+      layout = {}
+      for klass in reversed(cls.mro()):
+         for key in klass.__dict__:
+            attr = getattr(cls, key, None)
+            if isinstance(attr, Register):
+               layout.pop(key, None)
+               layout[key] = attr
+      cls.layout_ = list(layout.values())
+
    def __init__(self, parent, offset=0):
       self.parent_ = parent
       self.attributes_ = []
       self.offset = offset
-      # initialize attributes from parent to child definition to allow for
-      # proper overriding from child classes
-      for cls in reversed(self.__class__.mro()):
-         for key in cls.__dict__:
-            attr = getattr(self, key)
-            if isinstance(attr, Register):
-               self._updateAttributes(copy.deepcopy(attr))
+      self.lock_ = threading.RLock()
+      self.local_ = threading.local()
+      for reg in self.layout_:
+         self._updateAttributes(reg.copy())
 
    def _updateAttributes(self, reg):
       reg.addr += self.offset
+      reg.regmap = self
       attrs = reg.generateAttributes(self.parent_)
       for key, value in attrs.items():
          self.attributes_.append(key)
@@ -269,6 +335,33 @@ class RegisterMap(object):
    def getGpio(self, name):
       return GpioFuncImpl(self, getattr(self, name))
 
+   @property
+   def pendingWrites_(self):
+      return getattr(self.local_, 'pendingWrites', None)
+
+   @contextlib.contextmanager
+   def transaction(self):
+      '''Coalesce the register writes done within the block into a single
+         write per register, flushed when leaving the outermost block
+
+      Writes are staged for the calling thread only and the map is locked
+      for the duration of the block so that other threads do not interleave
+      their own accesses with the staged ones.
+      '''
+      with self.lock_:
+         if self.pendingWrites_ is not None:
+            yield self
+            return
+
+         self.local_.pendingWrites = {}
+         try:
+            yield self
+         finally:
+            pending = self.local_.pendingWrites
+            self.local_.pendingWrites = None
+            for reg, value in pending.values():
+               reg.writeHardware(value)
+
    def __diag__(self, ctx):
       res = []
       for attr in self.attributes_:
@@ -285,3 +378,23 @@ class RegisterMap(object):
 
          res.append(info)
       return res
+
+@contextlib.contextmanager
+def registerTransaction(handles):
+   '''Run a RegisterMap transaction on every register map backing handles
+
+   Handles that are not backed by a register map (e.g sysfs gpios) keep
+   writing through immediately.
+   '''
+   regmaps = []
+   for handle in handles:
+      getter = getattr(handle, 'getRegisterMap', None)
+      regmap = getter() if getter is not None else None
+      if regmap is not None and regmap not in regmaps:
+         regmaps.append(regmap)
+
+   with contextlib.ExitStack() as stack:
+      # NOTE: maps are always locked in the same order to not deadlock
+      for regmap in sorted(regmaps, key=id):
+         stack.enter_context(regmap.transaction())
+      yield
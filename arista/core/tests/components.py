@@ -1,3 +1,5 @@
+import threading
+
 import pytest
 
 from ...core.pci import (
@@ -11,6 +13,11 @@ from ...core.pci import (
    RootPciPort,
    UpstreamPciPort,
 )
+from ...core.component import Component
+from ...core.component.executor import SetupExecutor
+from ...core.driver.kernel.i2c import I2cKernelDriver
+from ...core.quirk import Quirk
+from ...core.types import I2cAddr, PciAddr
 from ...tests.testing import patch
 
 from .helpers import (
@@ -64,3 +71,124 @@ def testCorrectParenting(platform):
 
       if parent is not None:
          assert isAncestorToComponent(c, parent)
+
+class FakeComponent(object):
+   def __init__(self, name, addr=None):
+      self.name = name
+      self.addr = addr
+
+def testSetupExecutorOrdering():
+   events = []
+   lock = threading.Lock()
+   components = [
+      FakeComponent('a1', I2cAddr(1, 0x10)),
+      FakeComponent('b1', I2cAddr(2, 0x10)),
+      FakeComponent('a2', I2cAddr(1, 0x20)),
+      FakeComponent('barrier'),
+      FakeComponent('c1', PciAddr(bus=3)),
+      FakeComponent('b2', I2cAddr(2, 0x20)),
+   ]
+
+   def func(component):
+      with lock:
+         events.append(component.name)
+
+   SetupExecutor(maxWorkers=4).run(components, func)
+   assert sorted(events) == sorted(c.name for c in components)
+   assert events.index('a1') < events.index('a2')
+   assert events.index('barrier') == 3
+   assert events.index('c1') > 3 and events.index('b2') > 3
+
+def testSetupExecutorConcurrent():
+   barrier = threading.Barrier(2, timeout=5)
+   components = [
+      FakeComponent('a', I2cAddr(1, 0x10)),
+      FakeComponent('b', I2cAddr(2, 0x10)),
+   ]
+   # both domains must run at the same time for the barrier to be released
+   SetupExecutor(maxWorkers=2).run(components, lambda c: barrier.wait())
+
+def testSetupExecutorBounded():
+   threads = set()
+   components = [FakeComponent(i, I2cAddr(i, 0x10)) for i in range(4)]
+   SetupExecutor(maxWorkers=1).run(
+      components, lambda c: threads.add(threading.current_thread()))
+   assert threads == {threading.current_thread()}
+
+def testSetupExecutorError():
+   components = [
+      FakeComponent('a', I2cAddr(1, 0x10)),
+      FakeComponent('b', I2cAddr(2, 0x10)),
+   ]
+
+   def func(component):
+      raise ValueError(component.name)
+
+   executor = SetupExecutor(maxWorkers=2)
+   with pytest.raises(ValueError, match='a'):
+      executor.run(components, func)
+   assert executor.available_ == 2
+
+def testSetupExecutorDomainError():
+   events = []
+   lock = threading.Lock()
+   components = [
+      FakeComponent('a1', I2cAddr(1, 0x10)),
+      FakeComponent('a2', I2cAddr(1, 0x20)),
+      FakeComponent('b1', I2cAddr(2, 0x10)),
+   ]
+
+   def func(component):
+      with lock:
+         events.append(component.name)
+      if component.name == 'a1':
+         raise ValueError(component.name)
+
+   for maxWorkers in [1, 2]:
+      del events[:]
+      with pytest.raises(ValueError, match='a1'):
+         SetupExecutor(maxWorkers=maxWorkers).run(components, func)
+      # the sibling sharing the domain of the failure is never set up
+      assert 'a2' not in events
+
+def testSetupExecutorPrepareWorkers():
+   components = [FakeComponent(i, I2cAddr(i, 0x10)) for i in range(3)]
+   prepared = []
+   executor = SetupExecutor(maxWorkers=2)
+   executor.run(components, lambda c: None,
+                prepare=lambda comps, workers: prepared.append(
+                   (len(comps), workers, executor.available_)))
+   # prepare uses the workers acquired for the segment
+   assert prepared == [(3, 2, 0)]
+   assert executor.available_ == 2
+
+class FakeI2cQuirk(Quirk):
+   when = Quirk.When.AFTER
+
+   def run(self, component):
+      pass
+
+class CustomSetupComponent(Component):
+   def setup(self):
+      pass
+
+def testPrepareSetupOrdering():
+   def i2cComponent(cls, bus, address, quirks=None):
+      addr = I2cAddr(bus, address)
+      return cls(addr=addr, quirks=quirks,
+                 drivers=[I2cKernelDriver(addr=addr, name='fake')])
+
+   first = i2cComponent(Component, 1, 0x10)
+   custom = i2cComponent(CustomSetupComponent, 1, 0x20)
+   later = i2cComponent(Component, 1, 0x30)
+   quirked = i2cComponent(Component, 2, 0x10, quirks=[FakeI2cQuirk()])
+   afterQuirk = i2cComponent(Component, 2, 0x20)
+   other = i2cComponent(Component, 3, 0x10)
+
+   with patch('arista.core.component.setupI2cKernelDrivers') as setupDrivers:
+      Component.prepareSetup([first, custom, later, quirked, afterQuirk, other],
+                             maxWorkers=2)
+   drivers = setupDrivers.call_args[0][0]
+   # devices after a sibling with other setup work are left to their setup
+   assert [d.addr for d in drivers] == [first.addr, quirked.addr, other.addr]
+   assert setupDrivers.call_args[1] == {'maxWorkers': 2}
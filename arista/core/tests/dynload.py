@@ -0,0 +1,76 @@
+import builtins
+import os
+import shutil
+import sys
+import tempfile
+
+from ...tests.testing import unittest, patch
+
+from ..dynload import SubmoduleCache, findSubmodules, importSubmodules
+
+PACKAGE = 'dynloadtestpkg'
+
+class DynloadTest(unittest.TestCase):
+   def setUp(self):
+      self.root = tempfile.mkdtemp()
+      self.cache = SubmoduleCache(path=os.path.join(self.root, 'cache.json'))
+      self._addModule('', '__init__')
+      self._addModule('', 'first')
+      self._addModule('sub', '__init__')
+      self._addModule('sub', 'second')
+      sys.path.insert(0, self.root)
+      builtins.dynloadTestImports = []
+
+   def tearDown(self):
+      del builtins.dynloadTestImports
+      sys.path.remove(self.root)
+      for name in list(sys.modules):
+         if name == PACKAGE or name.startswith(PACKAGE + '.'):
+            del sys.modules[name]
+      shutil.rmtree(self.root)
+
+   def _addModule(self, subdir, name):
+      path = os.path.join(self.root, PACKAGE, subdir)
+      if not os.path.isdir(path):
+         os.makedirs(path)
+      with open(os.path.join(path, '%s.py' % name), 'w',
+                encoding='utf-8') as f:
+         f.write('import builtins\n')
+         f.write('builtins.dynloadTestImports.append(__name__)\n')
+
+   def testImportOnce(self):
+      modules = importSubmodules(PACKAGE, cache=self.cache)
+      self.assertEqual(set(modules), {
+         PACKAGE + '.first',
+         PACKAGE + '.sub',
+         PACKAGE + '.sub.second',
+      })
+      imports = builtins.dynloadTestImports
+      self.assertEqual(len(imports), len(set(imports)))
+      self.assertEqual(len(imports), 4)
+
+   def testCached(self):
+      package = __import__(PACKAGE)
+      modules = findSubmodules(package, cache=self.cache)
+      cache = SubmoduleCache(path=self.cache.path)
+      with patch('pkgutil.iter_modules') as iterModules:
+         self.assertEqual(findSubmodules(package, cache=cache), modules)
+         iterModules.assert_not_called()
+
+   def testStale(self):
+      package = __import__(PACKAGE)
+      findSubmodules(package, cache=self.cache)
+      self._addModule('sub', 'third')
+      path = os.path.join(self.root, PACKAGE, 'sub')
+      stat = os.stat(path)
+      os.utime(path, (stat.st_atime, stat.st_mtime + 1))
+      cache = SubmoduleCache(path=self.cache.path)
+      self.assertIn(PACKAGE + '.sub.third', findSubmodules(package, cache=cache))
+
+   def testNotRecursive(self):
+      package = __import__(PACKAGE)
+      modules = findSubmodules(package, recursive=False, cache=self.cache)
+      self.assertEqual(modules, [PACKAGE + '.first', PACKAGE + '.sub'])
+
+if __name__ == '__main__':
+   unittest.main()
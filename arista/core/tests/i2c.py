@@ -0,0 +1,275 @@
+import errno
+import os
+import shutil
+import tempfile
+import threading
+
+from ctypes import POINTER, cast
+
+from ...tests.testing import mock, unittest, patch
+
+from ..driver.kernel.i2c import I2cKernelDriver, setupI2cKernelDrivers
+from ..i2c_utils import (
+   I2C_M_RD,
+   I2C_RDWR_IOCTL_MAX_MSGS,
+   I2cMsg,
+   I2cReadBatch,
+   i2c_msg,
+)
+from ..types import I2cAddr
+from ...libs.i2c import KernelI2cBusIndex
+from ...libs.wait import TimeoutError as WaitTimeoutError
+
+class KernelI2cBusIndexTest(unittest.TestCase):
+   def setUp(self):
+      self.root = tempfile.mkdtemp()
+      self.index = KernelI2cBusIndex(root=self.root)
+      self._addBus(0, 'SMBus I801 adapter')
+      self._addBus(2, 'SCD 0000:02:00.0 SMBus master 0 bus 0')
+      self._addBus(10, 'SCD 0000:02:00.0 SMBus master 0 bus 0')
+
+   def tearDown(self):
+      shutil.rmtree(self.root)
+
+   def _addBus(self, busId, name):
+      path = os.path.join(self.root, 'i2c-%d' % busId)
+      os.mkdir(path)
+      with open(os.path.join(path, 'name'), 'w', encoding='utf-8') as f:
+         f.write('%s\n' % name)
+
+   def _removeBus(self, busId):
+      shutil.rmtree(os.path.join(self.root, 'i2c-%d' % busId))
+
+   def testLookup(self):
+      name = 'SCD 0000:02:00.0 SMBus master 0 bus 0'
+      self.assertEqual(self.index.lookup('SMBus I801 adapter'), 0)
+      self.assertEqual(self.index.lookup(name), 2)
+      self.assertEqual(self.index.lookup(name, idx=1), 10)
+      self.assertIsNone(self.index.lookup('unknown'))
+
+   def testCached(self):
+      self.index.lookup('SMBus I801 adapter')
+      with patch.object(self.index, '_readName') as readName:
+         self.assertEqual(self.index.lookup('SMBus I801 adapter'), 0)
+         readName.assert_not_called()
+
+   def testNewAdapterOnMiss(self):
+      self.index.lookup('SMBus I801 adapter')
+      self._addBus(11, 'i2c-0-mux (chan_id 0)')
+      self.assertEqual(self.index.lookup('i2c-0-mux (chan_id 0)'), 11)
+
+   def testReusedBusIdOnMiss(self):
+      self.assertEqual(self.index.lookup('SMBus I801 adapter'), 0)
+      self._removeBus(2)
+      self._addBus(2, 'i2c-0-mux (chan_id 1)')
+      self.assertEqual(self.index.lookup('i2c-0-mux (chan_id 1)'), 2)
+      self.assertEqual(self.index.lookup('SCD 0000:02:00.0 SMBus master 0 bus 0'),
+                       10)
+
+   def testInvalidate(self):
+      self.assertEqual(self.index.lookup('SMBus I801 adapter'), 0)
+      self._removeBus(0)
+      self._addBus(1, 'SMBus I801 adapter')
+      self.assertEqual(self.index.lookup('SMBus I801 adapter'), 0)
+      self.index.invalidate()
+      self.assertEqual(self.index.lookup('SMBus I801 adapter'), 1)
+
+class FakeI2cDevice(object):
+   '''Answer every read with the command bytes followed by a counter'''
+
+   def __init__(self):
+      self.ioctls = []
+
+   def fileno(self):
+      return -1
+
+   def close(self):
+      pass
+
+   def ioctl(self, _fd, _req, data):
+      msgs = cast(data.msgs, POINTER(i2c_msg))
+      self.ioctls.append(data.nmsgs)
+      cmd = [0]
+      for i in range(data.nmsgs):
+         msg = msgs[i]
+         if msg.flags & I2C_M_RD:
+            for j in range(msg.len):
+               msg.buf[j] = (cmd[0] + j) & 0xff
+         else:
+            cmd = [msg.buf[j] for j in range(msg.len)]
+      return 0
+
+class I2cReadBatchTest(unittest.TestCase):
+   def setUp(self):
+      self.device = FakeI2cDevice()
+      self.msg = I2cMsg(I2cAddr(1, 0x40))
+      self.msg.device = self.device
+      self.msg.fifoEntries = I2cReadBatch.DEFAULT_FIFO_ENTRIES
+
+   def tearDown(self):
+      self.msg.device.close()
+
+   def _readBatch(self, reads):
+      with patch('arista.core.i2c_utils.ioctl', self.device.ioctl):
+         return self.msg.read_batch(0x40, reads)
+
+   def testSingleIoctl(self):
+      data = self._readBatch([([0x10], 2), ([0x20, 0x1], 3), ([0x30], 1)])
+      self.assertEqual(data, [[0x10, 0x11], [0x20, 0x21, 0x22], [0x30]])
+      self.assertEqual(self.device.ioctls, [6])
+
+   def testReuseBuffers(self):
+      self._readBatch([([0x10], 2), ([0x20], 2)])
+      batch = list(self.msg.batches.values())[0]
+      data = self._readBatch([([0x50], 2), ([0x60], 2)])
+      self.assertEqual(data, [[0x50, 0x51], [0x60, 0x61]])
+      self.assertEqual(list(self.msg.batches.values()), [batch])
+
+   def testChunked(self):
+      count = I2cReadBatch.MAX_READS + 3
+      data = self._readBatch([([i], 1) for i in range(count)])
+      self.assertEqual(data, [[i] for i in range(count)])
+      self.assertEqual(self.device.ioctls, [I2C_RDWR_IOCTL_MAX_MSGS, 6])
+
+   def testBoundedSize(self):
+      # NOTE: 70 fifo entries each, a single one fits in the smallest fifo
+      reads = [([0x10, 1, i], 65) for i in range(3)]
+      data = self._readBatch(reads)
+      self.assertEqual([d[0] for d in data], [0x10] * 3)
+      self.assertEqual(self.device.ioctls, [2, 2, 2])
+
+   def testLargerFifo(self):
+      self.msg.fifoEntries = 255
+      reads = [([0x10, 1, i], 65) for i in range(4)]
+      data = self._readBatch(reads)
+      self.assertEqual([d[0] for d in data], [0x10] * 4)
+      self.assertEqual(self.device.ioctls, [6, 2])
+
+   def testSplitTransfers(self):
+      self.assertEqual(I2cReadBatch.splitTransfers(((2, 33),) * 5),
+                       [(0, 3), (3, 2)])
+      self.assertEqual(I2cReadBatch.splitTransfers(((1, 130), (1, 1), (1, 1))),
+                       [(0, 1), (1, 2)])
+      self.assertEqual(I2cReadBatch.splitTransfers(((2, 33),) * 5, 1023),
+                       [(0, 5)])
+
+   def testFifoEntries(self):
+      msg = I2cMsg(I2cAddr(1, 0x40))
+      read = mock.mock_open(read_data='511\n')
+      with patch('arista.core.i2c_utils.open', read, create=True):
+         self.assertEqual(msg.getFifoEntries(), 511)
+      read.assert_called_once_with('/sys/bus/i2c/devices/i2c-1/smbus_fifo_size',
+                                   encoding='utf-8')
+      msg = I2cMsg(I2cAddr(1, 0x40))
+      with patch('arista.core.i2c_utils.open', side_effect=FileNotFoundError,
+                 create=True):
+         self.assertEqual(msg.getFifoEntries(),
+                          I2cReadBatch.DEFAULT_FIFO_ENTRIES)
+
+   def testEmpty(self):
+      self.assertEqual(self._readBatch([]), [])
+      self.assertEqual(self.device.ioctls, [])
+
+class I2cMsgBatchFallbackTest(unittest.TestCase):
+   def setUp(self):
+      self.msg = I2cMsg(I2cAddr(1, 0x40))
+
+   def _readBatch(self, reads, error):
+      with patch.object(I2cMsg, '_read_batch', side_effect=error) as readBatch, \
+           patch.object(I2cMsg, 'read_bytes',
+                        side_effect=lambda addr, cmd, n: [cmd[0]] * n):
+         data = self.msg.read_batch(0x40, reads)
+         return data, readBatch.call_count
+
+   def testUnsupported(self):
+      error = OSError(errno.EOPNOTSUPP, 'unsupported')
+      self.assertEqual(self._readBatch([([1], 1), ([2], 2)], error),
+                       ([[1], [2, 2]], 1))
+      self.assertFalse(self.msg.batchSupported)
+      self.assertEqual(self._readBatch([([3], 1)], error), ([[3]], 0))
+
+   def testError(self):
+      error = OSError(errno.EIO, 'io error')
+      with patch.object(I2cMsg, '_read_batch', side_effect=error), \
+           patch.object(I2cMsg, 'read_bytes') as readBytes:
+         with self.assertRaises(OSError):
+            self.msg.read_batch(0x40, [([1], 1), ([2], 1)])
+      readBytes.assert_not_called()
+      self.assertTrue(self.msg.batchSupported)
+
+class FakeI2cKernelDriver(I2cKernelDriver):
+   def __init__(self, root, events, fail=False, ready=True, barrier=None,
+                **kwargs):
+      super(FakeI2cKernelDriver, self).__init__(**kwargs)
+      self.root = root
+      self.events = events
+      self.fail = fail
+      self.ready = ready
+      self.barrier = barrier
+
+   def instantiate(self):
+      if self.barrier is not None:
+         self.barrier.wait()
+      self.events.append((self.addr.bus, self.addr.address))
+      if self.fail:
+         raise IOError('nack')
+      if self.ready:
+         with open(self.readyPath(), 'w', encoding='utf-8'):
+            pass
+
+   def readyPath(self):
+      return os.path.join(self.root, str(self.addr))
+
+   def getReadyPaths(self):
+      return [self.readyPath()]
+
+class OptOutI2cKernelDriver(FakeI2cKernelDriver):
+   CONCURRENT_SETUP = False
+
+@patch('arista.core.driver.kernel.i2c.inSimulation', lambda: False)
+class I2cKernelDriversSetupTest(unittest.TestCase):
+   def setUp(self):
+      self.root = tempfile.mkdtemp()
+      self.events = []
+
+   def tearDown(self):
+      shutil.rmtree(self.root)
+
+   def _driver(self, bus, address, cls=FakeI2cKernelDriver, **kwargs):
+      return cls(self.root, self.events, addr=I2cAddr(bus, address), **kwargs)
+
+   def testPerBus(self):
+      # both buses must be handled at the same time to pass the barrier
+      barrier = threading.Barrier(2, timeout=5)
+      drivers = [
+         self._driver(1, 0x10, barrier=barrier),
+         self._driver(2, 0x10, barrier=barrier),
+         self._driver(1, 0x20),
+         self._driver(3, 0x10, cls=OptOutI2cKernelDriver),
+      ]
+      setupI2cKernelDrivers(drivers, maxWorkers=2)
+      created = self.events
+      self.assertEqual(sorted(created), [(1, 0x10), (1, 0x20), (2, 0x10)])
+      self.assertLess(created.index((1, 0x10)), created.index((1, 0x20)))
+      for driver in drivers[:3]:
+         self.assertTrue(os.path.exists(driver.readyPath()))
+
+   def testFailure(self):
+      drivers = [
+         self._driver(1, 0x10, fail=True),
+         self._driver(2, 0x10),
+      ]
+      setupI2cKernelDrivers(drivers, maxWorkers=2)
+      self.assertEqual(len(self.events), 2)
+
+   def testNotReady(self):
+      drivers = [self._driver(1, 0x10, ready=False)]
+      with patch('arista.core.driver.kernel.i2c.waitForPaths',
+                 side_effect=WaitTimeoutError('timeout')) as waitForPaths:
+         with self.assertRaises(WaitTimeoutError):
+            setupI2cKernelDrivers(drivers)
+         waitForPaths.assert_called_once_with(
+            [drivers[0].readyPath()], description='i2c devices to be ready')
+
+if __name__ == '__main__':
+   unittest.main()
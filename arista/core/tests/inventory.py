@@ -1,9 +1,18 @@
 
 from __future__ import absolute_import, division, print_function
 
-from ...tests.testing import unittest
+import os
+import shutil
+import tempfile
 
-from ..inventory import Inventory
+from collections.abc import Mapping
+
+from ...descs.gpio import GpioDesc
+from ...drivers.scd.driver import ScdXcvrPresenceReader
+from ...tests.testing import unittest, patch
+
+from ..driver.kernel.sysfs import GpioSysfsImpl
+from ..inventory import Inventory, XcvrPresenceReader, diffPresenceBitmaps
 from ..metainventory import MetaInventory, LazyInventory
 
 from .mockinv import (
@@ -126,7 +135,7 @@ class InventoryTest(unittest.TestCase):
          v1 = getattr(inv1, attr)()
          v2 = getattr(inv2, attr)()
          self.assertEqual(type(v1), type(v2))
-         if isinstance(v1, (list, dict, set)):
+         if isinstance(v1, (list, Mapping, set)):
             for item in v1:
                self.assertIn(item, v2)
          else:
@@ -136,11 +145,25 @@ class InventoryTest(unittest.TestCase):
       inv = self._getTestInventory()
       inv.getXcvrs()
 
+   def testMergedXcvrViews(self):
+      inv = self._getTestInventory()
+      slots = inv.getXcvrSlots()
+      with self.assertRaises(TypeError):
+         slots[1000] = None # pylint: disable=unsupported-assignment-operation
+      self.assertNotIn(1000, slots)
+      inv.addQsfpSlot(MockQsfpSlot(1000, 'qsfp1000'))
+      # views follow the slots added afterwards
+      self.assertIn(1000, slots)
+      self.assertIs(inv.getXcvrSlot(1000), slots[1000])
+      self.assertEqual(len(inv.getXcvrs()), len(inv.getEthernets()) +
+                       len(inv.getSfps()) + len(inv.getQsfps()) +
+                       len(inv.getOsfps()))
+
    def testSimpleMetaInventory(self):
       meta = self._getTestMetaInventory()
       with self.assertRaises(AttributeError):
          meta.nonExistant()
-      self.assertDictEqual(meta.getXcvrs(), meta.invs[0].getXcvrs())
+      self.assertDictEqual(dict(meta.getXcvrs()), dict(meta.invs[0].getXcvrs()))
 
    def testGeneratorMetaInventory(self):
       inv1 = self._getTestInventory()
@@ -154,6 +177,52 @@ class InventoryTest(unittest.TestCase):
       meta = MetaInventory(invs=iter(generator()))
       self.assertListEqual(meta.getPsus(), invs.getPsus())
 
+   def testMemoizedMetaInventory(self):
+      inv1 = self._getTestInventory()
+      inv2 = self._getSmallInventory()
+      meta = MetaInventory(invs=[inv1, inv2])
+      with patch.object(Inventory, 'getPsus', autospec=True,
+                        side_effect=Inventory.getPsus) as getPsus:
+         psus = meta.getPsus()
+         self.assertEqual(meta.getPsus(), psus)
+         self.assertEqual(getPsus.call_count, 2)
+      # callers get their own copy of the aggregated view
+      psus.append(MockPsu(1001))
+      self.assertEqual(len(meta.getPsus()), len(psus) - 1)
+      inv2.addPsu(MockPsu(1000))
+      # adding an item to an inventory refreshes the aggregated view
+      self.assertEqual(len(meta.getPsus()), len(psus))
+
+   def testMetaInventoryPresenceNotMemoized(self):
+      inv = Inventory()
+      inv.addQsfpSlot(MockQsfpSlot(1, 'qsfp1'))
+      meta = MetaInventory(invs=[inv])
+      bitmaps = iter([{1: True}, {1: False}])
+      with patch.object(Inventory, 'getXcvrPresenceBitmap', autospec=True,
+                        side_effect=lambda _: next(bitmaps)):
+         self.assertEqual(meta.getXcvrPresenceBitmap(), {1: True})
+         self.assertEqual(meta.getXcvrPresenceBitmap(), {1: False})
+
+   def testInvalidateMetaInventory(self):
+      inv1 = self._getTestInventory()
+      inv2 = self._getSmallInventory()
+      invs = [inv1]
+      meta = MetaInventory(invs=lambda: iter(invs))
+      self.assertListEqual(meta.getPsus(), inv1.getPsus())
+      invs.append(inv2)
+      self.assertListEqual(meta.getPsus(), inv1.getPsus())
+      meta.invalidate()
+      self.assertListEqual(meta.getPsus(), self._getFullInventory().getPsus())
+
+   def testMetaInventoryXcvrSlot(self):
+      inv1 = Inventory()
+      inv2 = Inventory()
+      slot = MockQsfpSlot(1000, 'qsfp1000')
+      inv2.addQsfpSlot(slot)
+      meta = MetaInventory(invs=[inv1, inv2])
+      self.assertIs(meta.getXcvrSlot(1000), slot)
+      self.assertIsNone(meta.getXcvrSlot(1001))
+
    def testLazyInventory(self):
       lazy = LazyInventory()
       self.assertEqual(len(lazy.__dict__), 0)
@@ -195,5 +264,92 @@ class InventoryTest(unittest.TestCase):
          invval = getattr(inv, attr)()
          self.assertEqual(metaval, invval)
 
+class FakeBulkReader(object):
+   def __init__(self, values):
+      self.values = values
+      self.reads = 0
+
+   def read(self):
+      self.reads += 1
+      return self.values
+
+class FakeGpioDriver(object):
+   def __init__(self, path='/sys/fake'):
+      self.path = path
+
+   def getSysfsPath(self):
+      return self.path
+
+class GpioQsfpSlot(MockQsfpSlot):
+   def __init__(self, slotId, gpio=None, **kwargs):
+      super(GpioQsfpSlot, self).__init__(slotId, 'qsfp%d' % slotId, **kwargs)
+      self.gpio = gpio
+
+   def getPresenceGpio(self):
+      return self.gpio
+
+class XcvrPresenceTest(unittest.TestCase):
+   def _gpio(self, slotId, reader=None):
+      desc = GpioDesc('qsfp%d_present' % slotId, addr=0x10, bit=2, ro=True,
+                      activeLow=True)
+      return GpioSysfsImpl(FakeGpioDriver(), desc, hwActiveLow=True,
+                           bulkReader=reader)
+
+   def testBitmap(self):
+      reader = FakeBulkReader({'qsfp1_present': 0, 'qsfp2_present': 1})
+      other = FakeBulkReader({'qsfp3_present': 1})
+      inv = Inventory()
+      inv.addQsfpSlot(GpioQsfpSlot(1, self._gpio(1, reader)))
+      inv.addQsfpSlot(GpioQsfpSlot(2, self._gpio(2, reader)))
+      inv.addQsfpSlot(GpioQsfpSlot(3, self._gpio(3, other)))
+      inv.addQsfpSlot(GpioQsfpSlot(4, presence=True))
+      inv.addQsfpSlot(GpioQsfpSlot(5, self._gpio(5), presence=False))
+      with patch('arista.core.inventory.inSimulation', return_value=False):
+         bitmap = inv.getXcvrPresenceBitmap()
+      self.assertEqual(bitmap, (1 << 2) | (1 << 3) | (1 << 4))
+      self.assertEqual((reader.reads, other.reads), (1, 1))
+
+   def testReaderInvalidated(self):
+      inv = Inventory()
+      inv.addQsfpSlot(GpioQsfpSlot(1, presence=True))
+      reader = inv.getXcvrPresenceReader()
+      self.assertIs(inv.getXcvrPresenceReader(), reader)
+      inv.addQsfpSlot(GpioQsfpSlot(2, presence=True))
+      self.assertEqual(inv.getXcvrPresenceReader().mask, 0b110)
+
+   def testReaderFailure(self):
+      class FailingReader(FakeBulkReader):
+         def read(self):
+            raise IOError('no such attribute')
+      gpio = self._gpio(1, FailingReader({}))
+      reader = XcvrPresenceReader([GpioQsfpSlot(1, gpio, presence=True)])
+      with patch('arista.core.inventory.inSimulation', return_value=False):
+         self.assertEqual(reader.read(), 1 << 1)
+
+   def testMissingValue(self):
+      gpio = self._gpio(1, FakeBulkReader({}))
+      reader = XcvrPresenceReader([GpioQsfpSlot(1, gpio, presence=True)])
+      with patch('arista.core.inventory.inSimulation', return_value=False):
+         self.assertEqual(reader.read(), 1 << 1)
+
+   def testScdReader(self):
+      root = tempfile.mkdtemp()
+      try:
+         with open(os.path.join(root, 'xcvr_present'), 'w',
+                   encoding='utf-8') as f:
+            f.write('qsfp1 1\nqsfp2 0\nsfp33 1\n')
+         values = ScdXcvrPresenceReader(FakeGpioDriver(root)).read()
+      finally:
+         shutil.rmtree(root)
+      self.assertEqual(values, {
+         'qsfp1_present': 1,
+         'qsfp2_present': 0,
+         'sfp33_present': 1,
+      })
+
+   def testDiff(self):
+      self.assertEqual(diffPresenceBitmaps(0b0110, 0b1100), ([3], [1]))
+      self.assertEqual(diffPresenceBitmaps(0b11, 0b11), ([], []))
+
 if __name__ == '__main__':
    unittest.main()
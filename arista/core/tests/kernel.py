@@ -0,0 +1,93 @@
+import os
+import shutil
+import tempfile
+
+from ...tests.testing import unittest, patch
+
+from ..driver import LoadedModules, modprobe, modprobeAll, rmmod
+from ..driver.kernel import KernelDriver, loadKernelModules
+
+class PassiveKernelDriver(KernelDriver):
+   PASSIVE = True
+
+@patch('arista.core.driver.inDebug', lambda: False)
+@patch('arista.core.driver.inSimulation', lambda: False)
+class KernelModulesTest(unittest.TestCase):
+   def setUp(self):
+      self.root = tempfile.mkdtemp()
+      self.path = os.path.join(self.root, 'modules')
+      self._writeModules(['i2c_dev', 'scd'])
+      self.modules = LoadedModules(path=self.path)
+      patcher = patch('arista.core.driver.loadedModules', self.modules)
+      patcher.start()
+      self.addCleanup(patcher.stop)
+
+   def tearDown(self):
+      shutil.rmtree(self.root)
+
+   def _writeModules(self, modules):
+      with open(self.path, 'w', encoding='utf-8') as f:
+         for module in modules:
+            f.write('%s 16384 0 - Live 0x0000000000000000\n' % module)
+
+   def testCached(self):
+      self.assertTrue(self.modules.contains('i2c-dev'))
+      self._writeModules(['i2c_dev', 'scd', 'optoe'])
+      self.assertFalse(self.modules.contains('optoe'))
+      self.modules.invalidate()
+      self.assertTrue(self.modules.contains('optoe'))
+
+   def testUnloadedElsewhere(self):
+      self.assertTrue(self.modules.contains('scd'))
+      self._writeModules(['i2c_dev'])
+      self.assertTrue(self.modules.contains('scd'))
+      self.assertFalse(self.modules.contains('scd', refresh=True))
+
+   def testCleanRefresh(self):
+      driver = KernelDriver(module='scd')
+      self.assertTrue(driver.loaded())
+      self._writeModules(['i2c_dev'])
+      with patch('arista.core.driver.kernel.rmmod') as rmmodMock:
+         driver.clean()
+      rmmodMock.assert_not_called()
+
+   @patch('subprocess.check_call')
+   def testRefreshAfterLoad(self, checkCall):
+      self.assertFalse(self.modules.contains('optoe'))
+      self._writeModules(['i2c_dev', 'scd', 'optoe'])
+      modprobe('optoe')
+      checkCall.assert_called_once_with(['modprobe', 'optoe'])
+      self.assertTrue(self.modules.contains('optoe'))
+      self._writeModules(['i2c_dev', 'scd'])
+      rmmod('optoe')
+      self.assertFalse(self.modules.contains('optoe'))
+
+   @patch('subprocess.check_call')
+   def testModprobeAll(self, checkCall):
+      modprobeAll(['optoe', 'scd-hwmon'])
+      checkCall.assert_called_once_with(['modprobe', '-a', 'optoe', 'scd_hwmon'])
+      checkCall.reset_mock()
+      modprobeAll([])
+      checkCall.assert_not_called()
+
+   @patch('arista.core.driver.kernel.modprobeAll')
+   def testLoadKernelModules(self, modprobeAllMock):
+      loadKernelModules([
+         KernelDriver(module='optoe'),
+         KernelDriver(module='optoe'),
+         KernelDriver(module='scd'),
+         KernelDriver(module='pmbus', margs=['foo=1']),
+         PassiveKernelDriver(module='coretemp'),
+         KernelDriver(module='at24'),
+      ])
+      modprobeAllMock.assert_called_once_with(['optoe', 'at24'])
+
+   @patch('arista.core.driver.kernel.modprobeAll')
+   def testLoadKernelModulesRefresh(self, modprobeAllMock):
+      self.assertTrue(self.modules.contains('scd'))
+      self._writeModules(['i2c_dev'])
+      loadKernelModules([KernelDriver(module='scd')])
+      modprobeAllMock.assert_called_once_with(['scd'])
+
+if __name__ == '__main__':
+   unittest.main()
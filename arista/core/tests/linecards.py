@@ -1,7 +1,7 @@
 
 from __future__ import absolute_import, division, print_function
 
-from ...tests.testing import unittest
+from ...tests.testing import unittest, patch
 from ...tests.logging import getLogger
 
 from ...components.denali.card import DenaliLinecardSlot
@@ -55,6 +55,28 @@ class LinecardTest(unittest.TestCase):
          linecard.clean()
          assert linecard
 
+class FakeCard(object):
+   def __init__(self):
+      self.refreshed = False
+
+   def refresh(self):
+      self.refreshed = True
+
+   def detach(self):
+      pass
+
+class CardSlotTest(unittest.TestCase):
+   @patch('arista.core.card.invalidateKernelI2cBuses')
+   def testI2cBusesInvalidated(self, invalidate):
+      slot = CardSlot(None, 0)
+      card = FakeCard()
+      slot.loadCard(card)
+      self.assertTrue(card.refreshed)
+      invalidate.assert_called_once_with()
+      invalidate.reset_mock()
+      slot.unloadCard()
+      invalidate.assert_called_once_with()
+
 class LinecardCpuTest(unittest.TestCase):
    @classmethod
    def setUpClass(cls):
@@ -3,6 +3,12 @@
 
 from __future__ import absolute_import, division, print_function
 
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
 from ...tests.testing import unittest
 
 from .. import platform
@@ -45,5 +51,75 @@ class RegisterTest(unittest.TestCase):
             continue
          cls()
 
+LOOKUP_SCRIPT = '''
+import json, os, runpy, sys
+from arista.core import platform
+if os.path.exists(sys.argv[1]):
+   platform.manager.manifest_ = runpy.run_path(sys.argv[1])['PLATFORM_MANIFEST']
+else:
+   platform.manager.manifest_ = {}
+cls = platform.getPlatformCls(sys.argv[2])
+print(json.dumps({
+   'cls': cls.__name__,
+   'loaded': platform.manager.loaded,
+   'platforms': len(platform.manager.platforms),
+}))
+'''
+
+class ManifestTest(unittest.TestCase):
+   @classmethod
+   def setUpClass(cls):
+      cls.tmpdir = tempfile.mkdtemp()
+      cls.manifest = platform.writePlatformManifest(
+         os.path.join(cls.tmpdir, 'manifest.py'))
+
+   @classmethod
+   def tearDownClass(cls):
+      os.remove(cls.manifest)
+      os.rmdir(cls.tmpdir)
+
+   def _lookup(self, manifest, name):
+      root = os.path.dirname(os.path.dirname(os.path.dirname(
+         os.path.dirname(os.path.abspath(__file__)))))
+      output = subprocess.check_output(
+         [sys.executable, '-c', LOOKUP_SCRIPT, manifest, name], cwd=root)
+      return json.loads(output.decode().splitlines()[-1])
+
+   def _writeManifest(self, content):
+      path = os.path.join(self.tmpdir, 'custom.py')
+      with open(path, 'w', encoding='utf-8') as f:
+         f.write('PLATFORM_MANIFEST = %r\n' % content)
+      self.addCleanup(os.remove, path)
+      return path
+
+   def testManifestContent(self):
+      manifest = platform.manager.generateManifest()
+      for kind, index in [('sku', platform.getPlatformSkus()),
+                          ('sid', platform.getPlatformSids())]:
+         self.assertEqual(set(manifest[kind]), set(index))
+         for name, module in manifest[kind].items():
+            self.assertEqual('%s.%s' % (platform.PLATFORMS_PACKAGE, module),
+                             index[name].__module__)
+
+   def testLazyLookup(self):
+      name, cls = sorted(platform.getPlatformSkus().items())[0]
+      result = self._lookup(self.manifest, name)
+      self.assertEqual(result['cls'], cls.__name__)
+      self.assertFalse(result['loaded'])
+      self.assertLess(result['platforms'], len(platform.getPlatforms()))
+
+   def testMissingManifest(self):
+      name, cls = sorted(platform.getPlatformSkus().items())[0]
+      result = self._lookup(os.path.join(self.tmpdir, 'missing.py'), name)
+      self.assertEqual(result['cls'], cls.__name__)
+      self.assertTrue(result['loaded'])
+
+   def testStaleManifest(self):
+      name, cls = sorted(platform.getPlatformSkus().items())[0]
+      manifest = self._writeManifest({'sku': {name: 'nonexistent'}})
+      result = self._lookup(manifest, name)
+      self.assertEqual(result['cls'], cls.__name__)
+      self.assertTrue(result['loaded'])
+
 if __name__ == '__main__':
    unittest.main()
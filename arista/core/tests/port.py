@@ -1,5 +1,5 @@
 from ...core.utils import incrange
-from ...descs.xcvr import Osfp, Qsfp, Rj45, Sfp, Xcvr
+from ...descs.xcvr import Osfp, Qsfp, QsfpDD, Rj45, Sfp, Xcvr
 from ...tests.testing import unittest
 from ..port import PortLayout
 
@@ -51,3 +51,21 @@ class PortLayoutTest(unittest.TestCase):
             self.nEthernets + self.nSfps + self.nQsfps + self.nOsfps)),
       )
       self._checkPortLayout(portLayout)
+
+   def testLookups(self):
+      portLayout = PortLayout(
+         (Rj45(i) for i in incrange(1, 2)),
+         (Sfp(i) for i in incrange(3, 4)),
+         (Qsfp(i) for i in incrange(5, 6)),
+         (QsfpDD(i) for i in incrange(7, 8)),
+      )
+      self.assertEqual(portLayout.getPort(5).index, 5)
+      self.assertIsNone(portLayout.getPort(42))
+      self.assertIs(portLayout.getPortByName('rj45_2'), portLayout.getPort(2))
+      self.assertIs(portLayout.getPortByName('osfp7'), portLayout.getPort(7))
+      self.assertIsNone(portLayout.getPortByName('qsfp7'))
+      self.assertEqual([p.index for p in portLayout.getOsfps()], [7, 8])
+      self.assertEqual([p.index for p in portLayout.getPorts(Sfp, QsfpDD)],
+                       [3, 4, 7, 8])
+      self.assertIs(portLayout.getPorts(Sfp, QsfpDD),
+                    portLayout.getPorts(Sfp, QsfpDD))
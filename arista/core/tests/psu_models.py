@@ -1,6 +1,6 @@
 
 from ..log import getLogger
-from ..psu import PsuIdent, getPsuManager
+from ..psu import PsuIdent, PsuManager, getPsuManager
 
 from ...descs.psu import PsuDesc
 
@@ -45,5 +45,19 @@ class PsuModelTest(unittest.TestCase):
       for model in models:
          self._testPsuModel(model)
 
+   def testLazyPsuModel(self):
+      model = [m for m in getPsuManager().psuModels if m.IDENTIFIERS][0]
+      manager = PsuManager()
+      psu = manager.psuForIdentifier(model.__name__, model.IDENTIFIERS[0],
+                                     module=model.__module__)
+      self.assertIsInstance(psu, model)
+      self.assertIsNone(manager.modules)
+
+   def testUnknownPsuModel(self):
+      manager = PsuManager()
+      self.assertIsNone(manager.psuForIdentifier('UnknownPsu', None,
+                                                 module='arista.unknown'))
+      self.assertIsNotNone(manager.modules)
+
 if __name__ == '__main__':
    unittest.main()
@@ -1,5 +1,7 @@
 from __future__ import absolute_import, division, print_function
 
+import threading
+
 from ...tests.testing import unittest
 
 from ..diag import DiagContext
@@ -11,6 +13,7 @@ from ..register import (
    RegBitField,
    RegBitRange,
    SetClearRegister,
+   registerTransaction,
 )
 
 class FakeRegisterMap(RegisterMap):
@@ -250,6 +253,117 @@ class CoreRegisterTest(unittest.TestCase):
       with self.assertRaises(ValueError):
          self.regs.regArray([1, 2])
 
+class TransactionRegisterTest(unittest.TestCase):
+   def setUp(self):
+      self.driver = FakeDriver()
+      self.regs = FakeRegisterMap(self.driver)
+      self.writes = []
+      write = self.driver.write
+      def countingWrite(reg, value):
+         self.writes.append((reg, value))
+         return write(reg, value)
+      self.driver.write = countingWrite
+
+   def testCoalescedWrites(self):
+      with self.regs.transaction():
+         self.regs.writeOk(1)
+         self.regs.bit3(1)
+         self.regs.range03(0b0110)
+         self.assertEqual(self.writes, [])
+         self.assertEqual(self.regs.writeOk(), 1)
+         self.assertEqual(self.regs.range03(), 0b0110)
+      self.assertEqual(self.writes, [(0x02, 0b1), (0x05, 0b1000), (0x09, 0b0110)])
+      self.assertEqual(self.regs.scratchpad(), 0b1000)
+
+   def testLastWriteWins(self):
+      with self.regs.transaction():
+         self.regs.bit3(1)
+         with self.regs.transaction():
+            self.regs.bit3(0)
+            self.regs.bit3(1)
+         self.assertEqual(self.writes, [])
+      self.assertEqual(self.writes, [(0x05, 0b1000)])
+
+   def testFlushOnError(self):
+      with self.assertRaises(ValueError):
+         with self.regs.transaction():
+            self.regs.writeOk(1)
+            raise ValueError()
+      self.assertEqual(self.writes, [(0x02, 0b1)])
+      self.assertIsNone(self.regs.pendingWrites_)
+
+   def testSetClearNotDeferred(self):
+      with self.regs.transaction():
+         self.regs.interrupt0(1)
+         self.assertEqual(self.writes, [(0x07, 0b1)])
+
+   def testFullRegisterWrite(self):
+      with self.regs.transaction():
+         self.regs.bit3(1)
+         self.regs.scratchpad(0b0011)
+         self.assertEqual(self.regs.scratchpad(), 0b0011)
+         self.regs.bit3(1)
+         self.assertEqual(self.writes, [])
+      self.assertEqual(self.writes, [(0x05, 0b1011)])
+
+   def testOtherThreadNotStaged(self):
+      entered = threading.Event()
+      release = threading.Event()
+
+      def worker():
+         with self.regs.transaction():
+            self.regs.bit3(1)
+            entered.set()
+            release.wait(5)
+
+      thread = threading.Thread(target=worker)
+      thread.start()
+      entered.wait(5)
+      self.assertIsNone(self.regs.pendingWrites_)
+      # the map stays locked until the transaction is flushed
+      other = threading.Thread(target=self.regs.writeOk, args=(1,))
+      other.start()
+      other.join(0.1)
+      self.assertTrue(other.is_alive())
+      self.assertEqual(self.writes, [])
+      release.set()
+      thread.join()
+      other.join()
+      self.assertEqual(self.writes, [(0x05, 0b1000), (0x02, 0b1)])
+
+   def testConcurrentBitWrites(self):
+      inRead = threading.Event()
+      release = threading.Event()
+      read = self.driver.read
+      def slowRead(reg):
+         value = read(reg)
+         if not inRead.is_set():
+            inRead.set()
+            release.wait(5)
+         return value
+      self.driver.read = slowRead
+
+      thread = threading.Thread(target=self.regs.range03, args=(0b0110,))
+      thread.start()
+      inRead.wait(5)
+      other = threading.Thread(target=self.regs.range56, args=(0b00,))
+      other.start()
+      other.join(0.1)
+      # the second update waits for the first one instead of overwriting it
+      self.assertTrue(other.is_alive())
+      release.set()
+      thread.join()
+      other.join()
+      self.assertEqual(self.driver.regmap[0x09], 0b1100110)
+
+   def testGpioTransaction(self):
+      gpios = [self.regs.getGpio('writeOk'), self.regs.getGpio('bit3')]
+      with registerTransaction(gpios):
+         for gpio in gpios:
+            gpio.setActive(True)
+         self.assertEqual(self.writes, [])
+      self.assertEqual(self.writes, [(0x02, 0b1), (0x05, 0b1000)])
+
 class OverrideRegisterTest(unittest.TestCase):
    def testShadowRegister(self):
       driver = FakeDriver()
@@ -265,5 +379,20 @@ class OverrideRegisterTest(unittest.TestCase):
       self.assertEqual(regs.bit0(), 1)
       self.assertEqual(regs.bit1(), 0)
 
+   def testCompiledLayout(self):
+      layout = FakeOverrideRegisterMap.layout_
+      self.assertEqual(len(layout), len(FakeRegisterMap.layout_))
+      self.assertIn(FakeOverrideRegisterMap.REVISION, layout)
+      self.assertNotIn(FakeRegisterMap.REVISION, layout)
+      self.assertEqual(layout[-1], FakeOverrideRegisterMap.CONTROL)
+
+   def testTemplatesUnbound(self):
+      regs = FakeOverrideRegisterMap(FakeDriver(), offset=0x100)
+      self.assertEqual(regs.revision.__self__.addr, 0x151)
+      for reg in FakeOverrideRegisterMap.layout_:
+         self.assertIsNone(reg.parent)
+         self.assertIsNone(reg.regmap)
+      self.assertEqual(FakeOverrideRegisterMap.REVISION.addr, 0x51)
+
 if __name__ == '__main__':
    unittest.main()
@@ -0,0 +1,248 @@
+import os
+import shutil
+import tempfile
+import threading
+
+from ...tests.testing import unittest, patch
+
+from ...descs.rail import CurrentDesc, RailDesc, RailDirection
+
+from ..driver.kernel.sysfs import (
+   CurrentSysfsImpl,
+   RailSysfsImpl,
+   SysfsEntry,
+   SysfsEntryFloat,
+)
+from ..driver.kernel.sysfscache import (
+   SysfsFdPool,
+   sysfsFdPool,
+   hwmonLabelIndexes,
+   hwmonSnapshot,
+   hwmonSnapshots,
+   readHwmonSnapshot,
+)
+
+class MockHwmonDriver(object):
+   def __init__(self, path):
+      self.path = path
+
+   def getHwmonPath(self):
+      return self.path
+
+   def getHwmonEntry(self, name):
+      return os.path.join(self.path, name)
+
+class MockHwmonParent(object):
+   def __init__(self, driver):
+      self.driver = driver
+
+class SysfsFdPoolTest(unittest.TestCase):
+   def setUp(self):
+      self.tmpdir = tempfile.mkdtemp()
+      self.pool = SysfsFdPool(maxSize=4)
+
+   def tearDown(self):
+      self.pool.invalidate()
+      shutil.rmtree(self.tmpdir)
+
+   def _writeAttr(self, name, value):
+      path = os.path.join(self.tmpdir, name)
+      with open(path, 'w', encoding='utf-8') as f:
+         f.write(value)
+      return path
+
+   def testReadKeepsFdOpen(self):
+      path = self._writeAttr('temp1_input', '42000\n')
+      self.assertEqual(self.pool.read(path), '42000\n')
+      self.assertEqual(len(self.pool), 1)
+      self._writeAttr('temp1_input', '43000\n')
+      self.assertEqual(self.pool.read(path), '43000\n')
+      self.assertEqual(len(self.pool), 1)
+
+   def testReadMissing(self):
+      with self.assertRaises(IOError):
+         self.pool.read(os.path.join(self.tmpdir, 'missing'))
+      self.assertEqual(len(self.pool), 0)
+
+   def testEviction(self):
+      paths = [self._writeAttr('in%d_input' % i, str(i)) for i in range(8)]
+      for i, path in enumerate(paths):
+         self.assertEqual(self.pool.read(path), str(i))
+      self.assertEqual(len(self.pool), 4)
+      self.assertEqual(list(self.pool.fds), paths[4:])
+
+   def testInvalidatePrefix(self):
+      subdir = os.path.join(self.tmpdir, 'hwmon0')
+      os.mkdir(subdir)
+      inner = self._writeAttr('hwmon0/temp1_input', '1')
+      outer = self._writeAttr('temp2_input', '2')
+      self.pool.read(inner)
+      self.pool.read(outer)
+      self.pool.invalidate(subdir)
+      self.assertEqual(list(self.pool.fds), [outer])
+      self.pool.invalidate()
+      self.assertEqual(len(self.pool), 0)
+
+   def testReadNotSerialized(self):
+      slow = self._writeAttr('in1_input', '1')
+      fast = self._writeAttr('in2_input', '2')
+      self.pool.read(slow)
+      started = threading.Event()
+      release = threading.Event()
+      pread = os.pread
+
+      def blockingPread(fd, size, offset):
+         if fd == self.pool.fds[slow].fd:
+            started.set()
+            release.wait(5)
+         return pread(fd, size, offset)
+
+      with patch('os.pread', blockingPread):
+         thread = threading.Thread(target=self.pool.read, args=(slow,))
+         thread.start()
+         started.wait(5)
+         self.assertEqual(self.pool.read(fast), '2')
+         release.set()
+         thread.join()
+
+   def testInvalidateWhileReading(self):
+      path = self._writeAttr('in1_input', '1')
+      self.pool.read(path)
+      entry = self.pool.fds[path]
+      pread = os.pread
+
+      def invalidatingPread(fd, size, offset):
+         self.pool.invalidate()
+         return pread(fd, size, offset)
+
+      with patch('os.pread', invalidatingPread), \
+           patch('os.close', wraps=os.close) as close:
+         self.assertEqual(self.pool.read(path), '1')
+         close.assert_called_once_with(entry.fd)
+      self.assertEqual(len(self.pool), 0)
+
+@patch('arista.core.utils.inSimulation', lambda: False)
+class HwmonSnapshotTest(unittest.TestCase):
+   ATTRS = {
+      'name': 'pmbus',
+      'temp1_input': '42500',
+      'temp1_label': 'Inlet',
+      'in1_crit': '12600',
+      'uevent': 'OF_NAME=pmbus',
+   }
+
+   def setUp(self):
+      self.tmpdir = tempfile.mkdtemp()
+      self.hwmon = os.path.join(self.tmpdir, 'hwmon3')
+      os.mkdir(self.hwmon)
+      for name, value in self.ATTRS.items():
+         self._writeAttr(name, value)
+      self.parent = MockHwmonParent(MockHwmonDriver(self.hwmon))
+
+   def tearDown(self):
+      sysfsFdPool.invalidate(self.tmpdir)
+      shutil.rmtree(self.tmpdir)
+
+   def _writeAttr(self, name, value):
+      with open(os.path.join(self.hwmon, name), 'w', encoding='utf-8') as f:
+         f.write('%s\n' % value)
+
+   def testTypedMapping(self):
+      snapshot = readHwmonSnapshot(self.hwmon)
+      self.assertEqual(sorted(snapshot), ['in1_crit', 'temp1_input', 'temp1_label'])
+      self.assertEqual(snapshot['temp1_input'], 42500)
+      self.assertEqual(snapshot['temp1_label'], 'Inlet')
+      self.assertIsNone(snapshot.get('temp2_input'))
+
+   def testMissingFolder(self):
+      snapshot = readHwmonSnapshot(os.path.join(self.tmpdir, 'hwmon9'))
+      self.assertEqual(len(snapshot), 0)
+
+   def testEntriesServedFromSnapshot(self):
+      temp = SysfsEntryFloat(self.parent, 'temp1_input')
+      label = SysfsEntry(self.parent, 'temp1_label')
+      missing = SysfsEntry(self.parent, 'temp2_input')
+      with hwmonSnapshot():
+         self.assertEqual(temp.read(), 42.5)
+         self._writeAttr('temp1_input', '50000')
+         self.assertEqual(temp.read(), 42.5)
+         self.assertEqual(label.read(), 'Inlet')
+         self.assertTrue(temp.exists())
+         self.assertFalse(missing.exists())
+         self.assertEqual(list(hwmonSnapshots.snapshots), [self.hwmon])
+      self.assertFalse(hwmonSnapshots.active())
+      self.assertEqual(hwmonSnapshots.snapshots, {})
+      self.assertEqual(temp.read(), 50.)
+
+class HwmonLabelIndexTest(unittest.TestCase):
+   LABELS = {
+      'in1_label': 'vin',
+      'in2_label': 'vout1',
+      'in3_label': 'vout2',
+      'curr1_label': 'iin',
+      'curr2_label': 'iout1',
+      'power1_label': 'pin',
+   }
+
+   def setUp(self):
+      self.tmpdir = tempfile.mkdtemp()
+      self.hwmon = os.path.join(self.tmpdir, 'hwmon1')
+      os.mkdir(self.hwmon)
+      for name, value in self.LABELS.items():
+         with open(os.path.join(self.hwmon, name), 'w', encoding='utf-8') as f:
+            f.write('%s\n' % value)
+      self.driver = MockHwmonDriver(self.hwmon)
+
+   def tearDown(self):
+      hwmonLabelIndexes.invalidate(self.tmpdir)
+      shutil.rmtree(self.tmpdir)
+
+   def testIndex(self):
+      index = hwmonLabelIndexes.get(self.hwmon)
+      self.assertEqual(index.getPrefix('in', 'vout2'), 'in3_')
+      self.assertEqual(index.getPrefix('curr', 'iin'), 'curr1_')
+      self.assertIsNone(index.getPrefix('curr', 'vin'))
+      self.assertIs(hwmonLabelIndexes.get(self.hwmon), index)
+
+   def testSharedByRails(self):
+      rails = [
+         RailSysfsImpl(self.driver, RailDesc(0, direction=RailDirection.INPUT)),
+         RailSysfsImpl(self.driver, RailDesc(1, direction=RailDirection.OUTPUT)),
+      ]
+      with patch('os.listdir', wraps=os.listdir) as listdir:
+         self.assertEqual(rails[0].voltage.input.name, 'in1_input')
+         self.assertEqual(rails[0].power.input.name, 'power1_input')
+         self.assertEqual(rails[1].voltage.input.name, 'in2_input')
+         self.assertEqual(rails[1].current.input.name, 'curr2_input')
+         listdir.assert_called_once_with(self.hwmon)
+
+   def testMissingLabel(self):
+      desc = CurrentDesc(currId=2, direction=RailDirection.OUTPUT)
+      current = CurrentSysfsImpl(self.driver, desc)
+      self.assertFalse(current.exists())
+      with self.assertRaises(FileNotFoundError):
+         current.getPrefixFromLabel()
+
+   def testRelabeled(self):
+      self.assertIsNone(hwmonLabelIndexes.getPrefix(self.hwmon, 'in', 'vout3'))
+      with open(os.path.join(self.hwmon, 'in3_label'), 'w',
+                encoding='utf-8') as f:
+         f.write('vout3\n')
+      self.assertEqual(hwmonLabelIndexes.getPrefix(self.hwmon, 'in', 'vout3'),
+                       'in3_')
+      self.assertIsNone(hwmonLabelIndexes.getPrefix(self.hwmon, 'in', 'vout2'))
+
+   def testFolderReplaced(self):
+      index = hwmonLabelIndexes.get(self.hwmon)
+      self.assertIs(hwmonLabelIndexes.get(self.hwmon), index)
+      os.rename(self.hwmon, self.hwmon + '.old')
+      shutil.copytree(self.hwmon + '.old', self.hwmon)
+      self.assertIsNot(hwmonLabelIndexes.get(self.hwmon), index)
+
+   def testInvalidate(self):
+      index = hwmonLabelIndexes.get(self.hwmon)
+      hwmonLabelIndexes.invalidate(self.tmpdir)
+      self.assertIsNot(hwmonLabelIndexes.get(self.hwmon), index)
+
+if __name__ == '__main__':
+   unittest.main()
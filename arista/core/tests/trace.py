@@ -0,0 +1,124 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+from ...tests.testing import unittest
+
+from ...libs.trace import Tracer, tracer
+from ...libs.wait import waitFor
+
+from .helpers import getAllSystems
+
+class TracerTest(unittest.TestCase):
+   def setUp(self):
+      self.tracer = Tracer()
+
+   def testDisabled(self):
+      with self.tracer.span('foo', 'test'):
+         pass
+      self.assertEqual(self.tracer.events, [])
+
+   def testSpans(self):
+      self.tracer.start()
+      with self.tracer.span('outer', 'test', index=1):
+         with self.tracer.span('inner', 'test'):
+            pass
+      self.tracer.stop()
+      with self.tracer.span('ignored', 'test'):
+         pass
+
+      self.assertEqual([e.name for e in self.tracer.events], ['inner', 'outer'])
+      inner, outer = self.tracer.events
+      self.assertLessEqual(outer.begin, inner.begin)
+      self.assertGreaterEqual(outer.end, inner.end)
+      self.assertEqual(outer.args, {'index': 1})
+
+   def testSpanOnError(self):
+      self.tracer.start()
+      with self.assertRaises(ValueError):
+         with self.tracer.span('failing', 'test'):
+            raise ValueError()
+      self.assertEqual([e.name for e in self.tracer.events], ['failing'])
+
+   def testSlowest(self):
+      self.tracer.start()
+      for i, duration in enumerate([3, 1, 5, 2]):
+         self.tracer.record('op%d' % i, 'test' if i else 'other', 0, duration)
+      self.assertEqual([e.name for e in self.tracer.slowest(2)], ['op2', 'op0'])
+      self.assertEqual([e.name for e in self.tracer.slowest(2, ['test'])],
+                       ['op2', 'op3'])
+      summary = self.tracer.summary(3)
+      self.assertEqual(len(summary), 3)
+      self.assertIn('op2', summary[0])
+      self.assertIn('5000.000ms', summary[0])
+
+   def testChromeTrace(self):
+      self.tracer.start()
+
+      # NOTE: threads are kept alive together for their ids to be distinct
+      barrier = threading.Barrier(2, timeout=5)
+
+      def work(name):
+         with self.tracer.span(name, 'thread'):
+            pass
+         if name != 'main':
+            barrier.wait()
+
+      threads = [threading.Thread(target=work, args=('t%d' % i,))
+                 for i in range(2)]
+      work('main')
+      for thread in threads:
+         thread.start()
+      for thread in threads:
+         thread.join()
+
+      root = tempfile.mkdtemp()
+      try:
+         path = os.path.join(root, 'trace.json')
+         self.tracer.write(path)
+         with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+      finally:
+         shutil.rmtree(root)
+
+      events = data['traceEvents']
+      self.assertEqual(len(events), 3)
+      self.assertEqual(events[0]['name'], 'main')
+      self.assertEqual(events[0]['tid'], 0)
+      self.assertEqual(len(set(e['tid'] for e in events)), 3)
+      for event in events:
+         self.assertEqual(event['ph'], 'X')
+         self.assertEqual(event['cat'], 'thread')
+         self.assertGreaterEqual(event['ts'], 0)
+         self.assertGreaterEqual(event['dur'], 0)
+
+class SetupTraceTest(unittest.TestCase):
+   def tearDown(self):
+      tracer.stop()
+
+   def testWait(self):
+      tracer.start()
+      results = iter([False, True])
+      waitFor(lambda: next(results), 'something', interval=1)
+      self.assertEqual([(e.category, e.name) for e in tracer.events],
+                       [('wait', 'something')])
+
+   def testPlatformSetup(self):
+      platform = next(getAllSystems())
+      tracer.start()
+      platform.setup()
+      tracer.stop()
+
+      categories = set(e.category for e in tracer.events)
+      self.assertIn('component', categories)
+      self.assertIn('driver', categories)
+      for event in tracer.events:
+         self.assertGreaterEqual(event.duration, 0)
+      durations = [e.duration for e in tracer.slowest(5)]
+      self.assertEqual(len(durations), 5)
+      self.assertEqual(durations, sorted(durations, reverse=True))
+
+if __name__ == '__main__':
+   unittest.main()
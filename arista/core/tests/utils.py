@@ -4,6 +4,8 @@ import os
 import stat
 import shutil
 import tempfile
+import threading
+import time
 from struct import pack, unpack
 try:
    from unittest import mock
@@ -12,7 +14,18 @@ except ImportError:
 
 from ...tests.testing import unittest
 
-from ..utils import FileResource, MmapResource, ResourceAccessor, StoredData
+from ..utils import (
+   FileResource,
+   FileWaiter,
+   MmapResource,
+   ResourceAccessor,
+   Retrying,
+   SharedMmapResource,
+   StoredData,
+)
+from ...libs.inotify import inotifySupported
+from ...libs.wait import PathWaiter, waitForPath
+from ...libs.wait import TimeoutError as WaitTimeoutError
 
 class ResourceTestBase(object):
    class TestClass(unittest.TestCase):
@@ -99,6 +112,20 @@ class ResourceTestBase(object):
             self._testWrite(7, 4, res.write32)
             self._testWrite(self.tempFile.tell() - 4, 4, res.write32)
 
+      def testReadBlock32(self):
+         with self.CLASS_TO_TEST(self.tempFile.name) as res:
+            values = res.readBlock32(1, 3)
+            self.assertEqual(values, list(unpack('<3L', self.TEST_DATA[1:13])))
+            self.assertEqual(values[1], res.read32(5))
+
+      def testWriteBlock32(self):
+         values = [0x10203040, 0x50607080]
+         with self.CLASS_TO_TEST(self.tempFile.name) as res:
+            res.writeBlock32(4, values)
+            self.assertEqual(res.readBlock32(4, 2), values)
+         self.tempFile.seek(4, os.SEEK_SET)
+         self.assertEqual(list(unpack('<2L', self.tempFile.read(8))), values)
+
 class FileResourceTest(ResourceTestBase.TestClass):
    CLASS_TO_TEST = FileResource
 
@@ -122,9 +149,70 @@ class FileResourceTest(ResourceTestBase.TestClass):
          res.write32(0x7, 125)
          self.assertEqual(offset, res.file_.tell())
 
+class RecordingBuffer(bytearray):
+   '''Buffer recording the size of each slice access'''
+
+   def __init__(self, *args):
+      super().__init__(*args)
+      self.accesses = []
+
+   def __getitem__(self, key):
+      self.accesses.append(('read', key.stop - key.start))
+      return super().__getitem__(key)
+
+   def __setitem__(self, key, value):
+      self.accesses.append(('write', key.stop - key.start))
+      super().__setitem__(key, value)
+
 class MmapResourceTest(ResourceTestBase.TestClass):
    CLASS_TO_TEST = MmapResource
 
+   def testAccessWidth(self):
+      res = MmapResource(self.tempFile.name)
+      res.mmap_ = RecordingBuffer(self.TEST_DATA)
+      res.read32(0)
+      res.write16(4, 0x1234)
+      res.readBlock32(0, 3)
+      res.writeBlock32(0, [1, 2])
+      self.assertEqual(res.mmap_.accesses, [
+         ('read', 4),
+         ('write', 2),
+         ('read', 4), ('read', 4), ('read', 4),
+         ('write', 4), ('write', 4),
+      ])
+
+class SharedMmapResourceTest(unittest.TestCase):
+   TEST_DATA = b'ABCDEFG1234567'
+
+   def setUp(self):
+      self.tempFile = tempfile.NamedTemporaryFile()
+      self.tempFile.write(self.TEST_DATA)
+      self.tempFile.flush()
+
+   def testSharedAcrossHolders(self):
+      res1 = SharedMmapResource.acquire(self.tempFile.name)
+      res2 = SharedMmapResource.acquire(self.tempFile.name)
+      self.assertIs(res1, res2)
+      with res1 as mm:
+         self.assertEqual(mm.read8(0), ord('A'))
+      self.assertTrue(res1.mapped())
+      with res2 as mm:
+         mm.write8(1, ord('b'))
+      self.assertEqual(res1.read8(1), ord('b'))
+      res1.release()
+      self.assertTrue(res2.mapped())
+      res2.release()
+      self.assertFalse(res2.mapped())
+      self.assertNotIn(self.tempFile.name, SharedMmapResource.registry_)
+
+   def testOpenFailure(self):
+      res = SharedMmapResource.acquire('NonExist')
+      with self.assertRaises(RuntimeError):
+         with res:
+            pass
+      res.release()
+      self.assertNotIn('NonExist', SharedMmapResource.registry_)
+
 class StoredDataTest(unittest.TestCase):
    def setUp(self):
       self.tempDir = tempfile.mkdtemp(prefix='unittest-arista-storeddata-')
@@ -247,5 +335,63 @@ class StoredDataTest(unittest.TestCase):
       result = sd.readOrClear()
       self.assertIsNone(result)
 
+class PathWaiterTest(unittest.TestCase):
+   def setUp(self):
+      self.root = tempfile.mkdtemp()
+
+   def tearDown(self):
+      shutil.rmtree(self.root)
+
+   def _createLater(self, path, delay=0.05):
+      def create():
+         os.makedirs(os.path.dirname(path), exist_ok=True)
+         with open(path, 'w', encoding='utf-8'):
+            pass
+      timer = threading.Timer(delay, create)
+      timer.start()
+      self.addCleanup(timer.join)
+
+   def _wait(self, path, **kwargs):
+      start = time.time()
+      result = PathWaiter(path, timeout=5, delayMax=10000, **kwargs).wait()
+      return result, time.time() - start
+
+   @unittest.skipUnless(inotifySupported(), 'inotify not supported')
+   def testInotify(self):
+      path = os.path.join(self.root, 'a', 'b', 'file')
+      self._createLater(path)
+      result, elapsed = self._wait(path, useInotify=True)
+      self.assertTrue(result)
+      # the polling interval is way above, the creation event ended the wait
+      self.assertLess(elapsed, 2)
+
+   def testPoll(self):
+      path = os.path.join(self.root, 'file')
+      self._createLater(path)
+      self.assertTrue(PathWaiter(path, timeout=5, useInotify=False).wait())
+
+   def testExisting(self):
+      self.assertTrue(PathWaiter(self.root, timeout=0).wait())
+
+   def testTimeout(self):
+      path = os.path.join(self.root, 'missing')
+      self.assertFalse(PathWaiter(path, timeout=0.05, useInotify=False).wait())
+      self.assertFalse(PathWaiter(path, timeout=0.05).wait())
+      with self.assertRaises(WaitTimeoutError):
+         waitForPath(path, timeout=0.05)
+
+   def testFileWaiterPatterns(self):
+      self._createLater(os.path.join(self.root, 'hwmon', 'hwmon3', 'temp1'))
+      waiter = FileWaiter([self.root, 'hwmon', 'hwmon[0-9]+'], waitTimeout=5)
+      self.assertTrue(waiter.waitFileReady())
+
+   def testRetryingBackoff(self):
+      delays = []
+      with mock.patch('time.sleep', delays.append):
+         for _ in Retrying(interval=None, delay=0.001, delayFactor=2,
+                           delayMax=0.004, maxAttempts=4):
+            pass
+      self.assertEqual(delays, [0.001, 0.002, 0.004, 0.004, 0.004])
+
 if __name__ == '__main__':
    unittest.main()
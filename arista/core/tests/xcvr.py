@@ -1,6 +1,12 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+
 from ...core.port import PortLayout
 from ...descs.xcvr import Osfp, Qsfp28, Rj45, Sfp
-from ...tests.testing import unittest
+from ...tests.testing import unittest, patch
 
 from ..fixed import FixedSystem
 from ..utils import incrange
@@ -9,7 +15,12 @@ from ..xcvr import (
    QsfpSlot,
    SfpSlot,
    EthernetSlot,
+   XcvrDomCollector,
+   XcvrEepromCache,
+   XcvrPresenceMonitor,
+   getXcvrSlotMaster,
 )
+from ..types import I2cAddr
 
 from .mockinv import (
    MockGpio,
@@ -141,5 +152,212 @@ class MockXcvrTest(unittest.TestCase):
       )
       self._checkSystem(system)
 
+class XcvrEepromCacheTest(unittest.TestCase):
+   PAGE_SIZE = XcvrEepromCache.PAGE_SIZE
+
+   def setUp(self):
+      fd, self.path = tempfile.mkstemp()
+      os.close(fd)
+      self._fill(0)
+      self.cache = XcvrEepromCache(self.path, 'qsfp')
+
+   def tearDown(self):
+      self.cache.close()
+      os.remove(self.path)
+
+   def _fill(self, seed, pages=5):
+      with open(self.path, 'wb') as f:
+         f.write(bytearray((seed + i) & 0xff
+                           for i in range(pages * self.PAGE_SIZE)))
+
+   def _expected(self, seed, offset, size):
+      return bytearray((seed + i) & 0xff for i in range(offset, offset + size))
+
+   def testReadAcrossPages(self):
+      data = self.cache.read(120, 20)
+      self.assertEqual(data, self._expected(0, 120, 20))
+      self.assertIn((0, 1), self.cache.pages)
+      self.assertNotIn((0, 0), self.cache.pages)
+
+   def testStaticPageCached(self):
+      self.cache.read(130, 16)
+      self._fill(1)
+      self.assertEqual(self.cache.read(130, 16), self._expected(0, 130, 16))
+      self.cache.invalidate()
+      self.assertEqual(self.cache.read(130, 16), self._expected(1, 130, 16))
+
+   def testVolatilePageNotCached(self):
+      with patch('os.pread', wraps=os.pread) as pread:
+         self.assertEqual(self.cache.read(3, 2), self._expected(0, 3, 2))
+         self._fill(1)
+         self.assertEqual(self.cache.read(3, 2), self._expected(1, 3, 2))
+      # only the requested bytes of the clear-on-read page are read
+      self.assertEqual([c[0][1:] for c in pread.call_args_list],
+                       [(2, 3), (2, 3)])
+      self.assertEqual(self.cache.pages, {})
+
+   def testWriteInvalidatesPages(self):
+      self.cache.read(128, 4)
+      self.cache.write(129, bytearray([0xaa, 0xbb]))
+      self.assertEqual(self.cache.read(128, 4),
+                       bytearray([128, 0xaa, 0xbb, 131]))
+
+   def testShortPage(self):
+      offset = 5 * self.PAGE_SIZE - 8
+      self.assertEqual(self.cache.read(offset, 16), self._expected(0, offset, 8))
+      self.assertNotIn((0, 5), self.cache.pages)
+
+   def testMissingFile(self):
+      cache = XcvrEepromCache(self.path + '.missing', 'qsfp')
+      with self.assertRaises(OSError):
+         cache.read(0, 1)
+
+class FakeXcvrSlot(object):
+   def __init__(self, slotId, presence=False, intr=None):
+      self.slotId = slotId
+      self.presence = presence
+      self.intr = intr
+      self.reads = 0
+
+   def getId(self):
+      return self.slotId
+
+   def getName(self):
+      return 'slot%d' % self.slotId
+
+   def getPresence(self):
+      self.reads += 1
+      return self.presence
+
+   def getInterruptLine(self):
+      return self.intr
+
+   def getPresenceGpio(self):
+      return None
+
+class FakeUioInterrupt(object):
+   def __init__(self, path):
+      self.path = path
+      self.cleared = 0
+      os.mkfifo(path)
+      self.reader = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+      self.writer = os.open(path, os.O_WRONLY)
+
+   def close(self):
+      os.close(self.writer)
+      os.close(self.reader)
+
+   def getFile(self):
+      return self.path
+
+   def clear(self):
+      self.cleared += 1
+
+   def fire(self):
+      os.write(self.writer, b'\x01\x00\x00\x00')
+
+class XcvrPresenceMonitorTest(unittest.TestCase):
+   def setUp(self):
+      self.tmpdir = tempfile.mkdtemp()
+      self.intr = FakeUioInterrupt(os.path.join(self.tmpdir, 'uio0'))
+      self.irqSlot = FakeXcvrSlot(1, intr=self.intr)
+      self.polledSlot = FakeXcvrSlot(2, presence=True)
+      self.monitor = XcvrPresenceMonitor([self.irqSlot, self.polledSlot],
+                                         pollInterval=0.01)
+
+   def tearDown(self):
+      self.monitor.close()
+      self.intr.close()
+      shutil.rmtree(self.tmpdir)
+
+   def testInitialPresence(self):
+      self.assertEqual(self.monitor.presence, {1: False, 2: True})
+
+   def testTimeout(self):
+      self.assertEqual(self.monitor.wait(timeout=0.05), {})
+      self.assertEqual(len(self.monitor.watched), 1)
+      self.assertEqual(self.monitor.polled, [self.polledSlot])
+      self.assertEqual(self.intr.cleared, 1)
+
+   def testPolledChange(self):
+      self.monitor.open()
+      self.polledSlot.presence = False
+      self.assertEqual(self.monitor.wait(timeout=1), {2: False})
+      self.assertEqual(self.monitor.wait(timeout=0.02), {})
+
+   def testInterruptChange(self):
+      self.monitor.wait(timeout=0.02)
+      reads = self.irqSlot.reads
+      self.monitor.wait(timeout=0.05)
+      # only the initial pass of each wait touches the interrupt driven slot
+      self.assertEqual(self.irqSlot.reads, reads + 1)
+      def insert():
+         self.irqSlot.presence = True
+         self.intr.fire()
+      timer = threading.Timer(0.05, insert)
+      timer.start()
+      self.assertEqual(self.monitor.wait(timeout=5), {1: True})
+      timer.join()
+      self.assertEqual(self.intr.cleared, 2)
+
+   def testNoInterrupts(self):
+      monitor = XcvrPresenceMonitor([self.irqSlot], pollInterval=0.01,
+                                    useInterrupts=False)
+      self.irqSlot.presence = True
+      self.assertEqual(monitor.wait(timeout=1), {1: True})
+      self.assertEqual(monitor.watched, {})
+      monitor.close()
+
+class FakeXcvr(object):
+   def __init__(self, addr):
+      self.addr = addr
+
+   def getI2cAddr(self):
+      return self.addr
+
+class FakeDomSlot(FakeXcvrSlot):
+   def __init__(self, slotId, bus):
+      super(FakeDomSlot, self).__init__(slotId, presence=True)
+      self.xcvr = FakeXcvr(I2cAddr(bus, 0x50))
+
+   def getXcvr(self):
+      return self.xcvr
+
+class XcvrDomCollectorTest(unittest.TestCase):
+   def testSerialisedPerMaster(self):
+      slots = [FakeDomSlot(i, bus=i % 4) for i in range(1, 17)]
+      lock = threading.Lock()
+      active = {}
+      overlaps = []
+      peak = [0]
+
+      def read(slot):
+         master = getXcvrSlotMaster(slot)
+         with lock:
+            if active.get(master):
+               overlaps.append(master)
+            active[master] = True
+            peak[0] = max(peak[0], sum(active.values()))
+         time.sleep(0.01)
+         with lock:
+            active[master] = False
+         if slot.getId() == 5:
+            raise IOError('nack')
+         return {'temperature': slot.getId()}
+
+      snapshot = XcvrDomCollector(slots, read).collect()
+      self.assertEqual(overlaps, [])
+      self.assertGreater(peak[0], 1)
+      self.assertEqual(sorted(snapshot.data), [i for i in range(1, 17) if i != 5])
+      self.assertEqual(snapshot.data[3], {'temperature': 3})
+      self.assertEqual(list(snapshot.errors), [5])
+
+   def testReadOverride(self):
+      slots = [FakeDomSlot(i, bus=i % 2) for i in range(1, 5)]
+      collector = XcvrDomCollector(slots, lambda slot: 'default')
+      snapshot = collector.collect(lambda slot: slot.getId() * 10)
+      self.assertEqual(snapshot.data, {1: 10, 2: 20, 3: 30, 4: 40})
+      self.assertEqual(collector.collect().data[1], 'default')
+
 if __name__ == '__main__':
    unittest.main()
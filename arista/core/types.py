@@ -33,6 +33,11 @@ class I2cAddr(SysfsPath):
    def supportSmbusBlock(self):
       return self.block_
 
+   @property
+   def master(self):
+      '''Identifies the i2c controller driving the bus'''
+      return self.bus
+
    def __repr__(self):
       return "%s(%d, %#x)" % (
          self.__class__.__name__, self.bus, self.address)
@@ -4,18 +4,34 @@ import json
 import mmap
 import os
 import re
+import threading
 import time
 
 from datetime import datetime
-from functools import wraps
-from struct import pack, unpack
+from functools import lru_cache, wraps
+from struct import Struct
 
 from .config import flashPath, tmpfsPath
 from .log import getLogger
 from ..libs.procfs import getCmdlineDict
+from ..libs.wait import PathWaiter
 
 logging = getLogger(__name__)
 
+U8 = Struct('<B')
+U16 = Struct('<H')
+U32 = Struct('<L')
+
+WORD_STRUCTS = {
+   'B': U8,
+   'H': U16,
+   'L': U32,
+}
+
+@lru_cache(maxsize=64)
+def blockStruct(fmtChar, count):
+   return Struct('<%d%s' % (count, fmtChar))
+
 class ResourceAccessor():
    ''' Base abstraction for accessing resource like files '''
    def __init__(self, path):
@@ -45,34 +61,69 @@ class ResourceAccessor():
    def __exit__(self, *args):
       self.closeResource()
 
-   def _doRead(self, addr, size, unpackFormat):
-      val = self.readResource(addr, size)
-      value = unpack('<%s' % unpackFormat, val)[0]
-      logging.io('%s.read%s(%#x) -> %#x', self, size * 8, addr, value)
+   def unpackResource(self, addr, fmt):
+      return fmt.unpack(self.readResource(addr, fmt.size))
+
+   def packResource(self, addr, fmt, *values):
+      self.writeResource(addr, fmt.size, fmt.pack(*values))
+
+   def _doRead(self, addr, fmt):
+      value = self.unpackResource(addr, fmt)[0]
+      logging.io('%s.read%s(%#x) -> %#x', self, fmt.size * 8, addr, value)
       return value
 
-   def _doWrite(self, addr, size, value, packFormat):
-      packedVal = pack('<%s' % packFormat, value)
-      logging.io('%s.write%s(%#x, %#x)', self, size * 8, addr, value)
-      self.writeResource(addr, size, packedVal)
+   def _doWrite(self, addr, value, fmt):
+      logging.io('%s.write%s(%#x, %#x)', self, fmt.size * 8, addr, value)
+      self.packResource(addr, fmt, value)
+
+   def _doReadBlock(self, addr, count, fmtChar):
+      fmt = blockStruct(fmtChar, count)
+      values = list(self.unpackResource(addr, fmt))
+      logging.io('%s.readBlock%s(%#x, %d)', self, fmt.size * 8 // count, addr,
+                 count)
+      return values
+
+   def _doWriteBlock(self, addr, values, fmtChar):
+      fmt = blockStruct(fmtChar, len(values))
+      logging.io('%s.writeBlock%s(%#x, %d)', self, fmt.size * 8 // len(values),
+                 addr, len(values))
+      self.packResource(addr, fmt, *values)
 
    def read32(self, addr):
-      return self._doRead(addr, 4, 'L')
+      return self._doRead(addr, U32)
 
    def write32(self, addr, value):
-      self._doWrite(addr, 4, value, 'L')
+      self._doWrite(addr, value, U32)
 
    def read16(self, addr):
-      return self._doRead(addr, 2, 'H')
+      return self._doRead(addr, U16)
 
    def write16(self, addr, value):
-      self._doWrite(addr, 2, value, 'H')
+      self._doWrite(addr, value, U16)
 
    def read8(self, addr):
-      return self._doRead(addr, 1, 'B')
+      return self._doRead(addr, U8)
 
    def write8(self, addr, value):
-      self._doWrite(addr, 1, value, 'B')
+      self._doWrite(addr, value, U8)
+
+   def readBlock32(self, addr, count):
+      return self._doReadBlock(addr, count, 'L')
+
+   def writeBlock32(self, addr, values):
+      self._doWriteBlock(addr, values, 'L')
+
+   def readBlock16(self, addr, count):
+      return self._doReadBlock(addr, count, 'H')
+
+   def writeBlock16(self, addr, values):
+      self._doWriteBlock(addr, values, 'H')
+
+   def readBlock8(self, addr, count):
+      return self._doReadBlock(addr, count, 'B')
+
+   def writeBlock8(self, addr, values):
+      self._doWriteBlock(addr, values, 'B')
 
 class MmapResource(ResourceAccessor):
    """Resource implementation for a directly-mapped memory region."""
@@ -127,6 +178,73 @@ class MmapResource(ResourceAccessor):
    def writeResource(self, addr, size, value):
       self.mmap_[addr: addr + size] = value
 
+   # NOTE: registers are copied to or from bytes with a single slice access,
+   #       unpacking in place would access the memory one byte at a time.
+   #       Blocks are accessed one register at a time for the same reason.
+
+   def _doReadBlock(self, addr, count, fmtChar):
+      fmt = WORD_STRUCTS[fmtChar]
+      values = [self.unpackResource(addr + i * fmt.size, fmt)[0]
+                for i in range(count)]
+      logging.io('%s.readBlock%s(%#x, %d)', self, fmt.size * 8, addr, count)
+      return values
+
+   def _doWriteBlock(self, addr, values, fmtChar):
+      fmt = WORD_STRUCTS[fmtChar]
+      logging.io('%s.writeBlock%s(%#x, %d)', self, fmt.size * 8, addr,
+                 len(values))
+      for i, value in enumerate(values):
+         self.packResource(addr + i * fmt.size, fmt, value)
+
+class SharedMmapResource(MmapResource):
+   '''Process wide, reference counted mapping of a memory region
+
+   Holders get the mapping with acquire() and give it back with release(),
+   the region is mapped on first use and unmapped when the last holder
+   releases it. Using the resource as a context manager maps it if needed
+   but leaves the mapping in place on exit.
+   '''
+
+   registry_ = {}
+   lock_ = threading.Lock()
+
+   def __init__(self, *args, **kwargs):
+      super().__init__(*args, **kwargs)
+      self.refcount_ = 0
+
+   @classmethod
+   def acquire(cls, path):
+      with cls.lock_:
+         resource = cls.registry_.get(path)
+         if resource is None:
+            resource = cls(path)
+            cls.registry_[path] = resource
+         resource.refcount_ += 1
+         return resource
+
+   def release(self):
+      with self.lock_:
+         assert self.refcount_ > 0, "Resource %s not acquired" % self
+         self.refcount_ -= 1
+         if self.refcount_:
+            return
+         if self.registry_.get(self.path_) is self:
+            del self.registry_[self.path_]
+         super().closeResource()
+
+   def mapped(self):
+      return self.mmap_ is not None
+
+   def openResource(self):
+      with self.lock_:
+         if self.mmap_ is not None:
+            return True
+         return self.map()
+
+   def closeResource(self):
+      # the mapping is kept until the last holder releases it
+      pass
+
 class FileResource(ResourceAccessor):
    ''' Resource implementation for a file base memory region. '''
    def __init__(self, *args, **kwargs):
@@ -198,20 +316,25 @@ def clog(msg, *args):
       pass
 
 class Retrying:
-   def __init__(self, interval=1.0, delay=0.05, maxAttempts=None):
+   def __init__(self, interval=1.0, delay=0.05, maxAttempts=None,
+                delayFactor=1, delayMax=None):
       self.interval = interval
       self.delay = delay
       self.maxAttempts = maxAttempts
+      self.delayFactor = delayFactor
+      self.delayMax = delayMax
 
    def __iter__(self):
       class Iterator:
-         def __init__(self, interval, delay, maxAttempts):
+         def __init__(self, interval, delay, maxAttempts, delayFactor, delayMax):
             self.attempt = 0
 
             self.startedAt_ = datetime.now()
             self.interval_ = interval
             self.delay_ = delay
             self.maxAttempts_ = maxAttempts
+            self.delayFactor_ = delayFactor
+            self.delayMax_ = delayMax
 
          def __next__(self):
             time.sleep(self.delay_)
@@ -219,6 +342,9 @@ class Retrying:
                self.maxAttempts_ and self.attempt >= self.maxAttempts_:
                raise StopIteration
             self.attempt += 1
+            self.delay_ *= self.delayFactor_
+            if self.delayMax_ is not None:
+               self.delay_ = min(self.delay_, self.delayMax_)
             return self
 
          def next(self):
@@ -228,7 +354,8 @@ class Retrying:
             return self.interval_ and \
                (datetime.now() - self.startedAt_).total_seconds() > self.interval_
 
-      return Iterator(self.interval, self.delay, self.maxAttempts)
+      return Iterator(self.interval, self.delay, self.maxAttempts,
+                      self.delayFactor, self.delayMax)
 
 WAITFILE_HWMON = 'hwmon'
 
@@ -245,12 +372,19 @@ class FileWaiter():
 
       logging.debug('Waiting file %s.', self.waitFile)
 
-      for r in Retrying(interval=self.waitTimeout):
+      if isinstance(self.waitFile, str):
+         if PathWaiter(self.waitFile, timeout=self.waitTimeout).wait():
+            return True
+         logging.error('Waiting file %s failed.', self.waitFile)
+         return False
+
+      for r in Retrying(interval=self.waitTimeout, delay=0.001, delayFactor=2,
+                        delayMax=0.1):
          if self.fileExists():
             return True
          logging.debug('Waiting file %s attempt %d.', self.waitFile, r.attempt)
 
-      if not os.path.exists(self.waitFile):
+      if not self.fileExists():
          logging.error('Waiting file %s failed.', self.waitFile)
          return False
       return True
@@ -1,5 +1,11 @@
+import os
+import select
+import threading
+import time
 
 from ..components.xcvr import Osfp, Qsfp, Sfp, Ethernet
+from ..libs.parallel import runPerGroup
+from ..libs.python import monotonicRaw
 from ..inventory.xcvr import (
    Osfp as OsfpInv,
    OsfpSlot as OsfpSlotInv,
@@ -12,6 +18,10 @@ from ..inventory.xcvr import (
 )
 
 from .component.slot import SlotComponent
+from .inventory import XcvrPresenceReader, diffPresenceBitmaps
+from .log import getLogger
+
+logging = getLogger(__name__)
 
 class EthernetImpl(EthernetInv):
    def __init__(self, slot):
@@ -94,6 +104,9 @@ class EthernetSlotImpl(EthernetSlotInv):
    def getPresence(self):
       return self.slot.getPresence()
 
+   def getPresenceGpio(self):
+      return self.slot.presentGpio
+
    def getLeds(self):
       return self.slot.leds
 
@@ -156,6 +169,9 @@ class SfpSlotImpl(SfpSlotInv):
    def getPresence(self):
       return self.slot.getPresence()
 
+   def getPresenceGpio(self):
+      return self.slot.presentGpio
+
    def getLeds(self):
       return self.slot.leds
 
@@ -213,6 +229,9 @@ class QsfpSlotImpl(QsfpSlotInv):
    def getPresence(self):
       return self.slot.getPresence()
 
+   def getPresenceGpio(self):
+      return self.slot.presentGpio
+
    def getLeds(self):
       return self.slot.leds
 
@@ -269,6 +288,9 @@ class OsfpSlotImpl(OsfpSlotInv):
    def getPresence(self):
       return self.slot.getPresence()
 
+   def getPresenceGpio(self):
+      return self.slot.presentGpio
+
    def getLeds(self):
       return self.slot.leds
 
@@ -479,3 +501,277 @@ class OsfpSlot(XcvrSlot):
       if not self.modSel:
          raise NotImplementedError
       return self.modSel.setActive(value)
+
+class XcvrEepromCache(object):
+   '''Page cache in front of the optoe EEPROM file of a transceiver
+
+   The EEPROM is exposed by optoe as a flat file of 128 bytes pages. Pages
+   holding static data (identification, vendor info, thresholds) are kept
+   until the cache is invalidated, which has to happen whenever the module
+   presence changes. The other pages hold live monitoring data and latched
+   clear-on-read flags (e.g. lower page 0 on SFF-8636 and CMIS), they are
+   never cached and only the requested range is read from the module.
+   '''
+
+   PAGE_SIZE = 128
+   STATIC_PAGES = {
+      'sfp': frozenset([0, 1]),
+      'qsfp': frozenset([1, 2, 3, 4]),
+      'osfp': frozenset([1, 2, 3, 4]),
+   }
+
+   def __init__(self, path, xcvrType):
+      self.path = path
+      self.staticPages = self.STATIC_PAGES.get(xcvrType, frozenset())
+      self.pages = {}
+      self.fd = None
+      self.lock = threading.Lock()
+
+   def __str__(self):
+      return '%s(%s)' % (self.__class__.__name__, self.path)
+
+   def _open(self):
+      if self.fd is None:
+         self.fd = os.open(self.path, os.O_RDONLY)
+      return self.fd
+
+   def close(self):
+      if self.fd is not None:
+         os.close(self.fd)
+         self.fd = None
+
+   def invalidate(self):
+      logging.debug('%s: invalidating', self)
+      with self.lock:
+         self.pages = {}
+         self.close()
+
+   def invalidatePages(self, offset, size, bank=0):
+      first = offset // self.PAGE_SIZE
+      last = (offset + size - 1) // self.PAGE_SIZE
+      for page in range(first, last + 1):
+         self.pages.pop((bank, page), None)
+
+   def _readRaw(self, offset, size):
+      try:
+         return bytearray(os.pread(self._open(), size, offset))
+      except (OSError, IOError):
+         self.close()
+         raise
+
+   def _readPage(self, bank, page):
+      key = (bank, page)
+      content = self.pages.get(key)
+      if content is not None:
+         return content
+      content = self._readRaw(page * self.PAGE_SIZE, self.PAGE_SIZE)
+      if len(content) != self.PAGE_SIZE:
+         return None
+      self.pages[key] = content
+      return content
+
+   def read(self, offset, size, bank=0):
+      with self.lock:
+         return self._read(offset, size, bank)
+
+   def _read(self, offset, size, bank):
+      data = bytearray()
+      end = offset + size
+      while offset < end:
+         page, start = divmod(offset, self.PAGE_SIZE)
+         length = min(end - offset, self.PAGE_SIZE - start)
+         content = None
+         if page in self.staticPages:
+            content = self._readPage(bank, page)
+         if content is None:
+            # volatile or partially readable page, only read what was asked
+            chunk = self._readRaw(offset, length)
+            data += chunk
+            if len(chunk) != length:
+               break
+         else:
+            data += content[start:start + length]
+         offset += length
+      return data
+
+   def write(self, offset, data, bank=0):
+      with self.lock:
+         self.invalidatePages(offset, len(data), bank=bank)
+         with open(self.path, mode='r+b', buffering=0) as f:
+            f.seek(offset)
+            f.write(data)
+
+class XcvrPresenceMonitor(object):
+   '''Wait for presence changes on a set of transceiver slots
+
+   Slots exposing an interrupt line are watched through their UIO device so
+   that waiters only wake up when the hardware signals a change on them. The
+   other slots are checked every pollInterval seconds in a single bulk scan.
+   '''
+
+   def __init__(self, slots, pollInterval=1., useInterrupts=True):
+      self.slots = list(slots)
+      self.pollInterval = pollInterval
+      self.useInterrupts = useInterrupts
+      self.reader = XcvrPresenceReader(self.slots)
+      self.bitmap = self.reader.read()
+      self.presence = {slot.getId(): bool(self.bitmap & (1 << slot.getId()))
+                       for slot in self.slots}
+      self.epoll = None
+      self.watched = {}
+      self.polled = self.slots
+      self.polledReader = self.reader
+
+   def __str__(self):
+      return '%s(slots=%d, watched=%d)' % (self.__class__.__name__,
+                                           len(self.slots), len(self.watched))
+
+   def _watch(self, slot):
+      intr = slot.getInterruptLine()
+      if intr is None:
+         return False
+      try:
+         fd = os.open(intr.getFile(), os.O_RDONLY | os.O_NONBLOCK)
+      except (OSError, IOError, KeyError) as e:
+         logging.debug('%s: cannot watch interrupt of %s: %s', self,
+                       slot.getName(), e)
+         return False
+      intr.clear()
+      self.epoll.register(fd, select.EPOLLIN)
+      self.watched[fd] = (slot, intr)
+      return True
+
+   def open(self):
+      if self.epoll is not None:
+         return
+      self.epoll = select.epoll()
+      self.polled = []
+      for slot in self.slots:
+         if not self.useInterrupts or not self._watch(slot):
+            self.polled.append(slot)
+      self.polledReader = XcvrPresenceReader(self.polled)
+      logging.debug('%s: %d slots polled', self, len(self.polled))
+
+   def close(self):
+      for fd in self.watched:
+         os.close(fd)
+      self.watched = {}
+      self.polled = self.slots
+      self.polledReader = self.reader
+      if self.epoll is not None:
+         self.epoll.close()
+         self.epoll = None
+
+   def _update(self, mask, bitmap, changes):
+      inserted, removed = diffPresenceBitmaps(self.bitmap & mask, bitmap & mask)
+      self.bitmap = (self.bitmap & ~mask) | (bitmap & mask)
+      for slotId in inserted:
+         self.presence[slotId] = changes[slotId] = True
+      for slotId in removed:
+         self.presence[slotId] = changes[slotId] = False
+
+   def _scan(self, reader, changes):
+      self._update(reader.mask, reader.read(), changes)
+
+   def _check(self, slots, changes):
+      for slot in slots:
+         mask = 1 << slot.getId()
+         self._update(mask, mask if slot.getPresence() else 0, changes)
+
+   def _acknowledge(self, fd):
+      slot, intr = self.watched[fd]
+      try:
+         # reading the uio event counter rearms the readiness of the fd
+         os.read(fd, 4)
+      except (OSError, IOError):
+         pass
+      intr.clear()
+      return slot
+
+   def wait(self, timeout=None):
+      '''Return the {slotId: presence} of the slots that changed
+
+      Blocks until at least one slot changed or timeout seconds elapsed in
+      which case an empty dict is returned. A timeout of None waits forever.
+      '''
+      self.open()
+      deadline = None if timeout is None else monotonicRaw() + timeout
+      changes = {}
+      reader = self.reader
+      fired = []
+      while True:
+         self._scan(reader, changes)
+         self._check(fired, changes)
+         if changes:
+            return changes
+
+         interval = self.pollInterval if self.polled or not self.watched \
+                    else None
+         if deadline is not None:
+            remaining = deadline - monotonicRaw()
+            if remaining <= 0:
+               return changes
+            interval = remaining if interval is None else min(interval,
+                                                              remaining)
+
+         reader = self.polledReader
+         if not self.watched:
+            time.sleep(interval)
+            continue
+
+         events = self.epoll.poll(-1 if interval is None else interval)
+         fired = [self._acknowledge(fd) for fd, _ in events]
+
+def getXcvrSlotMaster(slot):
+   '''Key of the SMBus master behind the transceiver of a slot'''
+   xcvr = slot.getXcvr()
+   addr = xcvr.getI2cAddr() if xcvr is not None else None
+   return getattr(addr, 'master', None)
+
+class XcvrDomSnapshot(object):
+   def __init__(self, timestamp, data, errors):
+      self.timestamp = timestamp
+      self.data = data
+      self.errors = errors
+
+   def __repr__(self):
+      return '%s(timestamp=%s, slots=%d, errors=%d)' % (
+         self.__class__.__name__, self.timestamp, len(self.data),
+         len(self.errors))
+
+class XcvrDomCollector(object):
+   '''Collect transceiver monitoring data across SMBus masters in parallel
+
+   Slots are grouped by the SMBus master driving their transceiver. Each
+   master gets a worker reading its slots one after the other so that
+   accesses behind a master stay serialised while independent masters are
+   read concurrently. A sweep returns a single XcvrDomSnapshot, readFn can
+   be overridden for a given sweep.
+   '''
+
+   def __init__(self, slots, readFn, masterFn=getXcvrSlotMaster,
+                maxWorkers=None):
+      self.slots = list(slots)
+      self.readFn = readFn
+      self.maxWorkers = maxWorkers
+      self.masters = {slot.getId(): masterFn(slot) for slot in self.slots}
+
+   def __str__(self):
+      return '%s(slots=%d, masters=%d)' % (self.__class__.__name__,
+                                           len(self.slots),
+                                           len(set(self.masters.values())))
+
+   def collect(self, readFn=None):
+      timestamp = time.time()
+      results = runPerGroup(self.slots, lambda s: self.masters[s.getId()],
+                            readFn or self.readFn, maxWorkers=self.maxWorkers)
+      data = {}
+      errors = {}
+      for result in results:
+         slotId = result.item.getId()
+         if result.error is not None:
+            errors[slotId] = result.error
+         else:
+            data[slotId] = result.value
+      logging.debug('%s: sweep took %.3fs', self, time.time() - timestamp)
+      return XcvrDomSnapshot(timestamp, data, errors)
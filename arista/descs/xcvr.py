@@ -3,6 +3,7 @@ from ..core.desc import HwDesc
 class Xcvr(HwDesc):
    LANES = None
    SPEED = None
+   NAME_PREFIX = 'xcvr'
 
    def __init__(self, index, speed=None, lanes=None, leds=1, defaultLed=None,
                 **kwargs):
@@ -22,13 +23,18 @@ class Xcvr(HwDesc):
    def __str__(self):
       return f'{self.__class__.__name__}(index={self.index})'
 
+   def getName(self):
+      return '%s%d' % (self.NAME_PREFIX, self.index)
+
 class Rj45(Xcvr):
    LANES = 1
    SPEED = 1000
+   NAME_PREFIX = 'rj45_'
 
 class Sfp(Xcvr):
    LANES = 1
    SPEED = 10000
+   NAME_PREFIX = 'sfp'
 
 class Sfp28(Sfp):
    SPEED = 25000
@@ -39,6 +45,7 @@ class Sfp56(Sfp28):
 class Qsfp(Xcvr):
    LANES = 4
    SPEED = 10000
+   NAME_PREFIX = 'qsfp'
 
 class QsfpPlus(Qsfp):
    pass
@@ -51,6 +58,7 @@ class Qsfp56(Qsfp28):
 
 class QsfpDD(Qsfp56):
    LANES = 8
+   NAME_PREFIX = 'osfp'
 
 class Qsfp112(Qsfp):
    SPEED = 100000
@@ -58,6 +66,7 @@ class Qsfp112(Qsfp):
 class Osfp(Xcvr):
    LANES = 8
    SPEED = 50000
+   NAME_PREFIX = 'osfp'
 
 class Osfp800(Osfp):
    SPEED = 100000
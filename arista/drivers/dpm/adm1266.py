@@ -124,15 +124,29 @@ class Adm1266UserDriver(PmbusUserDriver):
    def getVersion(self):
       if inSimulation():
          return "MODEL VERSION DATE SERIAL FW"
-      model = self._readMfrStr(self.registers.MFR_MODEL)
-      version = self._readMfrStr(self.registers.MFR_REVISION)
-      date = self._readMfrStr(self.registers.MFR_DATE)
-      serial = self._readMfrStr(self.registers.MFR_SERIAL)
-      fw = self.getUserDataStr()
+      regs = [
+         self.registers.MFR_MODEL,
+         self.registers.MFR_REVISION,
+         self.registers.MFR_DATE,
+         self.registers.MFR_SERIAL,
+      ]
+      reads = [([reg, 32], 33) for reg in regs]
+      reads.append(([self.registers.USER_DATA, 3, 32, 0, 0], 33))
+      data = self.msg.read_batch(self.addr.address, reads)
+      model, version, date, serial = (self._bytesToStr(d[1:]).strip()
+                                      for d in data[:4])
+      fw = self._bytesToStr(data[4][1:])
       return "%s %s %s %s %s" % (model, version, date, serial, fw)
 
+   def _blackboxFaultCmd(self, index):
+      return [self.registers.READ_BLACKBOX, 1, index]
+
    def getBlackboxFault(self, index):
-      data = self.read_bytes([self.registers.READ_BLACKBOX, 1, index], 65)[1:]
+      data = self.read_bytes(self._blackboxFaultCmd(index), 65)
+      return self._parseBlackboxFault(index, data)
+
+   def _parseBlackboxFault(self, index, data):
+      data = data[1:]
       logging.debug('%s: fault %d: %s', self, index,
                     ' '.join('%02x' % s for s in data))
 
@@ -145,9 +159,12 @@ class Adm1266UserDriver(PmbusUserDriver):
    def getBlackboxFaults(self):
       _, index, count = self.getBlackboxInfo()
       logging.debug('%s: fault info: index=%d count=%d', self, index, count)
+      indexes = list(reversed(list(cyclicRange(index + 1, count))))
+      reads = [(self._blackboxFaultCmd(i), 65) for i in indexes]
+      data = self.msg.read_batch(self.addr.address, reads)
       faults = []
-      for i in reversed(list(cyclicRange(index + 1, count))):
-         fault = self.getBlackboxFault(i)
+      for i, raw in zip(indexes, data):
+         fault = self._parseBlackboxFault(i, raw)
          if fault.isValid():
             faults.append(fault)
       return faults
@@ -10,6 +10,7 @@ logging = getLogger(__name__)
 class Ds460KernelDriver(PmbusKernelDriver):
 
    NAME = 'dps460'
+   CONCURRENT_SETUP = False
 
    def setup(self):
       addr = self.addr.address
@@ -1,9 +1,6 @@
 
 import os
 
-from ..core.utils import inSimulation
-from ..libs.wait import waitFor
-
 from ..core.driver.kernel.i2c import I2cKernelDriver
 
 class EepromKernelDriver(I2cKernelDriver):
@@ -17,11 +14,8 @@ class EepromKernelDriver(I2cKernelDriver):
       with open(self.eepromPath(), 'rb') as f:
          return bytearray(f.read(size))
 
-   def setup(self):
-      super(EepromKernelDriver, self).setup()
-      if not inSimulation():
-         waitFor(lambda: os.path.exists(self.eepromPath()),
-                 description="eeprom sysfs entry")
+   def getReadyPaths(self):
+      return [self.eepromPath()]
 
 class At24KernelDriver(EepromKernelDriver):
    MODULE = 'at24'
@@ -23,7 +23,7 @@ class I2cMuxBus(object):
       nameFilePath = os.path.join(targetDevicePath, 'name')
       with open(nameFilePath, encoding='utf-8') as f:
          self.name_ = f.read().strip()
-      self.bus_ = i2cBusFromName(self.name_, force=True)
+      self.bus_ = i2cBusFromName(self.name_)
 
    @property
    def bus(self):
@@ -105,8 +105,9 @@ class GpioRegister(Register):
          else:
             regval &= ~(1 << bitpos)
          self.parent.write(addr, regval)
-      _writeBit(PCA9555_OUTPUT_REG + self.addr, value)
-      _writeBit(PCA9555_CONFIG_REG + self.addr, False) # False for output
+      with self.locked():
+         _writeBit(PCA9555_OUTPUT_REG + self.addr, value)
+         _writeBit(PCA9555_CONFIG_REG + self.addr, False) # False for output
 
 class Pca9555I2cDevDriver(I2cDevDriver):
    def reset(self):
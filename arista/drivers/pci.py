@@ -11,24 +11,24 @@ class PciRegister(Register):
    pass
 
 class PciRegister8(PciRegister):
-   def read(self):
+   def readHardware(self):
       return self.parent.read8(self.addr)
 
-   def write(self, value):
+   def writeHardware(self, value):
       return self.parent.write8(self.addr, value)
 
 class PciRegister16(PciRegister):
-   def read(self):
+   def readHardware(self):
       return self.parent.read16(self.addr)
 
-   def write(self, value):
+   def writeHardware(self, value):
       return self.parent.write16(self.addr, value)
 
 class PciRegister32(PciRegister):
-   def read(self):
+   def readHardware(self):
       return self.parent.read32(self.addr)
 
-   def write(self, value):
+   def writeHardware(self, value):
       return self.parent.write32(self.addr, value)
 
 class PciCapability(enum.IntEnum):
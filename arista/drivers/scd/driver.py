@@ -19,15 +19,41 @@ from ...core.driver.user.i2c import I2cDevDriver
 
 from ...descs.led import LedKind
 
-from ...libs.i2c import i2cBusFromName
+from ...libs.i2c import i2cBusFromName, invalidateKernelI2cBuses
 
 logging = getLogger(__name__)
 
 SCD_WAIT_TIMEOUT = 5.
 
+class ScdXcvrPresenceReader(object):
+   '''Raw value of every transceiver presence gpio of the scd
+
+   The kernel driver reports them all in a single attribute. Going through
+   it rather than the mmap keeps the clear-on-read changed bits of the
+   transceiver registers for their own attributes.
+   '''
+
+   def __init__(self, driver):
+      self.driver = driver
+
+   def __str__(self):
+      return '%s(%s)' % (self.__class__.__name__, self.driver.addr)
+
+   def getPath(self):
+      return os.path.join(self.driver.getSysfsPath(), 'xcvr_present')
+
+   def read(self):
+      values = {}
+      with open(self.getPath(), encoding='utf-8') as f:
+         for line in f:
+            name, value = line.split()
+            values['%s_present' % name] = int(value)
+      return values
+
 class ScdKernelDriver(PciKernelDriver):
    def __init__(self, scd=None, **kwargs):
       self.scd = scd
+      self.xcvrPresenceReader = ScdXcvrPresenceReader(self)
       super(ScdKernelDriver, self).__init__(module='scd-hwmon', **kwargs)
 
    def __str__(self):
@@ -68,10 +94,9 @@ class ScdKernelDriver(PciKernelDriver):
       return "SCD %s SMBus master %d bus %d" % (self.addr, master, bus)
 
    def refresh(self):
-      # reload i2c bus cache
       masterName = self.getMasterName(0, 0)
       if not utils.inSimulation():
-         self.scd.i2cOffset = i2cBusFromName(masterName, force=True)
+         self.scd.i2cOffset = i2cBusFromName(masterName)
       else:
          self.scd.i2cOffset = 2
 
@@ -128,6 +153,8 @@ class ScdKernelDriver(PciKernelDriver):
 
       logging.debug('creating scd objects')
       self.writeComponents(data, "new_object")
+      # smbus masters are registered as new i2c adapters
+      invalidateKernelI2cBuses()
 
       if scd.msiRearmOffset:
          path = self.addr.getSysfsPath()
@@ -147,6 +174,10 @@ class ScdKernelDriver(PciKernelDriver):
          logging.debug('applying scd tweaks')
          self.writeComponents(tweaks, "smbus_tweaks")
 
+   def clean(self):
+      self.scd.mmapReady = False
+      super(ScdKernelDriver, self).clean()
+
    def finish(self):
       logging.debug('applying scd configuration')
       path = self.addr.getSysfsPath()
@@ -186,6 +217,9 @@ class ScdKernelDriver(PciKernelDriver):
    def getGpio(self, desc, **kwargs):
       return GpioSysfsImpl(self, desc, hwActiveLow=True, **kwargs)
 
+   def getXcvrPresenceReader(self):
+      return self.xcvrPresenceReader
+
    def getLed(self, desc, **kwargs):
       return self._getLed(desc, **kwargs)
 
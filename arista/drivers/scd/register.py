@@ -35,7 +35,13 @@ class ScdStatusChangedRegister(Register):
          field.name = '%sChanged' % field.name
       self.changedRegister = ClearOnReadRegister(addr + 1, fields, **kwargs)
 
+   def copy(self):
+      reg = super(ScdStatusChangedRegister, self).copy()
+      reg.changedRegister = self.changedRegister.copy()
+      return reg
+
    def generateAttributes(self, parent=None):
+      self.changedRegister.regmap = self.regmap
       attrs = super(ScdStatusChangedRegister, self).generateAttributes(parent)
       attrs.update(self.changedRegister.generateAttributes(parent))
       return attrs
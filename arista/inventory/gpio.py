@@ -39,3 +39,11 @@ class Gpio(InventoryInterface):
 
    def setActive(self, value):
       raise NotImplementedError
+
+   def getBulkReader(self):
+      '''Reader returning the raw value of this gpio along with the other
+         gpios of the device in a single access, None when not supported'''
+      return None
+
+   def isActiveValue(self, value):
+      raise NotImplementedError
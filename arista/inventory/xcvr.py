@@ -48,6 +48,9 @@ class XcvrSlot(InventoryInterface):
    def getPresence(self):
       raise NotImplementedError
 
+   def getPresenceGpio(self):
+      return None
+
    @diagmethod('leds', diag=True)
    def getLeds(self):
       raise NotImplementedError
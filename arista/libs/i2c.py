@@ -1,28 +1,75 @@
-
 import os
 from collections import OrderedDict
 
-_i2cBuses = OrderedDict()
+I2C_DEVICES_PATH = '/sys/bus/i2c/devices'
+
+class KernelI2cBusIndex(object):
+   '''Cached mapping of the kernel i2c adapters to their name
+
+   The index is built on first use and kept until invalidated. Looking up a
+   name that is not known rescans the adapters, a bus id may have been
+   reused by an adapter with a different name since the last scan.
+   '''
+
+   def __init__(self, root=I2C_DEVICES_PATH):
+      self.root = root
+      self.buses = OrderedDict()
+      self.loaded = False
+
+   def _listBusIds(self):
+      busNames = [x for x in os.listdir(self.root) if x.startswith('i2c-')]
+      return sorted(int(x[4:]) for x in busNames)
+
+   def _readName(self, busId):
+      path = os.path.join(self.root, 'i2c-%d' % busId, 'name')
+      with open(path, encoding='utf-8') as f:
+         return f.read().rstrip()
+
+   def refresh(self):
+      buses = OrderedDict()
+      for busId in self._listBusIds():
+         try:
+            buses[busId] = self._readName(busId)
+         except FileNotFoundError:
+            # adapter went away while scanning
+            continue
+      self.buses = buses
+      self.loaded = True
+
+   def invalidate(self):
+      self.loaded = False
+
+   def getBuses(self, force=False):
+      if force or not self.loaded:
+         self.refresh()
+      return self.buses
+
+   @staticmethod
+   def _find(buses, name, idx):
+      for busId, busName in buses.items():
+         if name == busName:
+            if idx > 0:
+               idx -= 1
+            else:
+               return busId
+      return None
+
+   def lookup(self, name, idx=0, force=False):
+      scanned = force or not self.loaded
+      busId = self._find(self.getBuses(force=force), name, idx)
+      if busId is None and not scanned:
+         # adapters may have come and gone since the last scan
+         self.refresh()
+         busId = self._find(self.buses, name, idx)
+      return busId
+
+_i2cBuses = KernelI2cBusIndex()
+
 def getKernelI2cBuses(force=False):
-   if _i2cBuses and not force:
-      return _i2cBuses
-   _i2cBuses.clear()
-   buses = {}
-   root = '/sys/bus/i2c/devices'
-   sysfsBuses = [x for x in os.listdir(root) if x.startswith('i2c-')]
-   for busName in sorted(sysfsBuses, key=lambda x: int(x[4:])):
-      busId = int(busName.replace('i2c-', ''))
-      with open(os.path.join(root, busName, 'name')) as f:
-         buses[busId] = f.read().rstrip()
-   return buses
+   return _i2cBuses.getBuses(force=force)
 
-def i2cBusFromName(name, idx=0, force=False):
-   buses = getKernelI2cBuses(force=force)
-   for busId, busName in buses.items():
-      if name == busName:
-         if idx > 0:
-            idx -= 1
-         else:
-            return busId
-   return None
+def invalidateKernelI2cBuses():
+   _i2cBuses.invalidate()
 
+def i2cBusFromName(name, idx=0, force=False):
+   return _i2cBuses.lookup(name, idx=idx, force=force)
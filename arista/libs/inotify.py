@@ -0,0 +1,97 @@
+import ctypes
+import os
+import struct
+
+from collections import namedtuple
+
+IN_ATTRIB = 0x00000004
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+_EVENT_HEADER = struct.Struct('iIII')
+_EVENT_BUFFER_SIZE = 4096
+
+InotifyEvent = namedtuple('InotifyEvent', 'wd mask cookie name')
+
+_libc = None
+def _getLibc():
+   global _libc # pylint: disable=global-statement
+   if _libc is None:
+      _libc = ctypes.CDLL(None, use_errno=True)
+   return _libc
+
+def _check(ret, what):
+   if ret < 0:
+      err = ctypes.get_errno()
+      raise OSError(err, '%s: %s' % (what, os.strerror(err)))
+   return ret
+
+class Inotify(object):
+   '''Minimal non blocking wrapper around the inotify syscalls'''
+
+   def __init__(self):
+      self.fd = None
+      self.watches = {}
+
+   def __str__(self):
+      return '%s(fd=%s)' % (self.__class__.__name__, self.fd)
+
+   def __enter__(self):
+      self.open()
+      return self
+
+   def __exit__(self, *args):
+      self.close()
+
+   def open(self):
+      if self.fd is None:
+         self.fd = _check(_getLibc().inotify_init1(IN_NONBLOCK | IN_CLOEXEC),
+                          'inotify_init1')
+      return self
+
+   def close(self):
+      if self.fd is not None:
+         os.close(self.fd)
+         self.fd = None
+         self.watches = {}
+
+   def fileno(self):
+      return self.fd
+
+   def addWatch(self, path, mask):
+      wd = _check(_getLibc().inotify_add_watch(self.fd, os.fsencode(path), mask),
+                  'inotify_add_watch(%s)' % path)
+      self.watches[wd] = path
+      return wd
+
+   def removeWatch(self, wd):
+      if self.watches.pop(wd, None) is not None:
+         _getLibc().inotify_rm_watch(self.fd, wd)
+
+   def readEvents(self):
+      '''Return the pending events without blocking'''
+      events = []
+      while True:
+         try:
+            data = os.read(self.fd, _EVENT_BUFFER_SIZE)
+         except BlockingIOError:
+            return events
+         offset = 0
+         while offset < len(data):
+            wd, mask, cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0').decode()
+            offset += length
+            events.append(InotifyEvent(wd, mask, cookie, name))
+
+def inotifySupported():
+   try:
+      with Inotify():
+         return True
+   except (OSError, AttributeError):
+      return False
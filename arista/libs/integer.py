@@ -4,6 +4,9 @@ def iterBits(n):
       yield n & 0x1
       n >>= 1
 
+def setBitOffsets(n):
+   return [i for i, bit in enumerate(iterBits(n)) if bit]
+
 def listToIntLsb(l):
    value = 0
    for i, v in enumerate(l):
@@ -0,0 +1,64 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from ..core.log import getLogger
+
+logging = getLogger(__name__)
+
+class TaskResult(object):
+   def __init__(self, item, value=None, error=None, skipped=False):
+      self.item = item
+      self.value = value
+      self.error = error
+      self.skipped = skipped
+
+   def __repr__(self):
+      return '%s(item=%s, value=%s, error=%s, skipped=%s)' % (
+         self.__class__.__name__, self.item, self.value, self.error,
+         self.skipped)
+
+def groupItems(items, groupFn):
+   groups = OrderedDict()
+   for item in items:
+      groups.setdefault(groupFn(item), []).append(item)
+   return groups
+
+def _runOne(func, item):
+   try:
+      return TaskResult(item, value=func(item))
+   except Exception as e: # pylint: disable=broad-except
+      logging.debug('%s failed: %s', item, e)
+      return TaskResult(item, error=e)
+
+def _runGroup(func, indexedItems, stopOnError=False):
+   results = []
+   failed = False
+   for i, item in indexedItems:
+      if failed:
+         results.append((i, TaskResult(item, skipped=True)))
+         continue
+      result = _runOne(func, item)
+      failed = stopOnError and result.error is not None
+      results.append((i, result))
+   return results
+
+def runPerGroup(items, groupFn, func, maxWorkers=None, stopOnError=False):
+   '''Run func on every item, serialised within a group and concurrent across
+      groups, and return the TaskResult of each item in the original order
+
+      With stopOnError, the items following a failure in its group are
+      skipped, all items are skipped after a failure when run serially.'''
+   items = list(items)
+   groups = groupItems(enumerate(items), lambda entry: groupFn(entry[1]))
+   if len(groups) <= 1 or maxWorkers == 1:
+      return [r for _, r in _runGroup(func, enumerate(items), stopOnError)]
+
+   workers = len(groups) if maxWorkers is None else min(maxWorkers, len(groups))
+   results = [None] * len(items)
+   with ThreadPoolExecutor(max_workers=workers) as executor:
+      futures = [executor.submit(_runGroup, func, group, stopOnError)
+                 for group in groups.values()]
+      for future in futures:
+         for i, result in future.result():
+            results[i] = result
+   return results
@@ -4,7 +4,7 @@ import time
 from ..core.log import getLogger
 from ..core.utils import inSimulation
 from ..core.types import PciAddr
-from ..libs.wait import waitFor
+from ..libs.wait import waitFor, waitForPath
 
 logging = getLogger(__name__)
 
@@ -23,8 +23,8 @@ def readSecondaryBus(pciAddr):
       return int(bus) + 1
 
    devPath = '/sys/bus/pci/devices/%s/secondary_bus_number' % pciAddr
-   waitFor(lambda: os.path.exists(devPath), "Unable to get %s secondary bus" % pciAddr,
-           timeout=60, interval=100)
+   waitForPath(devPath, "Unable to get %s secondary bus" % pciAddr,
+               timeout=60, interval=100)
 
    def readBus():
       with open(devPath) as f:
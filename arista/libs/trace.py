@@ -0,0 +1,118 @@
+import json
+import os
+import threading
+import time
+
+class NullSpan(object):
+   def __enter__(self):
+      return self
+
+   def __exit__(self, *args):
+      pass
+
+_nullSpan = NullSpan()
+
+class Span(object):
+   def __init__(self, owner, name, category, args):
+      self.tracer = owner
+      self.name = name
+      self.category = category
+      self.args = args
+      self.begin = None
+
+   def __enter__(self):
+      self.begin = time.perf_counter()
+      return self
+
+   def __exit__(self, *args):
+      self.tracer.record(self.name, self.category, self.begin,
+                         time.perf_counter(), self.args)
+
+class TraceEvent(object):
+   def __init__(self, name, category, begin, end, tid, args=None):
+      self.name = name
+      self.category = category
+      self.begin = begin
+      self.end = end
+      self.tid = tid
+      self.args = args
+
+   @property
+   def duration(self):
+      return self.end - self.begin
+
+   def __repr__(self):
+      return '%s(%s, %s, %.6f)' % (self.__class__.__name__, self.category,
+                                   self.name, self.duration)
+
+class Tracer(object):
+   '''Record the timeline of operations like the platform setup
+
+   Recording is off by default and a span then costs a single check. Once
+   started every span is kept in memory and can be exported as Chrome
+   trace-event JSON, viewable in chrome://tracing or Perfetto.
+   '''
+
+   def __init__(self):
+      self.enabled = False
+      self.origin = None
+      self.events = []
+
+   def start(self):
+      self.events = []
+      self.origin = time.perf_counter()
+      self.enabled = True
+
+   def stop(self):
+      self.enabled = False
+
+   def span(self, name, category='default', **args):
+      if not self.enabled:
+         return _nullSpan
+      return Span(self, name, category, args)
+
+   def record(self, name, category, begin, end, args=None):
+      # NOTE: list.append is atomic, spans can be recorded from any thread
+      self.events.append(TraceEvent(name, category, begin, end,
+                                    threading.get_ident(), args))
+
+   def slowest(self, count=10, categories=None):
+      events = self.events
+      if categories is not None:
+         events = [e for e in events if e.category in categories]
+      return sorted(events, key=lambda e: e.duration, reverse=True)[:count]
+
+   def summary(self, count=10, categories=None):
+      return [
+         '%10.3fms %-10s %s' % (e.duration * 1000, e.category, e.name)
+         for e in self.slowest(count, categories=categories)
+      ]
+
+   def toChromeTrace(self):
+      pid = os.getpid()
+      tids = {}
+      events = []
+      for event in sorted(self.events, key=lambda e: e.begin):
+         events.append({
+            'name': event.name,
+            'cat': event.category,
+            'ph': 'X',
+            'ts': round((event.begin - self.origin) * 1e6, 3),
+            'dur': round(event.duration * 1e6, 3),
+            'pid': pid,
+            'tid': tids.setdefault(event.tid, len(tids)),
+            'args': event.args or {},
+         })
+      return {
+         'traceEvents': events,
+         'displayTimeUnit': 'ms',
+      }
+
+   def write(self, path):
+      with open(path, 'w', encoding='utf-8') as f:
+         json.dump(self.toChromeTrace(), f)
+
+tracer = Tracer()
+
+def traceSpan(name, category='default', **args):
+   return tracer.span(name, category, **args)
@@ -1,8 +1,22 @@
 
 import os
+import select
 import time
 
+from .inotify import (
+   IN_ATTRIB,
+   IN_CREATE,
+   IN_DELETE_SELF,
+   IN_MOVE_SELF,
+   IN_MOVED_TO,
+   Inotify,
+   inotifySupported,
+)
 from .python import monotonicRaw
+from .trace import traceSpan
+
+# NOTE: kernfs based filesystems do not report the creation of their nodes
+NO_INOTIFY_PATH_PREFIXES = ('/sys/', '/proc/')
 
 class TimeoutError(Exception):
    def __init__(self, msg, code=1):
@@ -41,30 +55,158 @@ def waitFor(func, description=None, timeout=60, delay=None, delayMax=1000,
    if wait is not None:
       time.sleep(wait / 1000)
 
-   while True:
-      result = func(*args, **kwargs)
-      if result:
-         return result
-
-      now = _nowMsecs()
-      if now > end:
-         if not description:
-            description = func.__name__
-         raise TimeoutError("Timed out waiting for %s" % description)
-
-      stime = None
-      if interval is not None:
-         stime = interval
-      elif delay is not None:
-         delay = min(delay * delayFactor, delayMax)
-         stime = delay
-
-      if stime is not None:
-         if now + stime > end:
-            stime = end - now
-         time.sleep(stime / 1000)
+   with traceSpan(description or getattr(func, '__name__', 'func'), 'wait'):
+      while True:
+         result = func(*args, **kwargs)
+         if result:
+            return result
+
+         now = _nowMsecs()
+         if now > end:
+            if not description:
+               description = func.__name__
+            raise TimeoutError("Timed out waiting for %s" % description)
+
+         stime = None
+         if interval is not None:
+            stime = interval
+         elif delay is not None:
+            delay = min(delay * delayFactor, delayMax)
+            stime = delay
+
+         if stime is not None:
+            if now + stime > end:
+               stime = end - now
+            time.sleep(stime / 1000)
 
    raise RuntimeError("Not reachable")
 
-def waitForPath(path, *args, **kwargs):
-    return waitFor(lambda: os.path.exists(path), *args, **kwargs)
+_inotifySupported = None
+def canInotifyPath(path):
+   global _inotifySupported # pylint: disable=global-statement
+   if os.path.abspath(path).startswith(NO_INOTIFY_PATH_PREFIXES):
+      return False
+   if _inotifySupported is None:
+      _inotifySupported = inotifySupported()
+   return _inotifySupported
+
+class PathWaiter(object):
+   '''Wait for a path to exist
+
+   The closest existing parent of the path is watched through inotify so that
+   the wait ends as soon as the path is created. Paths on filesystems that do
+   not report their changes, like sysfs, are polled with an exponential
+   backoff instead.
+      Inputs: timeout: in seconds
+              delay: initial interval of time between attempts in ms
+              delayFactor: factor for the exponential backoff
+              delayMax: maximum of time between attempts in ms
+              useInotify: force or prevent the use of inotify
+   '''
+
+   WATCH_MASK = IN_CREATE | IN_MOVED_TO | IN_ATTRIB | IN_DELETE_SELF | \
+                IN_MOVE_SELF
+
+   def __init__(self, path, timeout=60, delay=1, delayFactor=2, delayMax=100,
+                useInotify=None):
+      self.path = path
+      self.timeout = timeout
+      self.delay = delay
+      self.delayFactor = delayFactor
+      self.delayMax = delayMax
+      self.useInotify = useInotify
+
+   def exists(self):
+      return os.path.exists(self.path)
+
+   def canInotify(self):
+      if self.useInotify is not None:
+         return self.useInotify
+      return canInotifyPath(self.path)
+
+   def wait(self):
+      '''Return True once the path exists or False after the timeout'''
+      if self.exists():
+         return True
+
+      end = monotonicRaw() + self.timeout
+      with traceSpan(self.path, 'wait'):
+         if self.canInotify():
+            try:
+               return self._waitInotify(end)
+            except OSError:
+               pass
+         return self._waitPoll(end)
+
+   def _closestParent(self):
+      parent = os.path.dirname(os.path.abspath(self.path))
+      while not os.path.isdir(parent):
+         parent = os.path.dirname(parent)
+      return parent
+
+   def _waitInotify(self, end):
+      with Inotify() as inotify:
+         watched = None
+         wd = None
+         while True:
+            # NOTE: the watch is set before checking the path to not miss its
+            #       creation, it follows the parents as they get created
+            parent = self._closestParent()
+            if parent != watched:
+               if wd is not None:
+                  inotify.removeWatch(wd)
+               wd = inotify.addWatch(parent, self.WATCH_MASK)
+               watched = parent
+
+            if self.exists():
+               return True
+
+            remaining = end - monotonicRaw()
+            if remaining <= 0:
+               return False
+
+            select.select([inotify], [], [], min(remaining, self.delayMax / 1000))
+            inotify.readEvents()
+
+   def _waitPoll(self, end):
+      delay = self.delay
+      while True:
+         remaining = end - monotonicRaw()
+         if remaining <= 0:
+            return self.exists()
+         time.sleep(min(delay / 1000, remaining))
+         if self.exists():
+            return True
+         delay = min(delay * self.delayFactor, self.delayMax)
+
+def waitForPath(path, description=None, timeout=60, interval=None, delay=1,
+                useInotify=None):
+   '''Wait for path to exist, raise a TimeoutError after timeout seconds
+      interval: maximum of time between attempts in ms when polling
+   '''
+   waiter = PathWaiter(path, timeout=timeout, delay=delay,
+                       delayMax=interval or 100, useInotify=useInotify)
+   if not waiter.wait():
+      raise TimeoutError("Timed out waiting for %s" % (description or path))
+   return True
+
+def waitForPaths(paths, description=None, timeout=60, interval=None, delay=1):
+   '''Wait for every path to exist in a single polling loop, raise a
+      TimeoutError after timeout seconds
+      interval: maximum of time between attempts in ms
+   '''
+   end = monotonicRaw() + timeout
+   delayMax = interval or 100
+   pending = [path for path in paths if not os.path.exists(path)]
+   if not pending:
+      return True
+   with traceSpan(description or 'paths', 'wait', count=len(pending)):
+      while pending:
+         remaining = end - monotonicRaw()
+         if remaining <= 0:
+            raise TimeoutError("Timed out waiting for %s: %s" % (
+               description or 'paths', ', '.join(pending)))
+         time.sleep(min(delay / 1000, remaining))
+         pending = [path for path in pending if not os.path.exists(path)]
+         delay = min(delay * 2, delayMax)
+   return True
@@ -1,4 +1,2 @@
-
-from ..core import platform
-
-__all__ = platform.manager.loadPlatforms(__package__)
+# NOTE: platform modules are imported on demand by the platform manager,
+#       see arista.core.platform
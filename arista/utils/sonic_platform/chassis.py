@@ -13,6 +13,7 @@ try:
    from arista.core.platform import getPlatform, readPrefdl, getSonicSku
    from arista.core.supervisor import Supervisor
    from arista.core.linecard import Linecard
+   from arista.core.xcvr import XcvrDomCollector
    from arista.utils.sonic_platform.component import Component
    from arista.utils.sonic_platform.eeprom import Eeprom
    from arista.utils.sonic_platform.fan_drawer import (
@@ -113,6 +114,7 @@ class Chassis(ChassisBase):
             self._fan_drawer_list.append(FixedFanDrawer(self, fan))
 
       self._sfp_list = []
+      self._sfp_dom_collector = None
       xcvrSlots = self._inventory.getXcvrSlots()
       if xcvrSlots:
          sfpCls = SfpOptoe if Config().api_use_sfpoptoe else Sfp
@@ -171,6 +173,22 @@ class Chassis(ChassisBase):
       #       however, in practice the get_sfp is called with 1 based indexes
       return super(Chassis, self).get_sfp(index - 1)
 
+   def collect_sfp_dom(self, readFn=None):
+      '''Run readFn on the Sfp of every transceiver, in parallel across
+         SMBus masters, and return the results as a XcvrDomSnapshot
+
+         The bulk status of each transceiver is read by default.'''
+      if self._sfp_dom_collector is None:
+         slots = self._inventory.getXcvrSlots().values()
+         self._sfp_dom_collector = XcvrDomCollector(
+            slots,
+            lambda slot: self.get_sfp(slot.getId()).get_transceiver_bulk_status()
+         )
+      if readFn is None:
+         return self._sfp_dom_collector.collect()
+      return self._sfp_dom_collector.collect(
+         lambda slot: readFn(self.get_sfp(slot.getId())))
+
    def get_reboot_cause(self):
       rcm = getReloadCauseManager(self._platform)
       report = rcm.lastReport()
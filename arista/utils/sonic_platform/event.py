@@ -1,4 +1,6 @@
 
+import heapq
+import os
 import select
 import time
 
@@ -28,24 +30,45 @@ class Event(object):
       return changed, self.status
 
 class EpollEvent(Event):
+   '''Event backed by an interrupt file that stays open while watched
+
+   UIO devices are rearmed by reading their event counter, sysfs attributes
+   by seeking back to the start and reading their content again.
+   '''
+
    def __init__(self, uid, obj, typ, intrf):
       super(EpollEvent, self).__init__(uid, obj, typ)
       self.intrf = intrf
+      self.isUio = intrf.startswith('/dev/uio')
       self.fd_ = None
       self.status = None
 
    def fd(self):
-      if not self.fd_:
-         self.fd_ = open(self.intrf)
-      return self.fd_.fileno()
-
-   def refd(self):
-      self.close()
-      return self.fd()
+      if self.fd_ is None:
+         self.fd_ = os.open(self.intrf, os.O_RDONLY | os.O_NONBLOCK)
+         if not self.isUio:
+            # sysfs_notify requires the attribute to be read once
+            self.rearm()
+      return self.fd_
+
+   def mask(self):
+      if self.isUio:
+         return select.EPOLLIN
+      return select.EPOLLPRI | select.EPOLLERR
+
+   def rearm(self):
+      try:
+         if self.isUio:
+            os.read(self.fd_, 4)
+         else:
+            os.lseek(self.fd_, 0, os.SEEK_SET)
+            os.read(self.fd_, 4096)
+      except OSError:
+         pass
 
    def close(self):
       if self.fd_ is not None:
-         self.fd_.close()
+         os.close(self.fd_)
          self.fd_ = None
 
    def clear(self):
@@ -54,13 +77,39 @@ class EpollEvent(Event):
 class PollEvent(Event):
    pass
 
+class PollTimers(object):
+   '''Deadlines of the polled events ordered by expiry'''
+
+   def __init__(self):
+      self.heap = []
+      self.seq = 0
+
+   def __len__(self):
+      return len(self.heap)
+
+   def clear(self):
+      self.heap = []
+
+   def schedule(self, event, deadline):
+      self.seq += 1
+      heapq.heappush(self.heap, (deadline, self.seq, event))
+
+   def next(self):
+      return self.heap[0][0] if self.heap else None
+
+   def expired(self, now):
+      events = []
+      while self.heap and self.heap[0][0] <= now:
+         events.append(heapq.heappop(self.heap)[2])
+      return events
+
 class EventWatcher(object):
    def __init__(self, preserve=False, pollInterval=1000.):
       self.preserve = preserve
       self.pollInterval = pollInterval
-      self.epollHack = True
       self.epoll_ = None
       self.pollItems = {}
+      self.pollTimers = PollTimers()
       self.epollItems = {}
       self.epollFds = {}
       self.keys = set()
@@ -82,10 +131,13 @@ class EventWatcher(object):
          event.clear()
          self.epollItems[item] = event
          self.epollFds[event.fd()] = event
-         self.epoll.register(event.fd(), select.EPOLLIN)
+         self.epoll.register(event.fd(), event.mask())
       else:
          event = PollEvent(uid, item, name)
          self.pollItems[item] = event
+         # poll once right away, a wait shorter than the interval would
+         # otherwise never check the polled sources
+         self.pollTimers.schedule(event, time.time())
 
       # first time initialization
       event.get_status_changed()
@@ -103,24 +155,21 @@ class EventWatcher(object):
       detected = False
       for (fd, _) in events:
          event = self.epollFds[fd]
+         event.rearm()
+         event.clear()
+
          changed, status = event.get_status_changed()
          if changed:
             res[event.typ][str(event.uid)] = str(status)
             detected = True
 
-         event.clear()
-
-         if self.epollHack:
-            self.epoll.unregister(fd)
-            del self.epollFds[fd]
-            self.epoll.register(event.refd(), select.EPOLLIN)
-            self.epollFds[event.fd()] = event
-
       return detected
 
-   def poll_events(self, res):
+   def poll_events(self, res, now=None):
+      now = time.time() if now is None else now
       detected = False
-      for event in self.pollItems.values():
+      for event in self.pollTimers.expired(now):
+         self.pollTimers.schedule(event, now + self.pollInterval / 1000.)
          try:
             changed, status = event.get_status_changed()
          except Exception: # pylint: disable=broad-except
@@ -136,8 +185,18 @@ class EventWatcher(object):
 
       for item in self.epollItems.values():
          item.close()
+      self.epollItems = {}
+      self.epollFds = {}
+      self.pollItems = {}
+      self.pollTimers.clear()
       self.epoll.close()
 
+   def next_poll_delay(self, now):
+      deadline = self.pollTimers.next()
+      if deadline is None:
+         return None
+      return max(deadline - now, 0) * 1000
+
    def wait(self, timeout=0):
       res = self.get_empty_results()
       block = (timeout == 0)
@@ -145,10 +204,12 @@ class EventWatcher(object):
 
       while not detected and (timeout > 0 or block):
          begin = time.time()
-         interval = self.pollInterval if block else min(timeout, self.pollInterval)
+         interval = self.next_poll_delay(begin)
+         if not block:
+            interval = timeout if interval is None else min(timeout, interval)
 
          try:
-            events = self.epoll.poll(interval / 1000.)
+            events = self.epoll.poll(-1 if interval is None else interval / 1000.)
             if events:
                detected |= self.process_epoll_events(events, res)
          except select.error:
@@ -6,6 +6,7 @@ import time
 
 try:
    from arista.core.config import Config
+   from arista.core.xcvr import XcvrEepromCache
    from arista.utils.sonic_platform.thermal import SfpThermal
    from sonic_platform_base.sonic_sfp.qsfp_dd import qsfp_dd_Dom
    from sonic_platform_base.sonic_sfp.sff8436 import sff8436Dom
@@ -64,6 +65,8 @@ class Sfp(SfpBase):
       sfp = slot.getXcvr()
       self._eepromPath = EEPROM_PATH.format(sfp.getI2cAddr().bus,
                                             sfp.getI2cAddr().address)
+      self._eepromCache = XcvrEepromCache(self._eepromPath, sfp.getType())
+      self._presence = None
       self._sfp_type = None
       if Config().api_sfp_thermal:
          self._thermal_list.append(SfpThermal(self))
@@ -110,8 +113,17 @@ class Sfp(SfpBase):
    def get_position_in_parent(self):
       return self._index
 
+   def _presence_changed(self):
+      # the module was plugged in or out, cached pages no longer apply
+      self._eepromCache.invalidate()
+      self._sfp_type = None
+
    def get_presence(self):
-      return self._slot.getPresence()
+      presence = self._slot.getPresence()
+      if presence != self._presence:
+         self._presence_changed()
+         self._presence = presence
+      return presence
 
    def is_replaceable(self):
       return True
@@ -170,6 +182,9 @@ class Sfp(SfpBase):
       intr = self._slot.getInterruptLine()
       if not intr:
          return False
+      # the interrupt fires on presence changes, the module may have been
+      # swapped even though it is still reported present
+      self._presence_changed()
       self.get_presence()
       intr.clear()
       return True
@@ -275,17 +290,13 @@ class Sfp(SfpBase):
 
    def read_eeprom(self, offset, num_bytes):
       try:
-         with open(self._eepromPath, mode='rb', buffering=0) as f:
-            f.seek(offset)
-            return bytearray(f.read(num_bytes))
+         return self._eepromCache.read(offset, num_bytes)
       except (OSError, IOError):
          return None
 
    def write_eeprom(self, offset, num_bytes, write_buffer):
       try:
-         with open(self._eepromPath, mode='r+b', buffering=0) as f:
-            f.seek(offset)
-            f.write(write_buffer[0:num_bytes])
+         self._eepromCache.write(offset, write_buffer[0:num_bytes])
       except (OSError, IOError):
          return False
       return True
@@ -1,6 +1,7 @@
 import time
 
 from arista.core.config import Config
+from arista.core.xcvr import XcvrEepromCache
 from arista.utils.sonic_platform.thermal import SfpThermal
 from sonic_platform_base.sonic_xcvr.sfp_optoe_base import SfpOptoeBase
 
@@ -22,9 +23,12 @@ class SfpOptoe(SfpOptoeBase):
       self._slot = slot
       sfp = slot.getXcvr()
       self._eepromPath = None
+      self._eepromCache = None
       if sfp.getI2cAddr():
          self._eepromPath = EEPROM_PATH.format(sfp.getI2cAddr().bus,
                                                sfp.getI2cAddr().address)
+         self._eepromCache = XcvrEepromCache(self._eepromPath, sfp.getType())
+      self._presence = None
       self._sfp_type = None
       if not slot.getName().startswith('rj45') and Config().api_sfp_thermal:
          self._thermal_list.append(SfpThermal(self))
@@ -55,8 +59,18 @@ class SfpOptoe(SfpOptoeBase):
    def get_position_in_parent(self):
       return self.index
 
+   def _presence_changed(self):
+      # the module was plugged in or out, cached pages no longer apply
+      if self._eepromCache is not None:
+         self._eepromCache.invalidate()
+      self._sfp_type = None
+
    def get_presence(self):
-      return self._slot.getPresence()
+      presence = self._slot.getPresence()
+      if presence != self._presence:
+         self._presence_changed()
+         self._presence = presence
+      return presence
 
    def is_replaceable(self):
       return True
@@ -115,6 +129,9 @@ class SfpOptoe(SfpOptoeBase):
       intr = self._slot.getInterruptLine()
       if not intr:
          return False
+      # the interrupt fires on presence changes, the module may have been
+      # swapped even though it is still reported present
+      self._presence_changed()
       self.get_presence()
       intr.clear()
       return True
@@ -128,6 +145,23 @@ class SfpOptoe(SfpOptoeBase):
    def get_eeprom_path(self):
       return self._eepromPath
 
+   def read_eeprom(self, offset, num_bytes):
+      if self._eepromCache is None:
+         return None
+      try:
+         return self._eepromCache.read(offset, num_bytes)
+      except (OSError, IOError):
+         return None
+
+   def write_eeprom(self, offset, num_bytes, write_buffer):
+      if self._eepromCache is None:
+         return False
+      try:
+         self._eepromCache.write(offset, write_buffer[0:num_bytes])
+      except (OSError, IOError):
+         return False
+      return True
+
    def get_error_description(self):
       if not self.get_presence():
          return self.SFP_STATUS_UNPLUGGED
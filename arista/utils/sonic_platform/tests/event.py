@@ -0,0 +1,104 @@
+import time
+
+from ....tests.testing import unittest, patch
+
+from ..event import EventWatcher, PollTimers, INSERTED, REMOVED
+
+class FakeItem(object):
+   def __init__(self, presence=True):
+      self.presence = presence
+      self.checks = 0
+
+   def get_interrupt_file(self):
+      return None
+
+   def get_presence(self):
+      self.checks += 1
+      return self.presence
+
+class PollTimersTest(unittest.TestCase):
+   def testOrder(self):
+      timers = PollTimers()
+      timers.schedule('b', 2.)
+      timers.schedule('a', 1.)
+      timers.schedule('c', 2.)
+      self.assertEqual(len(timers), 3)
+      self.assertEqual(timers.next(), 1.)
+      self.assertEqual(timers.expired(0.5), [])
+      self.assertEqual(timers.expired(1.), ['a'])
+      # events sharing a deadline expire in scheduling order
+      self.assertEqual(timers.expired(5.), ['b', 'c'])
+      self.assertIsNone(timers.next())
+
+   def testClear(self):
+      timers = PollTimers()
+      timers.schedule('a', 1.)
+      timers.clear()
+      self.assertEqual(len(timers), 0)
+      self.assertIsNone(timers.next())
+
+class EventWatcherTest(unittest.TestCase):
+   def _watch(self, items, preserve=False, pollInterval=1000.):
+      watcher = EventWatcher(preserve=preserve, pollInterval=pollInterval)
+      watcher.load({'sfp': items})
+      return watcher
+
+   def testFirstPollImmediate(self):
+      item = FakeItem()
+      watcher = self._watch([item])
+      item.presence = False
+      begin = time.time()
+      res = watcher.wait(timeout=50)
+      self.assertEqual(res, {'sfp': {'1': str(REMOVED)}})
+      self.assertLess(time.time() - begin, 1.)
+
+   def testRearm(self):
+      item = FakeItem()
+      watcher = self._watch([item])
+      now = time.time()
+      res = watcher.get_empty_results()
+      self.assertFalse(watcher.poll_events(res, now=now))
+      self.assertEqual(watcher.pollTimers.next(), now + 1.)
+      # nothing is checked again before the interval elapsed
+      checks = item.checks
+      self.assertFalse(watcher.poll_events(res, now=now + 0.5))
+      self.assertEqual(item.checks, checks)
+      item.presence = False
+      self.assertTrue(watcher.poll_events(res, now=now + 1.))
+      self.assertEqual(res['sfp'], {'1': str(REMOVED)})
+      self.assertEqual(len(watcher.pollTimers), 1)
+
+   def testWaitTimeout(self):
+      item = FakeItem()
+      watcher = self._watch([item], pollInterval=20.)
+      begin = time.time()
+      res = watcher.wait(timeout=100)
+      self.assertEqual(res, {'sfp': {}})
+      self.assertGreaterEqual(time.time() - begin, 0.09)
+      self.assertGreater(item.checks, 2)
+      # the watcher forgets its events when not preserving them
+      self.assertEqual(len(watcher.pollTimers), 0)
+      self.assertEqual(watcher.pollItems, {})
+
+   def testWaitBlocking(self):
+      item = FakeItem(presence=False)
+      watcher = self._watch([item], pollInterval=10.)
+      states = iter([False, False, True])
+      with patch.object(item, 'get_presence', side_effect=lambda: next(states)):
+         res = watcher.wait()
+      self.assertEqual(res, {'sfp': {'1': str(INSERTED)}})
+
+   def testPreserve(self):
+      item = FakeItem()
+      watcher = self._watch([item], preserve=True)
+      self.assertEqual(watcher.wait(timeout=10), {'sfp': {}})
+      item.presence = False
+      watcher.load({'sfp': [item]})
+      self.assertEqual(len(watcher.pollTimers), 1)
+      # the change is reported relative to the state seen on the first load
+      watcher.pollTimers.clear()
+      watcher.pollTimers.schedule(watcher.pollItems[item], 0)
+      self.assertEqual(watcher.wait(timeout=10), {'sfp': {'1': str(REMOVED)}})
+
+if __name__ == '__main__':
+   unittest.main()
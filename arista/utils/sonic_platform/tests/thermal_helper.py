@@ -0,0 +1,64 @@
+from ....tests.testing import unittest, patch
+
+from ..thermal_helper import CoolingEntityManager
+
+class FakeXcvrApi(object):
+   def __init__(self, temperature):
+      self.temperature = temperature
+
+   def get_module_temperature(self):
+      return self.temperature
+
+class FakeSfp(object):
+   def __init__(self, name, temperature):
+      self.name = name
+      self.api = FakeXcvrApi(temperature)
+
+   def get_name(self):
+      return self.name
+
+   def get_xcvr_api(self):
+      return self.api
+
+class FakeChassis(object):
+   def __init__(self, sfps):
+      self.sfps = sfps
+      self.sweeps = 0
+
+   def get_all_sfps(self):
+      return self.sfps
+
+   def collect_sfp_dom(self, readFn):
+      self.sweeps += 1
+      for sfp in self.sfps:
+         readFn(sfp)
+
+class CoolingEntityManagerTest(unittest.TestCase):
+   def _manager(self, chassis):
+      em = CoolingEntityManager(chassis)
+      em.update_xcvrs(chassis)
+      return em
+
+   @patch('arista.utils.sonic_platform.thermal_helper.Config')
+   def testSweepXcvrs(self, config):
+      config.return_value.cooling_xcvrs_via_api = True
+      config.return_value.cooling_override_xcvr_target = None
+      chassis = FakeChassis([FakeSfp('osfp1', 40.), FakeSfp('osfp2', 50.)])
+      em = self._manager(chassis)
+      em.get_thermal('cpu')
+      self.assertEqual(em.sweep_xcvrs(), {'osfp1', 'osfp2'})
+      self.assertEqual(chassis.sweeps, 1)
+      thermals = em.get_all_thermals()
+      self.assertEqual(thermals['osfp1'].temperature, 40.)
+      self.assertEqual(thermals['osfp2'].temperature, 50.)
+
+   @patch('arista.utils.sonic_platform.thermal_helper.Config')
+   def testSweepDisabled(self, config):
+      config.return_value.cooling_xcvrs_via_api = False
+      chassis = FakeChassis([FakeSfp('osfp1', 40.)])
+      em = CoolingEntityManager(chassis)
+      self.assertEqual(em.sweep_xcvrs(), set())
+      self.assertEqual(chassis.sweeps, 0)
+
+if __name__ == '__main__':
+   unittest.main()
@@ -423,6 +423,23 @@ class CoolingEntityManager(object):
       # TODO: handle linecard xcvrs
       #       requires xcvr data to be published in CHASSIS_STATE_DB
 
+   def sweep_xcvrs(self):
+      '''Update the xcvrs read via the api in a single sweep, concurrent
+         across SMBus masters, and return the names of the updated ones'''
+      if not self._xcvrs_via_api:
+         return set()
+
+      updated = set()
+      def update(sfp):
+         name = sfp.get_name()
+         xcvr = self._thermals.get(name)
+         if isinstance(xcvr, CoolingXcvrThermal):
+            xcvr.update()
+            updated.add(name)
+
+      self._chassis.collect_sfp_dom(update)
+      return updated
+
    def update(self):
       self.update_fans(self._chassis)
       self.update_thermals(self._chassis)
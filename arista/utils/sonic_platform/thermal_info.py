@@ -6,6 +6,7 @@ try:
    from sonic_platform_base.sonic_thermal_control.thermal_json_object \
       import thermal_json_object
    from arista.core.cooling import CoolingAlgorithm
+   from arista.core.driver.kernel.sysfscache import hwmonSnapshot
    from .thermal_helper import CoolingEntityManager
 except ImportError as e:
    raise ImportError("%s - required module not found" % e)
@@ -35,9 +36,13 @@ class ThermalInfo(ThermalPolicyInfo):
       self.thermals = {}
 
    def collect(self, chassis):
-      self.thermals = CoolingEntityManager.get(chassis).get_all_thermals()
-      for thermal in self.thermals.values():
-         thermal.update()
+      em = CoolingEntityManager.get(chassis)
+      self.thermals = em.get_all_thermals()
+      with hwmonSnapshot():
+         swept = em.sweep_xcvrs()
+         for name, thermal in self.thermals.items():
+            if name not in swept:
+               thermal.update()
 
 @thermal_json_object("psu_info")
 class PsuInfo(ThermalPolicyInfo):
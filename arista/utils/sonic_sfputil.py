@@ -1,5 +1,7 @@
 import time
 
+from ..core.config import Config
+from ..core.xcvr import XcvrPresenceMonitor
 from .sonic_utils import getPlatform
 
 try:
@@ -53,10 +55,15 @@ def getSfpUtil():
 
         def __init__(self):
             super(SfpUtilNative, self).__init__()
-            self.xcvr_presence_map = {}
-            xcvrSlots = inventory.getXcvrSlots()
-            for xcvrSlot in xcvrSlots.values():
-                self.xcvr_presence_map[xcvrSlot.getId()] = xcvrSlot.getPresence()
+            self.xcvr_presence_monitor = XcvrPresenceMonitor(
+                inventory.getXcvrSlots().values(),
+                pollInterval=SfpUtilNative.XCVR_PRESENCE_POLL_PERIOD_SECS,
+                useInterrupts=Config().api_event_use_interrupts,
+            )
+
+        @property
+        def xcvr_presence_map(self):
+            return self.xcvr_presence_monitor.presence
 
         def get_presence(self, port_num):
             if not self._is_valid_port(port_num):
@@ -109,28 +116,11 @@ def getSfpUtil():
             return True
 
         def get_transceiver_change_event(self, timeout=0):
-            xcvrSlots = inventory.getXcvrSlots()
-            ret = {}
-            start_time = time.time()
-            timeout = timeout / float(1000) # convert msec to sec
-            while True:
-                for xcvrSlot in xcvrSlots.values():
-                    presence = xcvrSlot.getPresence()
-                    if self.xcvr_presence_map[xcvrSlot.getId()] != presence:
-                        ret[str(xcvrSlot.getId())] = '1' if presence else '0'
-                        self.xcvr_presence_map[xcvrSlot.getId()] = presence
-
-                if len(ret) != 0:
-                    return True, ret
-
-                if timeout != 0:
-                    elapsed_time = time.time() - start_time
-                    if elapsed_time >= timeout:
-                        return True, {}
-
-                # Poll for Xcvr presence change every 1 second
-                time.sleep(SfpUtilNative.XCVR_PRESENCE_POLL_PERIOD_SECS)
-
-            return False, {}
+            # convert msec to sec, 0 means waiting until something changes
+            timeout = timeout / float(1000) if timeout else None
+            changes = self.xcvr_presence_monitor.wait(timeout=timeout)
+            ret = {str(slotId): '1' if presence else '0'
+                   for slotId, presence in changes.items()}
+            return True, ret
 
     return SfpUtilNative
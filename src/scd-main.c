@@ -701,6 +701,25 @@ static ssize_t show_smbus_tweaks(struct device *dev, struct device_attribute *at
 static DEVICE_ATTR(smbus_tweaks, S_IRUSR|S_IRGRP|S_IWUSR|S_IWGRP,
                    show_smbus_tweaks, smbus_tweaks);
 
+static ssize_t show_xcvr_present(struct device *dev, struct device_attribute *attr,
+                                 char *buf)
+{
+   struct scd_context *ctx = get_context_for_dev(dev);
+   ssize_t count;
+
+   if (!ctx) {
+      return -ENODEV;
+   }
+
+   scd_lock(ctx);
+   count = scd_xcvr_dump_present(ctx, buf, PAGE_SIZE);
+   scd_unlock(ctx);
+
+   return count;
+}
+
+static DEVICE_ATTR(xcvr_present, S_IRUGO, show_xcvr_present, NULL);
+
 static int scd_create_sysfs_files(struct scd_context *ctx) {
    int err;
 
@@ -718,8 +737,17 @@ static int scd_create_sysfs_files(struct scd_context *ctx) {
       goto fail_smbus_tweaks;
    }
 
+   err = sysfs_create_file(get_scd_kobj(ctx), &dev_attr_xcvr_present.attr);
+   if (err) {
+      dev_err(get_scd_dev(ctx), "could not create %s attribute: %d",
+              dev_attr_xcvr_present.attr.name, err);
+      goto fail_xcvr_present;
+   }
+
    return 0;
 
+fail_xcvr_present:
+   sysfs_remove_file(get_scd_kobj(ctx), &dev_attr_smbus_tweaks.attr);
 fail_smbus_tweaks:
    sysfs_remove_file(get_scd_kobj(ctx), &dev_attr_new_object.attr);
 fail_new_object:
@@ -812,6 +840,7 @@ static void scd_ext_hwmon_remove(struct pci_dev *pdev)
 
    sysfs_remove_file(&pdev->dev.kobj, &dev_attr_new_object.attr);
    sysfs_remove_file(&pdev->dev.kobj, &dev_attr_smbus_tweaks.attr);
+   sysfs_remove_file(&pdev->dev.kobj, &dev_attr_xcvr_present.attr);
 
    kfree(ctx);
 
@@ -505,6 +505,16 @@ static struct i2c_algorithm scd_smbus_algorithm = {
 };
 
 
+static ssize_t show_smbus_fifo_size(struct device *dev,
+                                    struct device_attribute *attr, char *buf)
+{
+   struct scd_smbus *bus = i2c_get_adapdata(to_i2c_adapter(dev));
+
+   return sprintf(buf, "%d\n", bus->master->fifo_size);
+}
+
+static DEVICE_ATTR(smbus_fifo_size, S_IRUGO, show_smbus_fifo_size, NULL);
+
 static int scd_smbus_bus_add(struct scd_smbus_master *master, int id)
 {
    struct scd_smbus *bus;
@@ -533,6 +543,13 @@ static int scd_smbus_bus_add(struct scd_smbus_master *master, int id)
       return err;
    }
 
+   err = device_create_file(&bus->adap.dev, &dev_attr_smbus_fifo_size);
+   if (err) {
+      i2c_del_adapter(&bus->adap);
+      kfree(bus);
+      return err;
+   }
+
    smbus_master_lock(master);
    list_add_tail(&bus->list, &master->bus_list);
    smbus_master_unlock(master);
@@ -551,6 +568,7 @@ static void scd_smbus_master_remove(struct scd_smbus_master *master)
     * unused when removing them.
     */
    list_for_each_entry(bus, &master->bus_list, list) {
+      device_remove_file(&bus->adap.dev, &dev_attr_smbus_fifo_size);
       i2c_del_adapter(&bus->adap);
    }
 
@@ -621,7 +639,9 @@ int scd_smbus_master_add(struct scd_context *ctx, u32 addr, u32 id, u32 bus_coun
    smbus_master_reset(master);
 
    cs = smbus_master_read_cs(master);
-   master_dbg(master, "@%#x version %d", addr, cs.ver);
+   master->fifo_size = scd_smbus_cs_fsz(cs);
+   master_dbg(master, "@%#x version %d fifo %d", addr, cs.ver,
+              master->fifo_size);
 
    list_add_tail(&master->list, &ctx->smbus_master_list);
 
@@ -42,6 +42,7 @@ struct scd_smbus_master {
    struct list_head bus_list;
 
    int max_retries;
+   int fifo_size;
 };
 
 struct bus_params {
@@ -141,6 +141,32 @@ static int scd_xcvr_register(struct scd_xcvr *xcvr, const struct gpio_cfg *cfgs,
    return 0;
 }
 
+/*
+ * Must be called with the scd lock held.
+ * Reads go through scd_xcvr_read_register so that the clear on read bits of
+ * each register are kept for their own attribute.
+ */
+ssize_t scd_xcvr_dump_present(struct scd_context *ctx, char *buf, size_t max)
+{
+   const struct scd_xcvr_attribute *gpio;
+   struct scd_xcvr *xcvr;
+   ssize_t count = 0;
+   u32 res;
+
+   list_for_each_entry(xcvr, &ctx->xcvr_list, list) {
+      gpio = &xcvr->attr[XCVR_PRESENT_BIT];
+      if (!gpio->xcvr)
+         continue;
+      res = !!(scd_xcvr_read_register(gpio) & (1 << gpio->bit));
+      res = (gpio->active_low) ? !res : res;
+      count += scnprintf(buf + count, max - count, "%s %u\n", xcvr->name, res);
+      if (count == max)
+         return count;
+   }
+
+   return count;
+}
+
 void scd_xcvr_remove_all(struct scd_context *ctx)
 {
    struct scd_xcvr *tmp_xcvr;
@@ -35,6 +35,7 @@ struct scd_xcvr_attribute {
 };
 
 #define XCVR_ATTR_MAX_COUNT 9
+#define XCVR_PRESENT_BIT 2
 struct scd_xcvr {
    struct scd_context *ctx;
    struct scd_xcvr_attribute attr[XCVR_ATTR_MAX_COUNT];
@@ -72,5 +73,7 @@ extern int scd_xcvr_sfp_add(struct scd_context *ctx, u32 addr, u32 id);
 extern int scd_xcvr_qsfp_add(struct scd_context *ctx, u32 addr, u32 id);
 extern int scd_xcvr_osfp_add(struct scd_context *ctx, u32 addr, u32 id);
 extern void scd_xcvr_remove_all(struct scd_context *ctx);
+extern ssize_t scd_xcvr_dump_present(struct scd_context *ctx, char *buf,
+                                     size_t max);
 
 #endif /* _LINUX_DRIVER_SCD_XCVR_H_ */